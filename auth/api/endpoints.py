@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
-from core.database import connect_db, create_user, get_user_by_email, update_user_password, get_user_by_id, update_user_name
-from core.auth_utils import create_access_token, verify_password, get_hash_password
+from core.database import create_user, get_user_by_email, update_user_password, get_user_by_id, update_user_name
+from core.auth_utils import create_access_token
+from core.password_pool import password_pool
+from core.rate_limit import limit_password_hashing
 from datetime import timedelta
 from datetime import datetime
 from models.schemas import UserRegister, LoginRequest, ChangePasswordRequest, LoginResponse
@@ -13,14 +16,14 @@ import traceback
 router = APIRouter()
 
 
-@router.post("/signup")
-def signup(user: UserRegister):
+@router.post("/signup", dependencies=[Depends(limit_password_hashing)])
+async def signup(user: UserRegister):
     try:
-        if get_user_by_email(user.email):
+        hashed_password = await password_pool.hash(user.password)
+        # Satu INSERT ... ON CONFLICT: None berarti email sudah terdaftar
+        user_id = await run_in_threadpool(create_user, user.name, user.email, hashed_password)
+        if user_id is None:
             raise HTTPException(status_code=400, detail="Email sudah terdaftar")
-
-        hashed_password = get_hash_password(user.password)
-        create_user(user.name, user.email, hashed_password)
         return {"message": "Pendaftaran pengguna berhasil"}
 
     except HTTPException as http_exc:
@@ -33,17 +36,19 @@ def signup(user: UserRegister):
 
 
 
-@router.post("/login", response_model=LoginResponse)
-def login(request: LoginRequest):
+@router.post("/login", response_model=LoginResponse, dependencies=[Depends(limit_password_hashing)])
+async def login(request: LoginRequest):
     try:
-        conn = connect_db()
-        cursor = conn.cursor()
-        cursor.execute('SELECT id, name, email, password FROM "users" WHERE email = %s', (request.email,))
-        user = cursor.fetchone()
-        conn.close()
+        user = await run_in_threadpool(get_user_by_email, request.email)
+        if not user:
+            raise HTTPException(status_code=401, detail="Email atau kata sandi tidak valid")
 
-        if not user or not verify_password(request.password, user["password"]):
+        valid, new_hash = await password_pool.verify_and_update(request.password, user["password"])
+        if not valid:
             raise HTTPException(status_code=401, detail="Email atau kata sandi tidak valid")
+        if new_hash:
+            # Hash lama memakai cost bcrypt berbeda dari BCRYPT_ROUNDS, simpan hash baru
+            await run_in_threadpool(update_user_password, request.email, new_hash)
 
         access_token = create_access_token(
             data={"sub": str(user["id"])},
@@ -93,15 +98,18 @@ def change_name(
 
 
 
-@router.post("/change-password")
-def change_password(request: ChangePasswordRequest):
+@router.post("/change-password", dependencies=[Depends(limit_password_hashing)])
+async def change_password(request: ChangePasswordRequest):
     try:
-        user = get_user_by_email(request.email)
-        if not user or not verify_password(request.old_password, user["password"]):
+        user = await run_in_threadpool(get_user_by_email, request.email)
+        valid = False
+        if user:
+            valid, _ = await password_pool.verify_and_update(request.old_password, user["password"])
+        if not valid:
             raise HTTPException(status_code=401, detail="Kata sandi lama tidak sesuai atau pengguna tidak ditemukan")
 
-        new_hashed_password = get_hash_password(request.new_password)
-        update_user_password(request.email, new_hashed_password)
+        new_hashed_password = await password_pool.hash(request.new_password)
+        await run_in_threadpool(update_user_password, request.email, new_hashed_password)
         return {"message": "Kata sandi berhasil diperbarui"}
 
     except HTTPException as http_exc:
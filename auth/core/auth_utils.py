@@ -10,13 +10,29 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# min = max = BCRYPT_ROUNDS: hash dengan cost lain dianggap usang dan di-hash ulang saat login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
 
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password, hashed_password):
+    """
+    Returns (valid, new_hash). new_hash is set when the password is valid but
+    the stored hash uses a different bcrypt cost than BCRYPT_ROUNDS.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_hash_password(password):
     return pwd_context.hash(password)
 
@@ -1,12 +1,25 @@
 import os
+import threading
+from contextlib import contextmanager
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 from datetime import datetime
+from core.metrics import DB_CONNECTIONS_IN_USE, observe_external, register_callback
 
 
 load_dotenv()
 
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+
+_pool = None
+_pool_lock = threading.Lock()
+# ThreadedConnectionPool melempar PoolError saat habis; semaphore membuat request menunggu
+_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+
+
 def connect_db():
     return psycopg2.connect(
         dbname=os.getenv("PG_DB"),
@@ -18,69 +31,142 @@ def connect_db():
     )
 
 
-def get_db():
-    conn = connect_db()
+def get_pool() -> ThreadedConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    DB_POOL_MIN,
+                    DB_POOL_MAX,
+                    dbname=os.getenv("PG_DB"),
+                    user=os.getenv("PG_USER"),
+                    password=os.getenv("PG_PASSWORD"),
+                    host=os.getenv("PG_HOST"),
+                    port=os.getenv("PG_PORT"),
+                    cursor_factory=RealDictCursor,
+                )
+    return _pool
+
+
+def _return_connection(pool: ThreadedConnectionPool, conn):
+    """
+    Kembalikan koneksi ke pool. Koneksi yang rusak, termasuk yang gagal di-rollback
+    (mis. server memutus koneksi tetapi conn.closed masih 0), ditutup dan dilepas
+    dari pool; kalau tidak, koneksi itu tertinggal di daftar "used" dan pool habis.
+    """
+    if conn.closed:
+        pool.putconn(conn, close=True)
+        return
+    try:
+        conn.rollback()
+    except Exception:
+        pool.putconn(conn, close=True)
+        return
+    pool.putconn(conn)
+
+
+@contextmanager
+def pooled_connection():
+    """
+    Pinjam koneksi dari pool. Transaksi yang belum di-commit di-rollback
+    sebelum koneksi dikembalikan; koneksi yang rusak dibuang dari pool.
+    """
+    # Waktu tunggu slot + getconn (termasuk membuka koneksi baru) tercatat sebagai postgres_acquire
+    with observe_external("postgres_acquire"):
+        _pool_slots.acquire()
+        try:
+            pool = get_pool()
+            conn = pool.getconn()
+        except BaseException:
+            _pool_slots.release()
+            raise
+    DB_CONNECTIONS_IN_USE.inc()
     try:
         yield conn
     finally:
-        conn.close()
+        DB_CONNECTIONS_IN_USE.dec()
+        try:
+            _return_connection(pool, conn)
+        finally:
+            _pool_slots.release()
+
+
+def _pool_stats():
+    pool = _pool
+    if pool is None:
+        return {("in_use",): 0, ("idle",): 0, ("max",): DB_POOL_MAX}
+    # Atribut internal psycopg2 pool; hanya dibaca saat scrape
+    return {("in_use",): len(pool._used), ("idle",): len(pool._pool), ("max",): pool.maxconn}
+
+
+register_callback("db_pool_connections", "Connections of the psycopg2 pool by state.", ["state"], _pool_stats)
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+def get_db():
+    with pooled_connection() as conn:
+        yield conn
 
 
 def get_user_by_email(email: str):
-    conn = connect_db()
-    try:
+    with pooled_connection() as conn:
         with conn.cursor() as cursor:
             cursor.execute('SELECT * FROM "users" WHERE email = %s', (email,))
             user = cursor.fetchone()
             return user
-    finally:
-        conn.close()
 
 
 def create_user(name: str, email: str, hashed_password: str):
-    conn = connect_db()
-    try:
+    """
+    Buat user dalam satu statement. Mengembalikan id user baru, atau None jika
+    email sudah terdaftar (aman untuk signup bersamaan dengan email yang sama).
+    """
+    with pooled_connection() as conn:
         with conn.cursor() as cursor:
             cursor.execute(
-                'INSERT INTO "users" (name, email, password, created_at) VALUES (%s, %s, %s, %s)',
+                '''
+                INSERT INTO "users" (name, email, password, created_at)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (email) DO NOTHING
+                RETURNING id
+                ''',
                 (name, email, hashed_password, datetime.utcnow())
             )
+            row = cursor.fetchone()
             conn.commit()
-    finally:
-        conn.close()
+            return row["id"] if row else None
 
 
 def update_user_password(email: str, new_hashed_password: str):
-    conn = connect_db()
-    try:
+    with pooled_connection() as conn:
         with conn.cursor() as cursor:
             cursor.execute(
                 'UPDATE "users" SET password = %s WHERE email = %s',
                 (new_hashed_password, email)
             )
             conn.commit()
-    finally:
-        conn.close()
 
 
 def get_user_by_id(user_id: int):
-    conn = connect_db()
-    try:
+    with pooled_connection() as conn:
         with conn.cursor() as cursor:
             cursor.execute('SELECT * FROM "users" WHERE id = %s', (user_id,))
             return cursor.fetchone()
-    finally:
-        conn.close()
 
 
 def update_user_name(user_id: int, new_name: str):
-    conn = connect_db()
-    try:
+    with pooled_connection() as conn:
         with conn.cursor() as cursor:
             cursor.execute(
                 'UPDATE "users" SET name = %s WHERE id = %s',
                 (new_name, user_id)
             )
             conn.commit()
-    finally:
-        conn.close()
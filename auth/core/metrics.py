@@ -0,0 +1,180 @@
+import os
+import time
+import asyncio
+import logging
+from contextlib import contextmanager
+from fastapi import FastAPI, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Gauge, Histogram, generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+# Jeda antar pengukuran lag event loop; 0 = nonaktif
+EVENT_LOOP_LAG_INTERVAL_S = float(os.getenv("EVENT_LOOP_LAG_INTERVAL_S", "0.5"))
+# Jika diatur (gunicorn dengan beberapa worker), /metrics menggabungkan metrik semua proses
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Latency of HTTP requests by route template.",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", multiprocess_mode="livesum",
+)
+EXTERNAL_CALL_LATENCY = Histogram(
+    "external_call_duration_seconds", "Latency of calls to external systems (database, APIs, fetches).",
+    ["target", "outcome"], buckets=LATENCY_BUCKETS,
+)
+MODEL_INVOKE_LATENCY = Histogram(
+    "model_invoke_duration_seconds", "Latency of one model invocation (a whole batch when batched).",
+    ["model"], buckets=LATENCY_BUCKETS,
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "db_connections_in_use", "Database connections currently held by requests.", multiprocess_mode="livesum",
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop woke up a sleeping task.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+_callback_collectors = []
+_caches = {}
+
+
+@contextmanager
+def observe_external(target: str):
+    """Ukur satu panggilan ke sistem eksternal; outcome = ok / error."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        EXTERNAL_CALL_LATENCY.labels(target, outcome).observe(time.perf_counter() - start)
+
+
+class CallbackCollector:
+    """
+    Collector read at scrape time: `callback()` returns {labels tuple: value} for
+    existing counters (cache hits, pool usage, ...), so the hot path pays nothing.
+    """
+
+    def __init__(self, name: str, documentation: str, labels: list[str], callback, kind: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.callback = callback
+        self.kind = kind
+
+    def collect(self):
+        family_cls = CounterMetricFamily if self.kind == "counter" else GaugeMetricFamily
+        family = family_cls(self.name, self.documentation, labels=self.labels)
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.warning("Gagal membaca metrik %s: %s", self.name, e)
+            values = {}
+        for labels, value in values.items():
+            family.add_metric(list(labels), value)
+        yield family
+
+
+def register_callback(name: str, documentation: str, labels: list[str], callback, kind: str = "gauge"):
+    collector = CallbackCollector(name, documentation, labels, callback, kind)
+    _callback_collectors.append(collector)
+    REGISTRY.register(collector)
+
+
+def _read_caches():
+    values = {}
+    for name, cache in _caches.items():
+        values[(name, "hit")] = cache.hits
+        values[(name, "miss")] = cache.misses
+    return values
+
+
+def register_caches(caches: dict):
+    """Ekspor hits/misses dari objek cache yang sudah menghitungnya sendiri (atribut hits dan misses)."""
+    if not _caches:
+        register_callback("cache_requests", "Cache lookups by cache and result.", ["cache", "result"], _read_caches, kind="counter")
+    _caches.update(caches)
+
+
+class MetricsMiddleware:
+    """Plain ASGI middleware (no BaseHTTPMiddleware overhead) for latency and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+        # Child histogram per (method, route, status); labels() cukup mahal untuk dipanggil per request
+        self._latency = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # Template route (mis. /inference/{history_id}), bukan path mentah, agar label tetap sedikit
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            key = (scope["method"], route_path, status)
+            child = self._latency.get(key)
+            if child is None:
+                child = self._latency[key] = REQUEST_LATENCY.labels(*key)
+            child.observe(time.perf_counter() - start)
+
+
+async def _monitor_event_loop_lag(interval: float):
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - expected))
+
+
+def metrics_response() -> Response:
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        # Metrik callback hanya mencerminkan worker yang melayani scrape ini
+        for collector in _callback_collectors:
+            registry.register(collector)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def install_metrics(app: FastAPI):
+    """Pasang middleware, endpoint GET /metrics dan pemantau lag event loop ke app."""
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics_response, methods=["GET"], include_in_schema=False)
+
+    async def start_lag_monitor():
+        if EVENT_LOOP_LAG_INTERVAL_S > 0:
+            app.state.event_loop_lag_task = asyncio.create_task(_monitor_event_loop_lag(EVENT_LOOP_LAG_INTERVAL_S))
+
+    async def stop_lag_monitor():
+        task = getattr(app.state, "event_loop_lag_task", None)
+        if task is not None:
+            task.cancel()
+
+    app.on_event("startup")(start_lag_monitor)
+    app.on_event("shutdown")(stop_lag_monitor)
@@ -0,0 +1,65 @@
+import os
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException
+from core.auth_utils import get_hash_password, verify_and_update_password
+from core.metrics import register_callback
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# Batas antrean hash di seluruh proses; lewat dari ini request ditolak 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 4)))
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt in a dedicated process pool of `workers` processes, so hashing
+    neither holds the GIL nor occupies the request threadpool. At most
+    `max_pending` hashes may be queued or running; beyond that requests get 503.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0  # hanya diubah dari event loop
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            logger.info("Pool hash password dibuat dengan %s proses", self.workers)
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=503,
+                detail="Server sedang sibuk, silakan coba lagi.",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_hash_password, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str):
+        return await self._run(verify_and_update_password, password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordHashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+register_callback(
+    "password_hash_pending", "Password hashes queued or running in the process pool.",
+    [], lambda: {(): password_pool.pending},
+)
@@ -0,0 +1,53 @@
+import os
+from collections import defaultdict
+from fastapi import HTTPException, Request
+
+# Maksimal request hash password (login/signup/ganti sandi) yang berjalan bersamaan per IP
+PASSWORD_HASH_MAX_PER_IP = int(os.getenv("PASSWORD_HASH_MAX_PER_IP", "2"))
+# Aktifkan jika layanan berada di belakang reverse proxy yang mengisi X-Forwarded-For
+TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "false").lower() == "true"
+
+
+def client_ip(request: Request) -> str:
+    if TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class IPConcurrencyLimiter:
+    """Counts in-flight requests per client IP; used from the event loop only."""
+
+    def __init__(self, max_per_ip: int):
+        self.max_per_ip = max_per_ip
+        self._active = defaultdict(int)
+
+    def acquire(self, ip: str) -> bool:
+        if self._active[ip] >= self.max_per_ip:
+            return False
+        self._active[ip] += 1
+        return True
+
+    def release(self, ip: str):
+        self._active[ip] -= 1
+        if self._active[ip] <= 0:
+            del self._active[ip]
+
+
+password_limiter = IPConcurrencyLimiter(PASSWORD_HASH_MAX_PER_IP)
+
+
+async def limit_password_hashing(request: Request):
+    """Dependency: 429 if this IP already has PASSWORD_HASH_MAX_PER_IP hash requests in flight."""
+    ip = client_ip(request)
+    if not password_limiter.acquire(ip):
+        raise HTTPException(
+            status_code=429,
+            detail="Terlalu banyak permintaan bersamaan, silakan coba lagi.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        yield
+    finally:
+        password_limiter.release(ip)
@@ -2,6 +2,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from api.endpoints import router as auth_router
+from core.password_pool import password_pool
+from core.database import close_pool
+from core.metrics import install_metrics
 
 
 app = FastAPI()
@@ -15,6 +18,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+install_metrics(app)
+
+@app.on_event("shutdown")
+def stop_password_pool():
+    password_pool.shutdown()
+
+
+@app.on_event("shutdown")
+def stop_db_pool():
+    close_pool()
+
+
 @app.get("/", response_class=HTMLResponse)
 def read_root():
     return """
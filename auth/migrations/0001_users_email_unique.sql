@@ -0,0 +1,5 @@
+-- Email unik di tabel users: dipakai INSERT ... ON CONFLICT (email) DO NOTHING
+-- saat signup, dan mencegah dua akun dengan email sama dari signup bersamaan.
+-- Hapus duplikat yang sudah ada sebelum menjalankan migrasi ini.
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS users_email_key
+    ON "users" (email);
@@ -0,0 +1,40 @@
+"""
+Test layanan auth. Jalankan dari folder auth:
+
+    python -m pytest tests
+
+Test yang butuh database memakai Postgres stand-in benchmark (skema dari
+benchmarks/standins/schema.sql plus migrasi tiap layanan):
+
+    docker compose -f benchmarks/standins/docker-compose.yml up -d
+
+Koneksi dibaca dari PG_* (default: stand-in di localhost:55432). Jika database
+tidak bisa dihubungi, test tersebut di-skip.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("PG_HOST", "localhost")
+os.environ.setdefault("PG_PORT", "55432")
+os.environ.setdefault("PG_DB", "cekviral")
+os.environ.setdefault("PG_USER", "bench")
+os.environ.setdefault("PG_PASSWORD", "bench")
+
+
+@pytest.fixture(scope="session")
+def pg_conn():
+    import psycopg2
+    from core.database import connect_db, close_pool
+
+    try:
+        conn = connect_db()
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"Postgres stand-in tidak tersedia: {e}")
+    conn.autocommit = True
+    yield conn
+    conn.close()
+    close_pool()
@@ -0,0 +1,37 @@
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core import database
+
+
+def test_concurrent_signups_create_exactly_one_user(pg_conn):
+    email = f"race-{uuid.uuid4().hex[:12]}@example.com"
+    parallel = database.DB_POOL_MAX
+    barrier = threading.Barrier(parallel)
+
+    def signup(n):
+        barrier.wait()
+        return database.create_user(f"User {n}", email, "hash")
+
+    try:
+        with ThreadPoolExecutor(parallel) as executor:
+            ids = list(executor.map(signup, range(parallel)))
+
+        assert len([user_id for user_id in ids if user_id is not None]) == 1
+        with pg_conn.cursor() as cursor:
+            cursor.execute('SELECT count(*) AS n FROM "users" WHERE email = %s', (email,))
+            assert cursor.fetchone()["n"] == 1
+    finally:
+        with pg_conn.cursor() as cursor:
+            cursor.execute('DELETE FROM "users" WHERE email = %s', (email,))
+
+
+def test_create_user_returns_none_for_existing_email(pg_conn):
+    email = f"dup-{uuid.uuid4().hex[:12]}@example.com"
+    try:
+        assert database.create_user("Pertama", email, "hash") is not None
+        assert database.create_user("Kedua", email, "hash") is None
+    finally:
+        with pg_conn.cursor() as cursor:
+            cursor.execute('DELETE FROM "users" WHERE email = %s', (email,))
@@ -0,0 +1,114 @@
+"""
+Latency of plain-text POST /verify on a running main service, alone and
+while other clients flood it with video URLs.
+
+    python benchmarks/admission_video_flood.py --url http://localhost:8080 \
+        --duration 30 --text-concurrency 8 --video-concurrency 64
+
+Phase "text_only" runs --text-concurrency clients that send plain text.
+Phase "video_flood" runs the same text clients next to --video-concurrency
+clients that send YouTube links with random ids, so that no two share a
+job key. Each video still starts yt-dlp, which needs network access. When
+admission control works, text p99 during the flood stays close to text_only,
+and the excess videos get 429/503 with Retry-After (or 202 with
+ADMISSION_VIDEO_OVERFLOW=job). The video clients wait for Retry-After before
+they send again. To compare with the tree before admission control, run the
+script against that build. Prints one JSON line per phase.
+"""
+import json
+import time
+import random
+import string
+import asyncio
+import argparse
+from collections import Counter
+import httpx
+
+WORDS = ("pemerintah bantuan sosial vaksin banjir harga beras pemilu hoaks viral warga desa "
+         "presiden menteri polisi jalan tol listrik gratis subsidi bbm kenaikan gaji").split()
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 2)
+
+
+def random_video_url(rng: random.Random) -> str:
+    video_id = "".join(rng.choice(string.ascii_letters + string.digits + "-_") for _ in range(11))
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+async def text_client(client, url: str, deadline: float, rng: random.Random, latencies: list, statuses: Counter):
+    while time.monotonic() < deadline:
+        body = {"content": " ".join(rng.choice(WORDS) for _ in range(40))}
+        start = time.perf_counter()
+        try:
+            response = await client.post(f"{url}/verify", json=body)
+            statuses[response.status_code] += 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def video_client(client, url: str, deadline: float, rng: random.Random, statuses: Counter, retry_after: Counter):
+    while time.monotonic() < deadline:
+        try:
+            response = await client.post(f"{url}/verify", json={"content": random_video_url(rng)})
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+            continue
+        statuses[response.status_code] += 1
+        if "Retry-After" in response.headers:
+            retry_after[response.headers["Retry-After"]] += 1
+            # Klien yang sopan menunggu sesuai Retry-After, tetapi tidak melewati akhir fase
+            await asyncio.sleep(min(float(response.headers["Retry-After"]), max(0.0, deadline - time.monotonic())))
+
+
+async def run_phase(name: str, args, video_clients: int) -> dict:
+    rng = random.Random(name)
+    latencies, text_statuses = [], Counter()
+    video_statuses, retry_after = Counter(), Counter()
+    limits = httpx.Limits(max_connections=args.text_concurrency + video_clients)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        deadline = time.monotonic() + args.duration
+        videos = [
+            asyncio.create_task(video_client(client, args.url, deadline, random.Random(rng.random()), video_statuses, retry_after))
+            for _ in range(video_clients)
+        ]
+        await asyncio.gather(*(
+            text_client(client, args.url, deadline, random.Random(rng.random()), latencies, text_statuses)
+            for _ in range(args.text_concurrency)
+        ))
+        # Video yang diterima bisa berjalan lama (unduh + transkripsi); tidak ditunggu
+        for task in videos:
+            task.cancel()
+        await asyncio.gather(*videos, return_exceptions=True)
+    return {
+        "phase": name,
+        "text_requests": len(latencies),
+        "text_p50_ms": percentile(latencies, 0.50),
+        "text_p99_ms": percentile(latencies, 0.99),
+        "text_status_counts": {str(status): count for status, count in text_statuses.items()},
+        "video_clients": video_clients,
+        "video_status_counts": {str(status): count for status, count in video_statuses.items()},
+        "video_retry_after_s": dict(sorted(retry_after.items(), key=lambda item: int(item[0]))),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--duration", type=float, default=30.0, help="detik per fase")
+    parser.add_argument("--text-concurrency", type=int, default=8)
+    parser.add_argument("--video-concurrency", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    for name, video_clients in (("text_only", 0), ("video_flood", args.video_concurrency)):
+        print(json.dumps(await run_phase(name, args, video_clients)), flush=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
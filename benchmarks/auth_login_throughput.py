@@ -0,0 +1,80 @@
+"""
+Login throughput of a running auth service under concurrent load, plus the
+latency of a cheap endpoint (GET /) probed while the logins run, which
+shows whether password hashing starves the rest of the service.
+
+    python benchmarks/auth_login_throughput.py --url http://localhost:8000 \
+        --email bench@example.com --password rahasia123 --concurrency 32
+
+All requests come from one IP, so start the service with
+PASSWORD_HASH_MAX_PER_IP >= --concurrency to measure throughput, or keep
+the default to see the per-IP limit answering 429. Prints one JSON line.
+"""
+import json
+import time
+import asyncio
+import argparse
+from collections import Counter
+import httpx
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 1)
+
+
+async def login_worker(client, args, deadline, latencies, statuses):
+    payload = {"email": args.email, "password": args.password}
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        response = await client.post("/login", json=payload)
+        statuses[response.status_code] += 1
+        if response.status_code == 200:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def probe(client, deadline, latencies):
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        await client.get("/")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.05)
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        (await client.post("/login", json={"email": args.email, "password": args.password})).raise_for_status()
+
+        login_latencies, probe_latencies, statuses = [], [], Counter()
+        deadline = time.monotonic() + args.duration
+        start = time.perf_counter()
+        await asyncio.gather(
+            probe(client, deadline, probe_latencies),
+            *(login_worker(client, args, deadline, login_latencies, statuses) for _ in range(args.concurrency)),
+        )
+        elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 1),
+        "logins_per_s": round(len(login_latencies) / elapsed, 1),
+        "login_p50_ms": percentile(login_latencies, 0.5),
+        "login_p95_ms": percentile(login_latencies, 0.95),
+        "probe_p50_ms": percentile(probe_latencies, 0.5),
+        "probe_p95_ms": percentile(probe_latencies, 0.95),
+        "probe_max_ms": round(max(probe_latencies), 1) if probe_latencies else None,
+        "status_counts": dict(statuses),
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0)
+    asyncio.run(main(parser.parse_args()))
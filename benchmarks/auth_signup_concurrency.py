@@ -0,0 +1,70 @@
+"""
+Fire parallel signups for the same email at a running auth service and check
+that exactly one succeeds and exactly one `users` row is created.
+
+    PG_DB=... PG_USER=... PG_PASSWORD=... PG_HOST=... PG_PORT=... \
+        python benchmarks/auth_signup_concurrency.py --url http://localhost:8000 --parallel 20
+
+The service must allow --parallel concurrent hash requests from one IP
+(PASSWORD_HASH_MAX_PER_IP). The created user is deleted afterwards. Prints
+one JSON line and exits non-zero if the check fails.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import statistics
+from collections import Counter
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "auth"))
+
+from core.database import connect_db
+
+
+async def signup(client, email, latencies):
+    start = time.perf_counter()
+    response = await client.post("/signup", json={"name": "Bench", "email": email, "password": "rahasia123"})
+    latencies.append((time.perf_counter() - start) * 1000)
+    return response.status_code
+
+
+async def main(args):
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    latencies = []
+    limits = httpx.Limits(max_connections=args.parallel)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        statuses = Counter(await asyncio.gather(*(signup(client, email, latencies) for _ in range(args.parallel))))
+
+    conn = connect_db()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT count(*) AS n FROM "users" WHERE email = %s', (email,))
+            rows = cursor.fetchone()["n"]
+            cursor.execute('DELETE FROM "users" WHERE email = %s', (email,))
+        conn.commit()
+    finally:
+        conn.close()
+
+    ok = rows == 1 and statuses[200] == 1 and statuses[400] == args.parallel - 1
+    print(json.dumps({
+        "parallel": args.parallel,
+        "users_rows": rows,
+        "status_counts": dict(statuses),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "max_ms": round(max(latencies), 1),
+        "ok": ok,
+    }))
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--parallel", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
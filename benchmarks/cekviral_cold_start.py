@@ -0,0 +1,74 @@
+"""
+Cold-start timings of the main service: spawn `python main.py`, then
+measure the time until the first HTTP response, until /ready reports
+the model warm, and the latency of the first /verify request.
+
+    python benchmarks/cekviral_cold_start.py
+    python benchmarks/cekviral_cold_start.py --lazy --runs 3
+
+--lazy starts the service with LAZY_STARTUP=true (model loaded in the
+background). The service's own environment (.env, SUPABASE_*, NLTK_DATA,
+HF_HUB_OFFLINE, ...) is passed through. Prints one JSON line per run.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(BENCH_DIR, "..", "cekviral_project")
+
+
+def wait_for(client, path, expected_status, deadline):
+    while time.monotonic() < deadline:
+        try:
+            if client.get(path).status_code == expected_status:
+                return time.monotonic()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.02)
+    raise SystemExit(f"Timeout menunggu {path}")
+
+
+def run_once(args) -> dict:
+    env = {**os.environ, "PORT": str(args.port), "LAZY_STARTUP": "true" if args.lazy else "false"}
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "main.py"], cwd=PROJECT_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + args.timeout
+        with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=args.timeout) as client:
+            first_response = wait_for(client, "/", 200, deadline)
+            ready = wait_for(client, "/ready", 200, deadline)
+
+            start = time.perf_counter()
+            client.post("/verify", json={"content": args.text}).raise_for_status()
+            first_verify_ms = (time.perf_counter() - start) * 1000
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    return {
+        "lazy_startup": args.lazy,
+        "time_to_first_response_s": round(first_response - started, 3),
+        "time_to_ready_s": round(ready - started, 3),
+        "first_verify_ms": round(first_verify_ms, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lazy", action="store_true")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--text", default="pemerintah membagikan bantuan sosial tunai kepada seluruh warga mulai bulan depan")
+    args = parser.parse_args()
+
+    for _ in range(args.runs):
+        print(json.dumps(run_once(args)))
@@ -0,0 +1,108 @@
+"""
+Memory footprint of the main service served by gunicorn at several worker
+counts, with resources preloaded in the master and shared across the fork
+(GUNICORN_PRELOAD=true) versus every worker loading its own copy
+(GUNICORN_PRELOAD=false).
+
+    python benchmarks/cekviral_worker_memory.py --workers 1 4 8
+
+For every configuration the service is started, each worker is warmed with a
+few /verify requests, and the memory of the master plus its workers is read
+from /proc/<pid>/smaps_rollup. total_rss_mb counts shared pages once per
+process (what `ps` adds up to); total_pss_mb splits shared pages between the
+processes that map them and is the real footprint. Linux only. Prints one
+JSON line per configuration.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(BENCH_DIR, "..", "cekviral_project")
+
+TEXT = "pemerintah membagikan bantuan sosial tunai kepada seluruh warga mulai bulan depan"
+
+
+def children(pid: int) -> list[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def memory_kb(pid: int) -> dict:
+    usage = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty"):
+                usage[key] = int(value.split()[0])
+    return usage
+
+
+def wait_ready(client, master_pid, workers, deadline):
+    while time.monotonic() < deadline:
+        try:
+            if len(children(master_pid)) == workers and client.get("/ready").status_code == 200:
+                return
+        except (httpx.TransportError, FileNotFoundError):
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Timeout menunggu {workers} worker siap")
+
+
+def measure(workers: int, preload: bool, args) -> dict:
+    env = {
+        **os.environ,
+        "PORT": str(args.port),
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_PRELOAD": "true" if preload else "false",
+        "TFLITE_NUM_THREADS": os.getenv("TFLITE_NUM_THREADS", "1"),
+    }
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=args.timeout) as client:
+            wait_ready(client, process.pid, workers, started + args.timeout)
+            boot_s = time.monotonic() - started
+            # Koneksi baru per request agar beban tersebar ke semua worker
+            for _ in range(workers * args.requests_per_worker):
+                httpx.post(f"http://127.0.0.1:{args.port}/verify", json={"content": TEXT}, timeout=args.timeout).raise_for_status()
+        time.sleep(1)
+
+        pids = [process.pid] + children(process.pid)
+        usages = [memory_kb(pid) for pid in pids]
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+    total = lambda key: round(sum(u.get(key, 0) for u in usages) / 1024, 1)
+    return {
+        "workers": workers,
+        "preload": preload,
+        "processes": len(pids),
+        "boot_s": round(boot_s, 1),
+        "total_rss_mb": total("Rss"),
+        "total_pss_mb": total("Pss"),
+        "shared_mb": round(total("Shared_Clean") + total("Shared_Dirty"), 1),
+        "private_mb": round(total("Private_Clean") + total("Private_Dirty"), 1),
+        "worker_pss_mb": [round(u.get("Pss", 0) / 1024, 1) for u in usages[1:]],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--requests-per-worker", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        for preload in (False, True):
+            print(json.dumps(measure(workers, preload, args)), flush=True)
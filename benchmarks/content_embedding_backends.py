@@ -0,0 +1,80 @@
+"""
+Cold start, RSS and throughput of the content-service embedding backends.
+
+    python benchmarks/content_embedding_backends.py --backends torch onnx-int8
+
+Each backend runs in a fresh interpreter so import and model-load costs are
+measured from a cold process, the way a new worker would see them.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "content")
+
+SENTENCES = [
+    "pemerintah membagikan bantuan sosial tunai kepada seluruh warga mulai bulan depan",
+    "vaksin covid mengandung microchip untuk melacak penduduk",
+    "banjir besar melanda jakarta setelah hujan deras semalaman",
+    "beredar pesan berantai tentang penculikan anak di sekolah dasar",
+]
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_one(backend: str, count: int, batch_size: int) -> dict:
+    sys.path.insert(0, CONTENT_DIR)
+    start = time.perf_counter()
+    from core.embedding import load_backend
+    model = load_backend(backend)
+    model.encode(SENTENCES[:1], batch_size=1)
+    cold_start_s = time.perf_counter() - start
+
+    texts = [SENTENCES[i % len(SENTENCES)] + f" {i}" for i in range(count)]
+    start = time.perf_counter()
+    model.encode(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    single = []
+    for text in texts[:50]:
+        t0 = time.perf_counter()
+        model.encode([text], batch_size=1)
+        single.append((time.perf_counter() - t0) * 1000)
+    single.sort()
+
+    return {
+        "backend": backend,
+        "cold_start_s": round(cold_start_s, 3),
+        "rss_mb": round(_rss_mb(), 1),
+        "embeddings_per_s": round(count / elapsed, 1),
+        "single_p50_ms": round(single[len(single) // 2], 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx-int8"])
+    parser.add_argument("--count", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(args.child, args.count, args.batch_size)))
+        sys.exit(0)
+
+    for backend in args.backends:
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", backend, "--count", str(args.count), "--batch-size", str(args.batch_size)],
+            capture_output=True, text=True, check=True,
+        )
+        print(out.stdout.strip().splitlines()[-1])
@@ -0,0 +1,88 @@
+"""
+Prompt size and end-to-end generation latency of the RAG context builder
+against the old prompt (full descriptions, context included twice), on
+recorded queries.
+
+    LLM_BACKEND=fake python benchmarks/content_rag_context.py
+    LLM_BACKEND=gemini api_key=... python benchmarks/content_rag_context.py --queries my_queries.jsonl
+
+Each line of the queries file holds `processed_text`, `final_label_threshold`
+and the retrieved `docs` rows (news_id, status, title, description).
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "content"))
+
+from core.context_builder import count_tokens
+from core.llm import get_llm_client
+from core.rag_utils import build_prompt, build_rag_context
+
+
+def legacy_prompt(docs, question, label_threshold):
+    context = "\n\n".join(f"[{d['status']}] {d['title']}\n{d['description']}" for d in docs)
+    return f"""
+Berikut adalah informasi relevan:
+{context}
+
+Dan berikut adalah label akhir hasil prediksi:
+{label_threshold.upper()}
+
+Jadi Anda adalah seorang ahli yang diminta untuk menjelaskan apakah input dari user di bawah ini 
+adalah konten asli atau hoax berdasarkan informasi yang tertera pada {context} dan {label_threshold.upper()}:
+{question}
+"""
+
+
+async def timed_generate(client, prompt):
+    start = time.perf_counter()
+    await client.generate(prompt)
+    return (time.perf_counter() - start) * 1000
+
+
+async def main(path, repeat):
+    with open(path) as f:
+        queries = [json.loads(line) for line in f if line.strip()]
+
+    client = get_llm_client()
+    rows = []
+    for q in queries:
+        question, label, docs = q["processed_text"], q["final_label_threshold"], q["docs"]
+        old_prompt = legacy_prompt(docs, question, label)
+        context, _, _ = build_rag_context(docs, question, label)
+        new_prompt = build_prompt(context, question, label)
+
+        old_ms = [await timed_generate(client, old_prompt) for _ in range(repeat)]
+        new_ms = [await timed_generate(client, new_prompt) for _ in range(repeat)]
+        rows.append({
+            "query": question[:40],
+            "prompt_tokens_old": count_tokens(old_prompt),
+            "prompt_tokens_new": count_tokens(new_prompt),
+            "latency_ms_old": round(statistics.median(old_ms), 1),
+            "latency_ms_new": round(statistics.median(new_ms), 1),
+        })
+
+    for row in rows:
+        print(json.dumps(row))
+    total_old = sum(r["prompt_tokens_old"] for r in rows)
+    total_new = sum(r["prompt_tokens_new"] for r in rows)
+    print(json.dumps({
+        "queries": len(rows),
+        "prompt_tokens_saved_pct": round(100 * (1 - total_new / total_old), 1) if total_old else 0.0,
+        "latency_ms_old_median": statistics.median(r["latency_ms_old"] for r in rows),
+        "latency_ms_new_median": statistics.median(r["latency_ms_new"] for r in rows),
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", default=os.path.join(BENCH_DIR, "data", "rag_queries.jsonl"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.queries, args.repeat))
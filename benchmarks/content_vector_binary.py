@@ -0,0 +1,106 @@
+"""
+Cost of passing a 384-dim query vector to pgvector as a decimal string (the
+old `"[" + ",".join(map(str, vector)) + "]"` with `%s::vector`) versus the
+binary float32 dumper in content/core/vector_adapter.py (`%b`).
+
+    python benchmarks/content_vector_binary.py --encode-only
+    PG_DB=... PG_USER=... PG_PASSWORD=... PG_HOST=... PG_PORT=... \
+        python benchmarks/content_vector_binary.py --queries 500
+
+"encode" times only turning the embedding into the query parameter, in
+us_per_op. "query" runs the RAG retrieval query (ORDER BY vector <#> ...
+LIMIT 5) on the news table, in p50/p99 ms per query, and includes encoding,
+sending and parsing the parameter on the server. Prints one JSON line per
+(stage, format).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "content"))
+
+from core.vector_adapter import VectorBinaryDumper
+
+DIM = 384
+QUERY = "SELECT news_id, status, title, description FROM news ORDER BY vector <#> {param} LIMIT 5"
+
+
+def text_param(vector: np.ndarray) -> str:
+    # Jalur lama: embed_query mengembalikan list (tolist), lalu diformat jadi string
+    return "[" + ",".join(map(str, vector.tolist())) + "]"
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 3)
+
+
+def time_encode(fn, vectors, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for vector in vectors:
+            fn(vector)
+        best = min(best, (time.perf_counter() - start) / len(vectors) * 1e6)
+    return best
+
+
+def time_queries(conn, sql: str, to_param, vectors) -> list[float]:
+    # Parameter dibuat di dalam pengukuran, sama seperti di request
+    latencies = []
+    cursor = conn.cursor()
+    cursor.execute(sql, (to_param(vectors[0]),))  # pemanasan
+    cursor.fetchall()
+    for vector in vectors:
+        start = time.perf_counter()
+        cursor.execute(sql, (to_param(vector),))
+        cursor.fetchall()
+        latencies.append((time.perf_counter() - start) * 1000)
+    cursor.close()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--encode-only", action="store_true", help="tanpa database")
+    args = parser.parse_args()
+
+    vectors = np.random.default_rng(0).standard_normal((args.queries, DIM)).astype(np.float32)
+    dumper = VectorBinaryDumper(np.ndarray)
+    encoders = (("text", text_param), ("binary", dumper.dump))
+    for name, fn in encoders:
+        print(json.dumps({
+            "stage": "encode", "format": name, "dim": DIM,
+            "us_per_op": round(time_encode(fn, vectors, args.rounds), 2),
+            "param_bytes": len(fn(vectors[0])),
+        }), flush=True)
+    if args.encode_only:
+        return
+
+    from core.database import connect_db
+    conn = connect_db()
+    try:
+        variants = (
+            ("text", QUERY.format(param="%s::vector"), text_param),
+            ("binary", QUERY.format(param="%b"), lambda vector: vector),
+        )
+        for name, sql, to_param in variants:
+            latencies = time_queries(conn, sql, to_param, vectors)
+            print(json.dumps({
+                "stage": "query", "format": name, "queries": len(latencies),
+                "p50_ms": percentile(latencies, 0.50),
+                "p99_ms": percentile(latencies, 0.99),
+            }), flush=True)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+RAG retrieval latency of the in-process NewsVectorIndex against the SQL path
+of search_docs_for_rag (ORDER BY vector <#> query in Postgres), with the
+top-k overlap between the two.
+
+    PG_DB=... PG_USER=... PG_PASSWORD=... PG_HOST=... PG_PORT=... \
+        python benchmarks/content_vector_index.py --queries 500 --top-k 5
+
+The index is built from the `news` table into a temporary directory, the
+way a first startup with RAG_VECTOR_INDEX_PATH would. Queries are random
+unit vectors. --seed-news inserts that many extra random rows before the
+run, to measure a larger table, and deletes them afterwards. Prints one JSON
+line per path.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "content"))
+
+from core import rag_utils
+from core.database import connect_db
+from core.vector_index import NewsVectorIndex
+
+DIM = 384
+SEED_TITLE = "bench-vector-index"
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 3)
+
+
+def seed_news(conn, count: int, rng: np.random.Generator):
+    cursor = conn.cursor()
+    for start in range(0, count, 1000):
+        vectors = rng.standard_normal((min(1000, count - start), DIM)).astype(np.float32)
+        with cursor.copy("COPY news (status, title, description, vector) FROM STDIN") as copy:
+            for vector in vectors:
+                copy.write_row(("FAKTA", SEED_TITLE, "berita benchmark", "[" + ",".join(map(str, vector)) + "]"))
+    conn.commit()
+    cursor.close()
+
+
+def delete_seeded(conn):
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM news WHERE title = %s", (SEED_TITLE,))
+    conn.commit()
+    cursor.close()
+
+
+def time_path(search, queries) -> tuple[list[list[int]], list[float]]:
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        rows = search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([row["news_id"] for row in rows])
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed-news", type=int, default=0, help="baris news acak tambahan (dihapus setelahnya)")
+    args = parser.parse_args()
+
+    # Jalur SQL selalu ke Postgres walaupun RAG_VECTOR_INDEX_PATH diatur
+    rag_utils.news_index = None
+    rng = np.random.default_rng(0)
+    conn = connect_db()
+    try:
+        if args.seed_news:
+            seed_news(conn, args.seed_news, rng)
+
+        start = time.perf_counter()
+        index = NewsVectorIndex(os.path.join(tempfile.mkdtemp(), "index"))
+        index.load(conn)
+        build_s = time.perf_counter() - start
+
+        queries = rng.standard_normal((args.queries, DIM)).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        # Pemanasan kedua jalur (page cache, rencana query)
+        index.search(queries[0], args.top_k)
+        rag_utils.search_docs_for_rag(conn, queries[0], top_k=args.top_k)
+
+        sql_results, sql_ms = time_path(lambda q: rag_utils.search_docs_for_rag(conn, q, top_k=args.top_k), queries)
+        index_results, index_ms = time_path(lambda q: index.search(q, args.top_k), queries)
+
+        overlap = np.mean([len(set(a) & set(b)) / args.top_k for a, b in zip(sql_results, index_results)])
+        exact = np.mean([a == b for a, b in zip(sql_results, index_results)])
+        for path, latencies in (("sql", sql_ms), ("index", index_ms)):
+            print(json.dumps({
+                "path": path,
+                "documents": len(index),
+                "queries": args.queries,
+                "top_k": args.top_k,
+                "p50_ms": percentile(latencies, 0.50),
+                "p99_ms": percentile(latencies, 0.99),
+                "build_s": round(build_s, 2) if path == "index" else None,
+                "overlap_with_sql": round(float(overlap), 4),
+                "same_order_as_sql": round(float(exact), 4),
+            }), flush=True)
+    finally:
+        if args.seed_news:
+            delete_seeded(conn)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+End-to-end latency of the fused /verify/explain endpoint against the
+three-call flow (/verify, /inference/rag, /inference/{history_id}/recommendations).
+
+    python benchmarks/e2e_verify_explain.py \
+        --main-url http://localhost:8080 --content-url http://localhost:8000 \
+        --token "$JWT" --repeat 10
+
+Both flows need a logged-in user (the explanation is tied to a history row).
+Run the content service with LLM_BACKEND=fake to take Gemini out of the
+measurement, and with LLM_CACHE_SIZE=0 so repeated texts are not served from
+the answer cache.
+"""
+import json
+import time
+import argparse
+import statistics
+import httpx
+
+TEXTS = [
+    "Beredar pesan bahwa vaksin covid mengandung microchip untuk melacak penduduk.",
+    "Pemerintah membagikan bantuan sosial tunai Rp 3 juta, daftar lewat link berikut.",
+    "Minum air garam hangat bisa menyembuhkan infeksi virus dalam tiga hari.",
+]
+
+
+def three_calls(client, main_url, content_url, headers, text):
+    start = time.perf_counter()
+    verified = client.post(f"{main_url}/verify", json={"content": text}, headers=headers).json()
+    history_id = verified["history_id"]
+    client.post(f"{content_url}/inference/rag", headers=headers, json={
+        "processed_text": verified["processed_text"],
+        "final_label_threshold": verified["prediction"]["final_label_thresholded"],
+        "history_id": history_id,
+    }).raise_for_status()
+    client.post(f"{content_url}/inference/{history_id}/recommendations", headers=headers).raise_for_status()
+    return {"total_ms": (time.perf_counter() - start) * 1000}
+
+
+def fused(client, main_url, headers, text):
+    start = time.perf_counter()
+    first_part_ms, parts = None, []
+    with client.stream("POST", f"{main_url}/verify/explain", json={"content": text}, headers=headers) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            if first_part_ms is None:
+                first_part_ms = (time.perf_counter() - start) * 1000
+            parts.append(json.loads(line)["part"])
+    return {"total_ms": (time.perf_counter() - start) * 1000, "first_part_ms": first_part_ms, "parts": parts}
+
+
+def summarize(name, runs):
+    totals = sorted(r["total_ms"] for r in runs)
+    summary = {
+        "flow": name,
+        "runs": len(runs),
+        "total_ms_p50": round(statistics.median(totals), 1),
+        "total_ms_max": round(totals[-1], 1),
+    }
+    firsts = [r["first_part_ms"] for r in runs if r.get("first_part_ms") is not None]
+    if firsts:
+        summary["first_part_ms_p50"] = round(statistics.median(firsts), 1)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--main-url", default="http://localhost:8080")
+    parser.add_argument("--content-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"}
+    with httpx.Client(timeout=120) as client:
+        baseline, single = [], []
+        for i in range(args.repeat):
+            text = f"{TEXTS[i % len(TEXTS)]} ({i})"
+            baseline.append(three_calls(client, args.main_url, args.content_url, headers, text))
+            single.append(fused(client, args.main_url, headers, text + " fused"))
+
+    print(json.dumps(summarize("three_calls", baseline)))
+    print(json.dumps(summarize("verify_explain", single)))
@@ -0,0 +1,139 @@
+"""
+Page latency of keyset pagination vs. LIMIT/OFFSET for /history/me on a
+user with many history rows.
+
+    PG_DB=... PG_USER=... PG_PASSWORD=... PG_HOST=... PG_PORT=... \
+        python benchmarks/history_keyset_pagination.py --rows 100000
+
+Rows are generated into a TEMP table shaped like `history` with the same
+(user_id, created_at DESC, history_id DESC) index as
+history/migrations/0001, so nothing is written to the real tables. Prints one
+JSON line per (method, page depth).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "history"))
+
+from core.database import connect_db
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+COLUMNS = """history_id, original_input, processed_text, predicted_label,
+             prob_hoax, prob_fakta, final_label_threshold, inference_time_ms, created_at"""
+
+
+def seed(conn, rows: int):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TEMP TABLE history (
+            history_id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+            user_id uuid NOT NULL,
+            original_input text,
+            processed_text text,
+            predicted_label text,
+            prob_hoax double precision,
+            prob_fakta double precision,
+            final_label_threshold text,
+            inference_time_ms double precision,
+            created_at timestamptz NOT NULL
+        );
+        """
+    )
+    # Separuh baris milik user lain supaya index benar-benar harus menyaring user_id
+    cursor.execute(
+        """
+        INSERT INTO history (user_id, original_input, processed_text, predicted_label,
+                             prob_hoax, prob_fakta, final_label_threshold, inference_time_ms, created_at)
+        SELECT CASE WHEN i % 2 = 0 THEN %s::uuid ELSE gen_random_uuid() END,
+               'input ' || i, 'teks ' || i, 'hoax', random(), random(), 'hoax', random() * 100,
+               now() - make_interval(secs => i)
+        FROM generate_series(1, %s) AS i;
+        """,
+        (USER_ID, rows * 2),
+    )
+    cursor.execute("CREATE INDEX ON history (user_id, created_at DESC, history_id DESC);")
+    cursor.execute("ANALYZE history;")
+    cursor.close()
+
+
+def timed(conn, sql, params, repeat):
+    cursor = conn.cursor()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        latencies.append((time.perf_counter() - start) * 1000)
+    cursor.close()
+    return rows, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="history rows for the benchmarked user")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--depths", default="1,10,100,1000,4000", help="page numbers to measure")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    conn = connect_db()
+    seed(conn, args.rows)
+
+    depths = [int(d) for d in args.depths.split(",") if (int(d) - 1) * args.page_size < args.rows]
+    for depth in depths:
+        offset = (depth - 1) * args.page_size
+
+        # Kursor keyset = baris terakhir halaman sebelumnya
+        before = None
+        if offset:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT created_at, history_id FROM history WHERE user_id = %s
+                ORDER BY created_at DESC, history_id DESC OFFSET %s LIMIT 1;
+                """,
+                (USER_ID, offset - 1),
+            )
+            row = cursor.fetchone()
+            before = (row["created_at"], row["history_id"])
+            cursor.close()
+
+        offset_rows, offset_ms = timed(
+            conn,
+            f"""SELECT {COLUMNS} FROM history WHERE user_id = %s
+                ORDER BY created_at DESC, history_id DESC LIMIT %s OFFSET %s;""",
+            (USER_ID, args.page_size, offset),
+            args.repeat,
+        )
+        if before is None:
+            keyset_sql = f"""SELECT {COLUMNS} FROM history WHERE user_id = %s
+                ORDER BY created_at DESC, history_id DESC LIMIT %s;"""
+            keyset_params = (USER_ID, args.page_size)
+        else:
+            keyset_sql = f"""SELECT {COLUMNS} FROM history
+                WHERE user_id = %s AND (created_at, history_id) < (%s, %s)
+                ORDER BY created_at DESC, history_id DESC LIMIT %s;"""
+            keyset_params = (USER_ID, before[0], before[1], args.page_size)
+        keyset_rows, keyset_ms = timed(conn, keyset_sql, keyset_params, args.repeat)
+
+        assert [r["history_id"] for r in offset_rows] == [r["history_id"] for r in keyset_rows]
+        for method, latencies in (("offset", offset_ms), ("keyset", keyset_ms)):
+            print(json.dumps({
+                "method": method,
+                "page": depth,
+                "page_size": args.page_size,
+                "p50_ms": round(statistics.median(latencies), 3),
+                "max_ms": round(max(latencies), 3),
+            }))
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
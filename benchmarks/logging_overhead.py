@@ -0,0 +1,152 @@
+"""
+Per-request cost of the main service's logging on the request path, before
+and after the queue-based setup in app/core/logging_setup.py.
+
+    python benchmarks/logging_overhead.py --threads 8 --requests 5000
+
+Every "request" issues the log statements that one logged-in /verify of a
+plain text goes through: verification start, preprocessed text,
+probabilities and label, Supabase payload, and saved id. legacy uses the
+old statements (INFO f-strings) with the old basicConfig handler, which
+writes synchronously under the handler lock. The other variants use the
+new statements (DEBUG and %-style for the text and payload, SAMPLED for
+per-request INFO lines) with the queue handler, at LOG_SAMPLE_RATE=1 and
+at the default rate. Worker threads stand in for asyncio.to_thread
+workers. Logs go to a real file (--log-file) so write costs are included.
+us_per_request is measured on the request threads; drain_ms is how long
+the listener then takes to catch up. Prints one JSON line per variant.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import threading
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "cekviral_project"))
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+from app.core.config import settings
+from app.core.logging_setup import SAMPLED, TEXT_FORMAT, setup_logging, stop_logging
+
+TEXT = ("Beredar pesan bahwa vaksin covid mengandung microchip untuk melacak penduduk, "
+        "sebarkan ke keluarga dan teman agar semua waspada terhadap program vaksinasi.")
+PROCESSED = "beredar pesan vaksin covid mengandung microchip melacak penduduk sebarkan keluarga teman"
+RESULT = {
+    "probabilities": {"HOAKS": 0.9731, "FAKTA": 0.0269},
+    "predicted_label_model": "HOAKS", "final_label_thresholded": "HOAKS", "inference_time_ms": 41.7,
+}
+ROW = {
+    "original_input": TEXT, "processed_text": PROCESSED, "prob_hoax": 0.9731, "prob_fakta": 0.0269,
+    "final_label_threshold": "HOAKS", "inference_time_ms": 41.7, "predicted_label": "HOAKS",
+    "user_id": "6f1c2d1e-9a7b-4c55-8e2f-1d3c4b5a6978",
+}
+
+endpoints_log = logging.getLogger("app.api.endpoints")
+model_log = logging.getLogger("app.services.ml_model")
+database_log = logging.getLogger("app.services.database")
+
+
+def legacy_request(user_id: str, history_id: str):
+    endpoints_log.info(f"Verifikasi ML untuk teks: {TEXT[:100]}...")
+    model_log.info(f"Teks setelah pra-pemrosesan: {PROCESSED[:100]}...")
+    model_log.info(f"Probabilities: HOAKS={RESULT['probabilities']['HOAKS']:.4f}, FAKTA={RESULT['probabilities']['FAKTA']:.4f}")
+    model_log.info(f"Predicted label by model: {RESULT['predicted_label_model']}, Final (thresholded): {RESULT['final_label_thresholded']}")
+    endpoints_log.info(f"Penyimpanan ke Supabase untuk user_id: {user_id}")
+    database_log.info(f"Menyimpan hasil verifikasi ke Supabase: {ROW}")
+    database_log.info(f"Data berhasil disimpan ke Supabase dengan ID: {history_id}")
+
+
+def structured_request(user_id: str, history_id: str):
+    endpoints_log.debug("Verifikasi ML untuk teks: %.100s...", TEXT)
+    model_log.debug("Teks setelah pra-pemrosesan: %.100s...", PROCESSED)
+    model_log.info(
+        "Prediksi: HOAKS=%.4f, FAKTA=%.4f, label model %s, final (thresholded) %s, %.1fms",
+        RESULT['probabilities']['HOAKS'], RESULT['probabilities']['FAKTA'],
+        RESULT['predicted_label_model'], RESULT['final_label_thresholded'], RESULT['inference_time_ms'],
+        extra=SAMPLED,
+    )
+    endpoints_log.info("Penyimpanan ke Supabase untuk user_id: %s", user_id, extra=SAMPLED)
+    database_log.debug("Menyimpan hasil verifikasi ke Supabase: %s", ROW)
+    database_log.info("Data berhasil disimpan ke Supabase dengan ID: %s", history_id, extra=SAMPLED)
+
+
+def run_threads(request_fn, threads: int, requests: int) -> float:
+    """Kembalikan rata-rata waktu per request (us) yang dihabiskan thread request."""
+    per_thread = []
+    barrier = threading.Barrier(threads)
+
+    def worker(n):
+        user_id, history_id = ROW["user_id"], f"hist-{n}"
+        barrier.wait()
+        start = time.perf_counter()
+        for _ in range(requests):
+            request_fn(user_id, history_id)
+        per_thread.append((time.perf_counter() - start) / requests * 1e6)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return sum(per_thread) / len(per_thread)
+
+
+def configure_legacy(log_file):
+    stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(log_file)
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=5000, help="request per thread")
+    parser.add_argument("--sample-rate", type=float, default=settings.LOG_SAMPLE_RATE)
+    parser.add_argument("--log-file", default=None, help="default: file sementara")
+    args = parser.parse_args()
+
+    path = args.log_file or os.path.join(tempfile.mkdtemp(), "bench.log")
+    variants = [
+        ("legacy", None, legacy_request),
+        ("structured_queue", 1.0, structured_request),
+        ("structured_queue_sampled", args.sample_rate, structured_request),
+    ]
+    baseline_us = None
+    with open(path, "a", encoding="utf-8") as log_file:
+        for name, sample_rate, request_fn in variants:
+            if sample_rate is None:
+                configure_legacy(log_file)
+            else:
+                # Antrean cukup besar agar tidak ada record yang dibuang selama pengukuran
+                setup_logging("INFO", "json", sample_rate, queue_size=0, stream=log_file)
+            size_before = os.path.getsize(path)
+
+            us = run_threads(request_fn, args.threads, args.requests)
+            drain_start = time.perf_counter()
+            stop_logging()
+            log_file.flush()
+            drain_ms = (time.perf_counter() - drain_start) * 1000
+
+            baseline_us = baseline_us or us
+            print(json.dumps({
+                "variant": name,
+                "threads": args.threads,
+                "us_per_request": round(us, 2),
+                "saved_us_per_request": round(baseline_us - us, 2),
+                "drain_ms": round(drain_ms, 1) if sample_rate is not None else None,
+                "bytes_per_request": round((os.path.getsize(path) - size_before) / (args.threads * args.requests), 1),
+            }), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Per-request cost of the Prometheus instrumentation (core/metrics.py, the
+same module in every service): the same FastAPI route is called directly
+through ASGI, without a server or HTTP client, with and without
+install_metrics(), plus the cost of a bare observe_external() block.
+
+    python benchmarks/metrics_overhead.py --rounds 9 --service history
+
+Prints one JSON line per variant; overhead_us is the added time per request.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def build_app(instrumented: bool):
+    from fastapi import FastAPI
+    from core.metrics import install_metrics
+
+    app = FastAPI()
+    if instrumented:
+        install_metrics(app)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    return app
+
+
+async def call(app, path: str):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure_app(app, requests: int) -> float:
+    for i in range(200):
+        await call(app, f"/items/{i}")
+    start = time.perf_counter()
+    for i in range(requests):
+        await call(app, f"/items/{i}")
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def measure_observe(iterations: int) -> float:
+    from core.metrics import observe_external
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with observe_external("bench"):
+            pass
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def main(args):
+    sys.path.insert(0, os.path.join(BENCH_DIR, "..", args.service))
+    baseline = build_app(False)
+    instrumented = build_app(True)
+
+    # Bergantian beberapa putaran agar efek pemanasan/frekuensi CPU tidak berat sebelah
+    results = {"baseline": [], "instrumented": []}
+    for _ in range(args.rounds):
+        results["baseline"].append(await measure_app(baseline, args.requests))
+        results["instrumented"].append(await measure_app(instrumented, args.requests))
+
+    # Minimum per varian: paling sedikit terganggu proses lain di mesin yang sama
+    base_us = min(results["baseline"])
+    inst_us = min(results["instrumented"])
+    print(json.dumps({
+        "variant": "baseline",
+        "us_per_request": round(base_us, 2),
+        "median_us": round(statistics.median(results["baseline"]), 2),
+    }))
+    print(json.dumps({
+        "variant": "instrumented",
+        "us_per_request": round(inst_us, 2),
+        "median_us": round(statistics.median(results["instrumented"]), 2),
+        "overhead_us": round(inst_us - base_us, 2),
+        "overhead_pct": round((inst_us - base_us) / base_us * 100, 1),
+    }))
+    print(json.dumps({"variant": "observe_external", "us_per_call": round(measure_observe(args.requests), 2)}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service", choices=["history", "content", "auth"], default="history")
+    parser.add_argument("--requests", type=int, default=5000, help="request per putaran per varian")
+    parser.add_argument("--rounds", type=int, default=9)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,85 @@
+"""
+Requests per second of the cached per-user read endpoints with a cold cache,
+a warm cache and conditional requests answered with 304.
+
+    PG_DB=... JWT_SECRET_KEY=... JWT_ALGORITHM=HS256 \
+        python benchmarks/read_cache.py --service history --token <access token>
+    python benchmarks/read_cache.py --service content --token <access token>
+
+The service app runs in-process against the configured Postgres (the LISTEN
+connection included); "cold" clears the cache before every request. Prints one
+JSON line per mode.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ENDPOINTS = {
+    "history": ("/history/me?limit=20", "history_cache"),
+    "content": ("/users/me/recommendations", "recommendations_cache"),
+}
+
+
+def run(client, path, headers, requests, before=None):
+    latencies = []
+    status_codes = set()
+    start = time.perf_counter()
+    for _ in range(requests):
+        if before:
+            before()
+        t0 = time.perf_counter()
+        response = client.get(path, headers=headers)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        status_codes.add(response.status_code)
+    elapsed = time.perf_counter() - start
+    return {
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(statistics.quantiles(latencies, n=20)[-1], 3),
+        "status": sorted(status_codes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service", choices=ENDPOINTS, default="history")
+    parser.add_argument("--token", required=True, help="access token from the auth service")
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.join(BENCH_DIR, "..", args.service))
+    from fastapi.testclient import TestClient
+    from main import app
+    import core.read_cache
+
+    path, cache_name = ENDPOINTS[args.service]
+    cache = getattr(core.read_cache, cache_name)
+    headers = {"Authorization": f"Bearer {args.token}"}
+
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 10
+        while not cache.enabled and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if not cache.enabled:
+            raise SystemExit("Read cache tidak aktif: koneksi LISTEN ke Postgres gagal")
+
+        first = client.get(path, headers=headers)
+        first.raise_for_status()
+        etag = first.headers["ETag"]
+
+        results = {
+            "cold": run(client, path, headers, args.requests, before=cache.clear),
+            "warm": run(client, path, headers, args.requests),
+            "not_modified": run(client, path, {**headers, "If-None-Match": etag}, args.requests),
+        }
+        for mode, result in results.items():
+            print(json.dumps({"service": args.service, "path": path, "mode": mode, "body_bytes": len(first.content), **result}))
+
+
+if __name__ == "__main__":
+    main()
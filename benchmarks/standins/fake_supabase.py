@@ -0,0 +1,89 @@
+"""
+Local stand-in for the Supabase REST API used by the main service: POST
+/rest/v1/<table> inserts the JSON row (or list of rows) into the stand-in
+Postgres and answers with the inserted rows, like PostgREST with
+`Prefer: return=representation`. Nothing else is implemented.
+
+    PG_HOST=localhost PG_PORT=55432 PG_DB=cekviral PG_USER=bench PG_PASSWORD=bench \
+        python benchmarks/standins/fake_supabase.py --port 54321
+
+Point the main service at it with SUPABASE_URL=http://localhost:54321 and a
+JWT-shaped SUPABASE_KEY (the client checks the format), e.g. bench.bench.bench.
+"""
+import os
+import re
+import json
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+TABLE_PATH = re.compile(r"^/rest/v1/([a-z_]+)$")
+
+pool: ThreadedConnectionPool | None = None
+
+
+def insert_rows(table: str, rows: list[dict]) -> list[dict]:
+    columns = list(rows[0])
+    query = sql.SQL("INSERT INTO {} ({}) VALUES {} RETURNING *").format(
+        sql.Identifier(table),
+        sql.SQL(", ").join(map(sql.Identifier, columns)),
+        sql.SQL(", ").join(sql.SQL("({})").format(sql.SQL(", ").join(sql.Placeholder() * len(columns))) for _ in rows),
+    )
+    params = [row.get(column) for row in rows for column in columns]
+    conn = pool.getconn()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            inserted = cursor.fetchall()
+        conn.commit()
+        return inserted
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+class SupabaseHandler(BaseHTTPRequestHandler):
+    def _reply(self, status: int, payload):
+        body = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        match = TABLE_PATH.match(self.path.split("?", 1)[0])
+        if not match:
+            self._reply(404, {"message": "not found"})
+            return
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"[]")
+        rows = payload if isinstance(payload, list) else [payload]
+        if not rows:
+            self._reply(201, [])
+            return
+        try:
+            self._reply(201, insert_rows(match.group(1), rows))
+        except Exception as e:
+            self._reply(400, {"message": str(e)})
+
+    def log_message(self, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--pool-size", type=int, default=16)
+    args = parser.parse_args()
+
+    pool = ThreadedConnectionPool(
+        1, args.pool_size,
+        dbname=os.getenv("PG_DB"), user=os.getenv("PG_USER"), password=os.getenv("PG_PASSWORD"),
+        host=os.getenv("PG_HOST"), port=os.getenv("PG_PORT"),
+    )
+    print(f"Stand-in Supabase di http://localhost:{args.port}", flush=True)
+    ThreadingHTTPServer(("0.0.0.0", args.port), SupabaseHandler).serve_forever()
@@ -0,0 +1,53 @@
+-- Skema dasar untuk stand-in Postgres benchmark (benchmarks/standins/docker-compose.yml).
+-- Tabel-tabel ini di produksi dibuat lewat Supabase; migrasi di */migrations/
+-- dijalankan sesudah file ini oleh docker-compose.
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE TABLE IF NOT EXISTS users (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name text NOT NULL,
+    email text NOT NULL,
+    password text NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS history (
+    history_id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id uuid REFERENCES users (id) ON DELETE CASCADE,
+    original_input text,
+    processed_text text,
+    predicted_label text,
+    prob_hoax double precision,
+    prob_fakta double precision,
+    final_label_threshold text,
+    inference_time_ms double precision,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS news (
+    news_id bigserial PRIMARY KEY,
+    status text,
+    title text,
+    description text,
+    link text,
+    imageurl text,
+    vector vector(384)
+);
+
+CREATE TABLE IF NOT EXISTS recommendations (
+    recom_id bigserial PRIMARY KEY,
+    history_id uuid NOT NULL REFERENCES history (history_id),
+    news_id bigint NOT NULL REFERENCES news (news_id),
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- Berita dummy untuk retrieval RAG. Vektor acak; subquery dibuat berkorelasi
+-- (WHERE g > 0) agar dihitung ulang per baris.
+INSERT INTO news (status, title, description, link, imageurl, vector)
+SELECT CASE WHEN g % 2 = 0 THEN 'HOAKS' ELSE 'FAKTA' END,
+       'Berita uji ' || g,
+       'Deskripsi berita uji nomor ' || g || ' tentang bantuan sosial, vaksin dan banjir.',
+       'https://example.com/berita/' || g,
+       'https://example.com/gambar/' || g || '.jpg',
+       (SELECT array_agg(random()::real - 0.5) FROM generate_series(1, 384) WHERE g > 0)::vector
+FROM generate_series(1, 2000) AS g;
@@ -0,0 +1,422 @@
+"""
+Benchmark suite for regression checks before merge.
+
+micro: hot functions of the main service, run in-process. Covered:
+preprocess_text_for_ml, fix_slangwords, classify_url, extract_text_from_html,
+and the TFLite invoke at batch 1 and BATCH_TEXT_SIZE. A benchmark whose
+dependencies are missing (nltk, bs4, tensorflow, ...) is reported as skipped.
+
+    python benchmarks/suite.py micro --output micro.json
+
+macro: load tests against running services that use local stand-ins. The
+endpoints are POST /login, POST /verify (text and web articles), GET
+/history/me and POST /inference/rag:
+
+    docker compose -f benchmarks/standins/docker-compose.yml up -d
+    python benchmarks/standins/fake_supabase.py &        # Supabase stand-in
+    # auth (8001), history (8002), content (8003, LLM_BACKEND=fake) and main
+    # (8080) with PG_* pointing at the compose Postgres, SUPABASE_URL at
+    # fake_supabase, one shared JWT secret (SECRET_KEY / JWT_SECRET_KEY) and
+    # PASSWORD_HASH_MAX_PER_IP >= --concurrency on auth
+    python benchmarks/suite.py macro --auth-url http://localhost:8001 \
+        --history-url http://localhost:8002 --content-url http://localhost:8003 \
+        --main-url http://localhost:8080 --output macro.json
+
+Articles for /verify come from an HTTP server started by this script. Videos
+are not load-tested, because transcription goes through yt-dlp, GCS and Google
+Speech with no local stand-in. A scenario is skipped when its service URL is not
+given.
+
+Results are one JSON document: meta (commit, machine) and results per
+benchmark. --save-baseline merges them into a baseline file. --baseline
+compares against one and exits 1 on any regression: us_per_op, p50_ms or
+p95_ms worse by more than --tolerance, rps lower by more than --tolerance,
+or error_rate up by more than one percentage point. Keep one baseline per
+machine; numbers from different hardware are not comparable.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import statistics
+import threading
+import subprocess
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(BENCH_DIR, "..", "cekviral_project")
+
+# Arah metrik: "lower" = makin kecil makin baik
+METRICS = {"us_per_op": "lower", "p50_ms": "lower", "p95_ms": "lower", "rps": "higher"}
+ERROR_RATE_TOLERANCE = 0.01
+
+TEXTS = [
+    "Beredar pesan bahwa vaksin covid mengandung microchip utk melacak penduduk, bgt bahaya!!",
+    "Pemerintah membagikan bantuan sosial tunai Rp 3 juta, daftar lewat link berikut: http://bit.ly/xyz",
+    "Minum air garam hangat bisa menyembuhkan infeksi virus dlm tiga hari, sebarkan ke keluarga",
+    "@warga desa sdh terima BLT? cek nama kamu di sini ya, gratis tanpa biaya admin #bansos",
+    "Presiden resmikan jalan tol baru sepanjang 120 km yang menghubungkan dua provinsi hari ini.",
+    "BANJIR BESAR!!! jakarta lumpuh total, warga diminta mengungsi sekarang jg",
+]
+
+WORDS = ("pemerintah bantuan sosial vaksin banjir harga beras pemilu hoaks viral warga desa "
+         "presiden menteri polisi jalan tol listrik gratis subsidi bbm kenaikan gaji").split()
+
+URLS = [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ?t=42",
+    "https://www.tiktok.com/@akun.berita/video/7234567890123456789",
+    "https://www.instagram.com/reel/Cabc123XYZ/",
+    "https://x.com/kominfo/status/1790000000000000000",
+    "https://www.instagram.com/p/Cxyz987/",
+    "https://doi.org/10.1000/182",
+    "https://www.kompas.com/tren/read/2024/01/01/hoaks-vaksin",
+    "https://turnbackhoax.id/2024/05/01/salah-foto-banjir/",
+    "https://www.detik.com/berita/d-1234567/judul-berita",
+]
+
+ARTICLE_HTML = (
+    "<html><head><title>Berita {n}</title><script>var x = 1;</script><style>p {{}}</style></head>"
+    "<body><nav>menu beranda berita</nav><header>kepala</header>"
+    "<article><h1>Judul berita {n}</h1>{paragraphs}</article>"
+    "<aside>berita terkait</aside><footer>hak cipta</footer></body></html>"
+)
+
+
+def article_html(n: int, paragraphs: int = 12) -> str:
+    rng = random.Random(n)
+    body = "".join(f"<p>{' '.join(rng.choice(WORDS) for _ in range(40))}</p>" for _ in range(paragraphs))
+    return ARTICLE_HTML.format(n=n, paragraphs=body)
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 2)
+
+
+def run_meta() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+# ----------------- micro -----------------
+
+def time_op(fn, items, min_time: float, rounds: int) -> dict:
+    """Ulangi `items` sampai minimal `min_time` detik per putaran; us_per_op = putaran tercepat."""
+    for item in items:
+        fn(item)  # pemanasan (impor lazy, cache regex, ...)
+    per_round = []
+    ops = 0
+    for _ in range(rounds):
+        ops = 0
+        start = time.perf_counter()
+        while True:
+            for item in items:
+                fn(item)
+            ops += len(items)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        per_round.append(elapsed / ops * 1e6)
+    return {
+        "us_per_op": round(min(per_round), 3),
+        "median_us": round(statistics.median(per_round), 3),
+        "ops_per_round": ops,
+    }
+
+
+def micro_preprocess():
+    from app.services.ml_model import preprocess_text_for_ml
+    return preprocess_text_for_ml, TEXTS
+
+
+def micro_fix_slangwords():
+    from app.services.ml_model import fix_slangwords
+    return fix_slangwords, [text.lower() for text in TEXTS]
+
+
+def micro_classify_url():
+    from app.utils.helpers import classify_url
+    return classify_url, URLS
+
+
+def micro_extract_text_from_html():
+    from bs4 import BeautifulSoup  # noqa: F401  (lewati jika bs4 tidak terpasang)
+    from app.services.content_analyzer import extract_text_from_html
+    return extract_text_from_html, [article_html(n) for n in range(4)]
+
+
+def _tflite_invoke(batch_size: int):
+    import tensorflow  # noqa: F401
+    import transformers  # noqa: F401
+    from app.services import ml_model
+    ml_model.load_tokenizer()
+    ml_model.load_interpreter()
+    if not ml_model.is_model_ready():
+        raise RuntimeError("model atau tokenizer gagal dimuat")
+    texts = [ml_model.preprocess_text_for_ml(TEXTS[i % len(TEXTS)]) for i in range(batch_size)]
+    encoded = ml_model.global_tokenizer(
+        texts, truncation=True, padding="max_length",
+        max_length=ml_model.MAX_SEQUENCE_LENGTH, return_tensors="np",
+    )
+    return (ml_model._invoke if batch_size == 1 else ml_model._invoke_batch), [encoded]
+
+
+def micro_tflite_invoke_batch1():
+    return _tflite_invoke(1)
+
+
+def micro_tflite_invoke_batch():
+    from app.core.config import settings
+    return _tflite_invoke(settings.BATCH_TEXT_SIZE)
+
+
+MICRO_BENCHMARKS = {
+    "preprocess_text_for_ml": micro_preprocess,
+    "fix_slangwords": micro_fix_slangwords,
+    "classify_url": micro_classify_url,
+    "extract_text_from_html": micro_extract_text_from_html,
+    "tflite_invoke_batch1": micro_tflite_invoke_batch1,
+    "tflite_invoke_batch": micro_tflite_invoke_batch,
+}
+
+
+def run_micro(args) -> dict:
+    sys.path.insert(0, PROJECT_DIR)
+    # Settings wajib ada walau micro-benchmark tidak menghubungi Supabase
+    os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+    os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+    import logging
+    logging.disable(logging.WARNING)  # log per pemanggilan ikut terukur jika tidak dimatikan
+
+    results = {}
+    for name, setup in MICRO_BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        try:
+            fn, items = setup()
+            results[name] = time_op(fn, items, args.min_time, args.rounds)
+        except ImportError as e:
+            # Dependensi opsional (nltk, bs4, tensorflow, transformers) tidak terpasang
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+        print(json.dumps({"benchmark": name, **results[name]}), file=sys.stderr, flush=True)
+    return results
+
+
+# ----------------- macro -----------------
+
+class ArticleHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        n = int("".join(ch for ch in self.path if ch.isdigit()) or 0)
+        payload = article_html(n).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+async def load_test(client, request_fn, duration: float, concurrency: int) -> dict:
+    """`concurrency` worker memanggil request_fn(i) berulang selama `duration` detik."""
+    latencies = []
+    statuses = Counter()
+    deadline = time.monotonic() + duration
+    counter = iter(range(10**9))
+
+    async def worker():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await request_fn(client, next(counter))
+                statuses[response.status_code] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    errors = sum(count for status, count in statuses.items() if not (isinstance(status, int) and status < 400))
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "error_rate": round(errors / len(latencies), 4) if latencies else None,
+        "status_counts": {str(status): count for status, count in statuses.items()},
+    }
+
+
+async def ensure_token(client, auth_url: str, email: str, password: str) -> str:
+    # 400 = email sudah terdaftar dari run sebelumnya
+    response = await client.post(f"{auth_url}/signup", json={"name": "Bench", "email": email, "password": password})
+    if response.status_code not in (200, 400):
+        response.raise_for_status()
+    response = await client.post(f"{auth_url}/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_macro(args) -> dict:
+    import httpx
+
+    server = ThreadingHTTPServer(("0.0.0.0", args.article_port), ArticleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    article_base = f"http://{args.article_host}:{args.article_port}"
+
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    try:
+        async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+            token = None
+            if args.auth_url:
+                token = await ensure_token(client, args.auth_url, args.email, args.password)
+            headers = {"Authorization": f"Bearer {token}"} if token else {}
+            login_body = {"email": args.email, "password": args.password}
+
+            def verify_body(i):
+                # ~20% artikel web dari server lokal, sisanya teks langsung
+                if i % 5 == 0:
+                    return {"content": f"{article_base}/artikel/{i}"}
+                return {"content": TEXTS[i % len(TEXTS)] + f" ({i})"}
+
+            scenarios = {
+                "login": (args.auth_url, lambda c, i: c.post(f"{args.auth_url}/login", json=login_body)),
+                "verify": (args.main_url, lambda c, i: c.post(f"{args.main_url}/verify", json=verify_body(i), headers=headers)),
+                "history_me": (args.history_url and token, lambda c, i: c.get(f"{args.history_url}/history/me?limit=10", headers=headers)),
+                "inference_rag": (args.content_url and token, lambda c, i: c.post(f"{args.content_url}/inference/rag", headers=headers, json={
+                    "processed_text": TEXTS[i % len(TEXTS)].lower(),
+                    "final_label_threshold": "HOAKS" if i % 2 else "FAKTA",
+                })),
+            }
+            # verify lebih dulu agar /history/me membaca riwayat yang baru ditulis
+            for name, (enabled, request_fn) in scenarios.items():
+                if args.only and name not in args.only:
+                    continue
+                if not enabled:
+                    results[name] = {"skipped": "URL layanan (atau --auth-url untuk token) tidak diberikan"}
+                else:
+                    results[name] = await load_test(client, request_fn, args.duration, args.concurrency)
+                print(json.dumps({"benchmark": name, **results[name]}), file=sys.stderr, flush=True)
+    finally:
+        server.shutdown()
+    return results
+
+
+# ----------------- baseline -----------------
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[dict]:
+    rows = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or "skipped" in previous or "error" in previous or "skipped" in current:
+            continue
+        if "error" in current:
+            # Pernah jalan di baseline, sekarang gagal
+            rows.append({"benchmark": name, "metric": "error", "current": current["error"], "regression": True})
+            continue
+        for metric, direction in METRICS.items():
+            if current.get(metric) is None or not previous.get(metric):
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric]
+            worse = change > tolerance if direction == "lower" else change < -tolerance
+            rows.append({
+                "benchmark": name, "metric": metric, "baseline": previous[metric], "current": current[metric],
+                "change_pct": round(change * 100, 1), "regression": worse,
+            })
+        if current.get("error_rate") is not None and previous.get("error_rate") is not None:
+            rows.append({
+                "benchmark": name, "metric": "error_rate", "baseline": previous["error_rate"],
+                "current": current["error_rate"],
+                "regression": current["error_rate"] > previous["error_rate"] + ERROR_RATE_TOLERANCE,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("suite", choices=["micro", "macro"])
+    parser.add_argument("--only", nargs="*", help="nama benchmark/skenario yang dijalankan (default semua)")
+    parser.add_argument("--output", help="tulis hasil ke file JSON (default stdout)")
+    parser.add_argument("--baseline", help="bandingkan dengan file baseline; exit 1 jika ada regresi")
+    parser.add_argument("--save-baseline", help="gabungkan hasil ke file baseline ini")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="perubahan relatif yang masih diterima")
+
+    micro = parser.add_argument_group("micro")
+    micro.add_argument("--rounds", type=int, default=5)
+    micro.add_argument("--min-time", type=float, default=0.5, help="detik minimum per putaran")
+
+    macro = parser.add_argument_group("macro")
+    macro.add_argument("--main-url")
+    macro.add_argument("--auth-url")
+    macro.add_argument("--history-url")
+    macro.add_argument("--content-url")
+    macro.add_argument("--duration", type=float, default=20.0, help="detik per skenario")
+    macro.add_argument("--concurrency", type=int, default=16)
+    macro.add_argument("--email", default="bench@example.com")
+    macro.add_argument("--password", default="rahasia-bench-123")
+    macro.add_argument("--article-port", type=int, default=8799)
+    macro.add_argument("--article-host", default="127.0.0.1", help="host artikel seperti terlihat dari layanan utama")
+    args = parser.parse_args()
+
+    meta = run_meta()
+    results = run_micro(args) if args.suite == "micro" else asyncio.run(run_macro(args))
+    report = {"suite": args.suite, "meta": meta, "results": results}
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get(args.suite, {})
+        report["comparison"] = compare(results, baseline.get("results", {}), args.tolerance)
+        report["baseline_meta"] = baseline.get("meta")
+        regressions = [row for row in report["comparison"] if row["regression"]]
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.save_baseline:
+        stored = {}
+        if os.path.exists(args.save_baseline):
+            with open(args.save_baseline, encoding="utf-8") as f:
+                stored = json.load(f)
+        stored[args.suite] = {"meta": meta, "results": results}
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2)
+            f.write("\n")
+
+    for row in regressions:
+        print(f"REGRESI {row['benchmark']}.{row['metric']}: {row['baseline']} -> {row['current']}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
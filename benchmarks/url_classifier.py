@@ -0,0 +1,142 @@
+"""
+Classifications per second of the host-indexed URL classifier in
+app/utils/helpers.py against the previous sequential regex scan, with a
+parity check on a corpus that covers every category.
+
+    python benchmarks/url_classifier.py --rounds 2000
+
+Fails if the new classifier disagrees with the old one, or with the
+expected category or video ID of any corpus URL. Prints one JSON line per
+implementation.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import logging
+from urllib.parse import urlparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "cekviral_project"))
+
+from app.utils.helpers import classify_url, classify_url_detailed
+
+# (url, kategori, id video yang diharapkan)
+CORPUS = [
+    ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "direct_video", "dQw4w9WgXcQ"),
+    ("https://m.youtube.com/shorts/abcDEF12345", "direct_video", "abcDEF12345"),
+    ("https://youtube.com/live/XYZ_live-1", "direct_video", "XYZ_live-1"),
+    ("https://youtu.be/dQw4w9WgXcQ?t=42", "direct_video", "dQw4w9WgXcQ"),
+    ("https://www.tiktok.com/@akun.berita/video/7234567890123456789", "direct_video", "7234567890123456789"),
+    ("https://www.instagram.com/reel/Cabc123XYZ/", "direct_video", "Cabc123XYZ"),
+    ("https://instagram.com/tv/B1a2b3c4/", "direct_video", "B1a2b3c4"),
+    ("https://x.com/kominfo/status/1790000000000000000", "direct_video", "1790000000000000000"),
+    ("https://twitter.com/kominfo/status/1234567", "direct_video", "1234567"),
+    ("https://www.dailymotion.com/video/x8abcd1", "direct_video", "x8abcd1"),
+    ("https://vimeo.com/76979871", "direct_video", "76979871"),
+    ("https://www.facebook.com/kompascom/videos/1234567890/", "direct_video", "1234567890"),
+    ("https://m.facebook.com/watch/?v=987654321", "direct_video", "987654321"),
+    ("https://www.facebook.com/video.php?v=555", "direct_video", "555"),
+    ("https://fb.watch/abCD12/", "direct_video", "abCD12"),
+    ("https://www.instagram.com/p/Cxyz987/", "unsupported_social", None),
+    ("https://www.youtube.com/post/UgkxABC", "unsupported_social", None),
+    ("https://www.facebook.com/story.php?story_fbid=1&id=2", "unsupported_social", None),
+    ("https://m.facebook.com/photo/?fbid=123", "unsupported_social", None),
+    ("https://doi.org/10.1000/182", "academic", None),
+    ("https://arxiv.org/abs/2101.00001", "academic", None),
+    ("https://ejournal.undip.ac.id/index.php/x", "academic", None),
+    ("https://example.ac.id/jurnal/artikel-1", "academic", None),
+    ("https://www.kompas.com/tren/read/2024/01/01/hoaks-vaksin", "web_article", None),
+    ("https://turnbackhoax.id/2024/05/01/salah-foto-banjir/", "web_article", None),
+    ("http://www.youtube.com/watch?v=dQw4w9WgXcQ", "web_article", None),
+    ("https://www.youtube.com:443/watch?v=dQw4w9WgXcQ", "web_article", None),
+    ("https://www.youtube.com/channel/UC123", "web_article", None),
+    ("https://[::1", "unknown", None),
+    ("", "unknown", None),
+]
+
+LEGACY_VIDEO = [
+    re.compile(r"https://(www\.|m\.)?youtube\.com/(watch\?v=|embed/|shorts/|live/)"),
+    re.compile(r"https://youtu\.be/"),
+    re.compile(r"https://(www\.|m\.)?tiktok\.com/(@[^/]+)?/video/"),
+    re.compile(r"https://(www\.)?instagram\.com/(reel|reels|tv)/[^/]+/?"),
+    re.compile(r"https://(www\.)?(twitter|x)\.com/[^/]+/status/\d+"),
+    re.compile(r"https://(www\.)?dailymotion\.com/video/"),
+    re.compile(r"https://(www\.)?vimeo\.com/\d+"),
+    re.compile(r"https://(www\.|m\.)?facebook\.com/([^/]+/videos/|watch/?\?v=|video\.php\?v=)"),
+    re.compile(r"https://fb\.watch/"),
+]
+LEGACY_SOCIAL = [
+    re.compile(r"https://(www\.|m\.)?instagram\.com/p/"),
+    re.compile(r"https://(www\.|m\.)?youtube\.com/post/"),
+    re.compile(r"https://(www\.|m\.)?facebook\.com/(story\.php|photo)"),
+]
+LEGACY_ACADEMIC = [
+    'journal', 'jurnal', 'doi.org', 'arxiv.org', 'researchgate.net',
+    'academia.edu', 'ieee.org', 'acm.org', 'springer.com', 'sciencedirect.com'
+]
+
+
+def legacy_classify_url(url: str) -> str:
+    """classify_url sebelum mesin berbasis host (tanpa logging)."""
+    if not url or not isinstance(url, str):
+        return "unknown"
+    try:
+        for pattern in LEGACY_VIDEO:
+            if pattern.match(url):
+                return "direct_video"
+        for pattern in LEGACY_SOCIAL:
+            if pattern.match(url):
+                return "unsupported_social"
+        parsed_url = urlparse(url)
+        hostname = parsed_url.hostname or ""
+        path = parsed_url.path or ""
+        for keyword in LEGACY_ACADEMIC:
+            if keyword in hostname or keyword in path:
+                return "academic"
+        return "web_article"
+    except Exception:
+        return "unknown"
+
+
+def check_parity():
+    errors = []
+    for url, category, video_id in CORPUS:
+        result = classify_url_detailed(url)
+        legacy = legacy_classify_url(url)
+        if result.category != category or legacy != category or result.video_id != video_id:
+            errors.append({"url": url, "expected": [category, video_id], "new": list(result), "legacy": legacy})
+    if errors:
+        for error in errors:
+            print(json.dumps(error))
+        raise SystemExit(f"Parity gagal untuk {len(errors)} URL")
+
+
+def measure(name, fn, rounds):
+    urls = [url for url, _, _ in CORPUS]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for url in urls:
+            fn(url)
+    elapsed = time.perf_counter() - start
+    total = rounds * len(urls)
+    print(json.dumps({
+        "implementation": name,
+        "classifications": total,
+        "per_s": round(total / elapsed),
+        "us_per_url": round(elapsed / total * 1e6, 2),
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    # URL rusak di korpus sengaja memicu log error; jangan ikut diukur
+    logging.getLogger("app.utils.helpers").setLevel(logging.CRITICAL)
+    check_parity()
+    measure("legacy", legacy_classify_url, args.rounds)
+    measure("host_index", classify_url, args.rounds)
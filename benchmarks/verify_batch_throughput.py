@@ -0,0 +1,144 @@
+"""
+Throughput of POST /verify/batch on a running main service for a mixed set
+of items, compared with sending the same items to POST /verify one by one
+(with --concurrency parallel requests).
+
+    python benchmarks/verify_batch_throughput.py --url http://localhost:8080 --items 1000
+
+The mix is ~70% plain text, ~20% web articles, ~5% videos and ~5%
+unsupported social links. Articles are served by a small HTTP server started
+by this script (on 127.0.0.1 and localhost, so the per-host limit applies to
+two hosts); the service must be able to reach it. Video items only measure
+the time to hand them to a background job: /verify/batch does not wait for
+transcriptions, so they are excluded from the /verify baseline. Pass
+--token to measure with history saving (bulk inserts) enabled. Prints one
+JSON line per mode.
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import httpx
+
+WORDS = ("pemerintah bantuan sosial vaksin banjir harga beras pemilu hoaks viral warga desa "
+         "presiden menteri polisi jalan tol listrik gratis subsidi bbm kenaikan gaji").split()
+
+ARTICLE_HTML = (
+    "<html><head><title>Berita {n}</title></head><body><nav>menu</nav>"
+    "<article><p>{body}</p></article><footer>hak cipta</footer></body></html>"
+)
+
+
+class ArticleHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        n = self.path.rsplit("/", 1)[-1]
+        rng = random.Random(n)
+        body = " ".join(rng.choice(WORDS) for _ in range(300))
+        payload = ARTICLE_HTML.format(n=n, body=body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def build_items(count: int, article_port: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.70:
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 60)))
+        elif roll < 0.90:
+            host = "127.0.0.1" if i % 2 else "localhost"
+            text = f"http://{host}:{article_port}/artikel/{i}"
+        elif roll < 0.95:
+            text = f"https://www.youtube.com/watch?v=bench{i:06d}"
+        else:
+            text = f"https://www.instagram.com/p/bench{i}/"
+        items.append({"content": text})
+    return items
+
+
+async def run_batch(client, items, headers) -> dict:
+    parts = Counter()
+    first_line_ms = None
+    start = time.perf_counter()
+    async with client.stream("POST", "/verify/batch", json=items, headers=headers) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            if first_line_ms is None:
+                first_line_ms = (time.perf_counter() - start) * 1000
+            parts[json.loads(line)["part"]] += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "batch",
+        "items": len(items),
+        "elapsed_s": round(elapsed, 2),
+        "items_per_s": round(len(items) / elapsed, 1),
+        "first_line_ms": round(first_line_ms, 1),
+        "parts": dict(parts),
+    }
+
+
+async def run_single(client, items, headers, concurrency) -> dict:
+    # Video dikecualikan: /verify menunggu transkripsi selesai
+    items = [item for item in items if "youtube.com" not in item["content"]]
+    queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+    statuses = Counter()
+
+    async def worker():
+        while not queue.empty():
+            item = queue.get_nowait()
+            response = await client.post("/verify", json=item, headers=headers)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "single",
+        "concurrency": concurrency,
+        "items": len(items),
+        "elapsed_s": round(elapsed, 2),
+        "items_per_s": round(len(items) / elapsed, 1),
+        "status_counts": dict(statuses),
+    }
+
+
+async def main(args):
+    server = ThreadingHTTPServer(("0.0.0.0", args.article_port), ArticleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    items = build_items(args.items, args.article_port)
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=args.url, timeout=600, limits=limits) as client:
+            print(json.dumps(await run_batch(client, items, headers)), flush=True)
+            if not args.skip_single:
+                print(json.dumps(await run_single(client, items, headers, args.concurrency)), flush=True)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--article-port", type=int, default=8799)
+    parser.add_argument("--token", default=None, help="access token; tanpa token hasil tidak disimpan")
+    parser.add_argument("--skip-single", action="store_true")
+    asyncio.run(main(parser.parse_args()))
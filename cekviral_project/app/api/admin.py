@@ -0,0 +1,50 @@
+# cekviral_project/app/api/admin.py
+import hmac
+import asyncio
+import logging
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiling import profile_for
+
+router = APIRouter(prefix="/admin", include_in_schema=False)
+logger = logging.getLogger(__name__)
+
+
+def _require_admin(token: Optional[str]):
+    # Tanpa ADMIN_TOKEN endpoint admin dianggap tidak ada
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Token admin tidak valid.")
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def run_profile(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: Optional[float] = Query(None, ge=1),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    Profil statistik worker yang melayani request ini selama `seconds` detik.
+    Respons berisi stack dalam format folded (untuk flamegraph.pl/speedscope) dan
+    salinannya disimpan di PROFILE_DIR. Dengan beberapa worker gunicorn, ulangi
+    beberapa kali atau pakai PROFILE_ON_START_S untuk mencakup worker lain.
+    """
+    _require_admin(x_admin_token)
+    if seconds > settings.PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=422, detail=f"Maksimal {settings.PROFILE_MAX_SECONDS:g} detik.")
+
+    try:
+        profiler = await profile_for(seconds, interval_ms or settings.PROFILE_INTERVAL_MS)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    headers = {"X-Profile-Samples": str(profiler.samples)}
+    try:
+        headers["X-Profile-Path"] = await asyncio.to_thread(profiler.write, settings.PROFILE_DIR)
+    except OSError as e:
+        logger.warning("Profil tidak dapat disimpan ke %s: %s", settings.PROFILE_DIR, e)
+    return PlainTextResponse(profiler.folded(), headers=headers)
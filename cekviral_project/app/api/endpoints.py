@@ -1,32 +1,47 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 import logging
 import asyncio
+import json
+import time
+import httpx
 import requests
 
 from app.schemas import ContentInput, MLPredictionOutput, VerificationResult
-from app.utils.helpers import is_url, classify_url
+from app.utils.helpers import is_url, classify_url, classify_url_detailed
 from app.services.content_analyzer import extract_text_from_html, convert_video_to_text
 from app.services.ml_model import predict_content_hoax_status
-from app.services.database import save_verification_result
+from app.services.database import save_verification_result, save_verification_results
+from app.services.batching import TextBatcher, HostLimiter
+from app.services.jobs import Job, video_jobs
+from app.services.admission import Overloaded, admit, lane_for, run_blocking
 from app.utils.auth import get_current_user
+from app.core.config import settings
+from app.core.metrics import observe_external
+from app.core.profiling import span
+from app.core.logging_setup import SAMPLED
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-@router.post("/verify", response_model=VerificationResult)
-async def verify_content(
-    input_data: ContentInput,
-    request: Request,
-    user_id: Optional[str] = Depends(get_current_user)
-):
-    user_input = input_data.content.strip()
-    processed_text: Optional[str] = None
-    input_type = "text"
-    processing_message = "Konten sedang diproses..."
+# Pesan untuk URL yang tidak diproses (dipakai /verify dan /verify/batch)
+SKIPPED_URL_MESSAGES = {
+    "unsupported_social": "Maaf, platform sosial ini belum didukung.",
+    "academic": "Konten ilmiah tidak diproses demi etika.",
+}
+UNKNOWN_URL_MESSAGE = "Jenis URL tidak dikenali atau belum didukung."
 
-    default_ml_output = MLPredictionOutput(
+def _finalize_result(
+    user_input: str,
+    input_type: str,
+    processed_text: Optional[str],
+    processing_message: str,
+    ml_output: Optional[dict],
+) -> VerificationResult:
+    """Susun VerificationResult dari teks terproses dan keluaran model (None jika tidak ada teks)."""
+    prediction_details = MLPredictionOutput(
         status="error",
         message="Tidak ada teks yang dapat diproses atau diverifikasi oleh model ML.",
         probabilities={"HOAKS": 0.0, "FAKTA": 0.0},
@@ -35,16 +50,71 @@ async def verify_content(
         final_label_thresholded="BELUM DIVERIFIKASI",
         inference_time_ms=0.0
     )
-    prediction_details = default_ml_output
 
+    if ml_output is not None:
+        if ml_output.get("status") == "success":
+            prediction_details = MLPredictionOutput(**ml_output)
+            processing_message += " Verifikasi selesai."
+        else:
+            processing_message = f"Verifikasi gagal: {ml_output.get('message', 'Terjadi kesalahan.')}"
+
+    elif processing_message.startswith("Konten sedang diproses"):
+        processing_message = "Tidak ada teks yang dapat diproses."
+
+    return VerificationResult(
+        original_input=user_input,
+        input_type=input_type,
+        processed_text=processed_text or "",
+        prediction=prediction_details,
+        processing_message=processing_message,
+        history_id="unsaved"
+    )
+
+
+async def run_verification(user_input: str, user_id: Optional[str], background: bool = False) -> VerificationResult:
+    """
+    Klasifikasi input (teks/URL), ekstraksi teks, prediksi ML, lalu simpan ke
+    history jika user login. Dipakai bersama oleh /verify dan /verify/explain.
+    Ekstraksi dan prediksi berjalan di jalur admission sesuai jenis input; jika
+    jalurnya penuh, Overloaded dilempar sebelum pekerjaan apa pun dimulai.
+    `background=True` (job video) menunggu slot tanpa batas antrean.
+    """
+    input_type = "text"
+    url_type = None
     if is_url(user_input):
         input_type = "url"
-        url_type = classify_url(user_input)
+        with span("verify.classify_url"):
+            url_type = classify_url(user_input)
+
+    # Input kosong tidak mengerjakan apa pun, jadi tidak perlu slot
+    async with admit(lane_for(url_type) if user_input else None, background):
+        processed_text, processing_message, ml_output = await _extract_and_predict(user_input, url_type)
+
+    final_result = _finalize_result(user_input, input_type, processed_text, processing_message, ml_output)
+
+    # Simpan ke Supabase hanya jika user login
+    if user_id:
+        logger.info("Penyimpanan ke Supabase untuk user_id: %s", user_id, extra=SAMPLED)
+        with span("verify.save"):
+            history_id = await save_verification_result(result=final_result, user_id=user_id)
+        final_result.history_id = history_id or "unsaved"
+    else:
+        logger.info("User belum login. Hasil tidak disimpan.", extra=SAMPLED)
+
+    return final_result
 
+
+async def _extract_and_predict(user_input: str, url_type: Optional[str]) -> tuple[Optional[str], str, Optional[dict]]:
+    """Ambil teks dari input (url_type None = teks biasa) lalu prediksi ML."""
+    processed_text: Optional[str] = None
+    processing_message = "Konten sedang diproses..."
+
+    if url_type is not None:
         match url_type:
             case "direct_video":
-                logger.info("Transkripsi video dimulai.")
-                processed_text = await convert_video_to_text(user_input)
+                logger.info("Transkripsi video dimulai.", extra=SAMPLED)
+                with span("verify.transcribe"):
+                    processed_text = await convert_video_to_text(user_input)
                 if processed_text and not processed_text.lower().startswith("maaf,"):
                     processing_message = "Transkripsi video berhasil."
                 else:
@@ -52,30 +122,30 @@ async def verify_content(
                     processed_text = None
 
             case "web_article":
-                logger.info("Ekstraksi artikel dimulai.")
+                logger.info("Ekstraksi artikel dimulai.", extra=SAMPLED)
                 try:
                     headers = {
                         "User-Agent": "Mozilla/5.0"
                     }
-                    response = await asyncio.to_thread(requests.get, user_input, headers=headers, timeout=20)
-                    response.raise_for_status()
+                    with span("verify.fetch"), observe_external("fetch"):
+                        response = await run_blocking("article", requests.get, user_input, headers=headers, timeout=20)
+                        response.raise_for_status()
                     html_content = response.text
-                    processed_text = await asyncio.to_thread(extract_text_from_html, html_content)
+                    with span("verify.extract_html"):
+                        processed_text = await run_blocking("article", extract_text_from_html, html_content)
                     processing_message = (
                         "Teks dari halaman web berhasil diekstrak."
                         if processed_text else
                         "Gagal mengekstrak teks dari artikel."
                     )
                 except Exception as e:
-                    logger.error(f"Error: {e}", exc_info=True)
+                    logger.error("Error: %s", e, exc_info=True)
                     processing_message = "Gagal memproses URL."
 
-            case "unsupported_social":
-                processing_message = "Maaf, platform sosial ini belum didukung."
-            case "academic":
-                processing_message = "Konten ilmiah tidak diproses demi etika."
+            case "unsupported_social" | "academic":
+                processing_message = SKIPPED_URL_MESSAGES[url_type]
             case _:
-                processing_message = "Jenis URL tidak dikenali atau belum didukung."
+                processing_message = UNKNOWN_URL_MESSAGE
 
     elif user_input:
         processed_text = user_input
@@ -83,33 +153,253 @@ async def verify_content(
     else:
         processing_message = "Input kosong, tidak dapat diverifikasi."
 
+    ml_output = None
     if processed_text:
-        logger.info(f"Verifikasi ML untuk teks: {processed_text[:100]}...")
-        ml_output = await asyncio.to_thread(predict_content_hoax_status, processed_text)
-        if ml_output.get("status") == "success":
-            prediction_details = MLPredictionOutput(**ml_output)
-            processing_message += " Verifikasi selesai."
-        else:
-            processing_message = f"Verifikasi gagal: {ml_output.get('message', 'Terjadi kesalahan.')}"
+        logger.debug("Verifikasi ML untuk teks: %.100s...", processed_text)
+        with span("verify.predict"):
+            ml_output = await asyncio.to_thread(predict_content_hoax_status, processed_text)
 
-    elif processing_message.startswith("Konten sedang diproses"):
-        processing_message = "Tidak ada teks yang dapat diproses."
+    return processed_text, processing_message, ml_output
 
-    final_result = VerificationResult(
-        original_input=user_input,
-        input_type=input_type,
-        processed_text=processed_text or "",
-        prediction=prediction_details,
-        processing_message=processing_message,
-        history_id="unsaved"
-    )
 
-    # Simpan ke Supabase hanya jika user login
-    if user_id:
-        logger.info(f"Penyimpanan ke Supabase untuk user_id: {user_id}")
-        history_id = await save_verification_result(result=final_result, user_id=user_id)
-        final_result.history_id = history_id or "unsaved"
-    else:
-        logger.info("User belum login. Hasil tidak disimpan.")
+def _video_job_key(user_input: str, user_id: Optional[str]) -> str:
+    # Video yang sama (walau beda bentuk URL) dari user yang sama cukup ditranskripsi sekali
+    return f"{user_id or '-'}:{classify_url_detailed(user_input).canonical_id or user_input}"
+
+
+def _submit_video_job(user_input: str, user_id: Optional[str]) -> Job:
+    async def work():
+        return (await run_verification(user_input, user_id, background=True)).model_dump()
+
+    return video_jobs.submit(_video_job_key(user_input, user_id), user_id, work)
+
+
+def _overloaded_error(e: Overloaded) -> HTTPException:
+    return HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+@router.post("/verify", response_model=VerificationResult)
+async def verify_content(
+    input_data: ContentInput,
+    request: Request,
+    user_id: Optional[str] = Depends(get_current_user)
+):
+    """
+    Verifikasi satu konten. Jika jalur jenis input ini penuh, dibalas 429 (antrean
+    penuh) atau 503 (terlalu lama antre) dengan Retry-After; video bisa dialihkan
+    ke job background (ADMISSION_VIDEO_OVERFLOW="job", dibalas 202 dengan status_url).
+    """
+    user_input = input_data.content.strip()
+    try:
+        return await run_verification(user_input, user_id)
+    except Overloaded as e:
+        if e.lane == "video" and settings.ADMISSION_VIDEO_OVERFLOW == "job":
+            job = _submit_video_job(user_input, user_id)
+            return JSONResponse(status_code=202, content={
+                "job_id": job.job_id, "status": job.status, "status_url": f"/verify/jobs/{job.job_id}",
+            })
+        raise _overloaded_error(e)
+
+
+async def _relay_explanation(history_id: str, authorization: str):
+    """Teruskan part NDJSON dari endpoint fused di layanan content."""
+    url = f"{settings.CONTENT_SERVICE_URL.rstrip('/')}/inference/{history_id}/explain"
+    try:
+        # Diukur sampai stream dari layanan content selesai
+        with observe_external("content_service"):
+            async with httpx.AsyncClient(timeout=settings.CONTENT_SERVICE_TIMEOUT) as client:
+                async with client.stream("POST", url, headers={"Authorization": authorization}) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        yield json.dumps({"part": "error", "detail": f"Layanan content mengembalikan {response.status_code}."}) + "\n"
+                        return
+                    async for line in response.aiter_lines():
+                        if line:
+                            yield line + "\n"
+    except httpx.HTTPError as e:
+        logger.error("Gagal menghubungi layanan content: %s", e, exc_info=True)
+        yield json.dumps({"part": "error", "detail": "Gagal menghubungi layanan content."}) + "\n"
+
+
+@router.post("/verify/explain")
+async def verify_and_explain(
+    input_data: ContentInput,
+    request: Request,
+    user_id: Optional[str] = Depends(get_current_user)
+):
+    """
+    Satu panggilan untuk verifikasi, penjelasan RAG, dan rekomendasi. Hasil
+    dikirim bertahap sebagai NDJSON: `verification` lebih dulu, lalu
+    `recommendations` dan `explanation` dari layanan content sesuai urutan
+    selesainya. Penjelasan hanya tersedia untuk user login (butuh history_id).
+    """
+    authorization = request.headers.get("Authorization")
+    # Verifikasi dijalankan sebelum stream dimulai agar Overloaded masih bisa jadi 429/503
+    try:
+        result = await run_verification(input_data.content.strip(), user_id)
+    except Overloaded as e:
+        raise _overloaded_error(e)
+
+    async def parts():
+        yield json.dumps({"part": "verification", **result.model_dump()}) + "\n"
+
+        if result.history_id == "unsaved" or result.prediction.status != "success":
+            return
+        if not settings.CONTENT_SERVICE_URL:
+            logger.warning("CONTENT_SERVICE_URL tidak diatur, penjelasan RAG dilewati.")
+            return
+        async for line in _relay_explanation(result.history_id, authorization):
+            yield line
+
+    return StreamingResponse(parts(), media_type="application/x-ndjson")
+
+
+# ----------------- /verify/batch -----------------
+
+async def _fetch_article_text(client: httpx.AsyncClient, url: str) -> tuple[Optional[str], str]:
+    try:
+        with span("verify.fetch"), observe_external("fetch"):
+            response = await client.get(url)
+            response.raise_for_status()
+        with span("verify.extract_html"):
+            processed_text = await asyncio.to_thread(extract_text_from_html, response.text)
+    except Exception as e:
+        logger.error("Gagal mengambil artikel %s: %s", url, e)
+        return None, "Gagal memproses URL."
+    if processed_text:
+        return processed_text, "Teks dari halaman web berhasil diekstrak."
+    return None, "Gagal mengekstrak teks dari artikel."
+
+
+async def _batch_item(
+    index: int,
+    user_input: str,
+    user_id: Optional[str],
+    batcher: TextBatcher,
+    limiter: HostLimiter,
+    client: httpx.AsyncClient,
+) -> tuple[int, VerificationResult | Job]:
+    """
+    Satu item /verify/batch. Teks langsung masuk batcher, artikel diambil dengan batas
+    per host lalu masuk batcher, video diserahkan ke job registry. Hasil belum disimpan.
+    """
+    try:
+        if not user_input:
+            return index, _finalize_result(user_input, "text", None, "Input kosong, tidak dapat diverifikasi.", None)
+        if not is_url(user_input):
+            ml_output = await batcher.predict(user_input)
+            return index, _finalize_result(user_input, "text", user_input, "Teks langsung diterima untuk verifikasi.", ml_output)
+
+        classification = classify_url_detailed(user_input)
+        match classification.category:
+            case "direct_video":
+                return index, _submit_video_job(user_input, user_id)
+
+            case "web_article":
+                processed_text, message = await limiter.run(user_input, lambda: _fetch_article_text(client, user_input))
+                ml_output = await batcher.predict(processed_text) if processed_text else None
+                return index, _finalize_result(user_input, "url", processed_text, message, ml_output)
+
+            case "unsupported_social" | "academic":
+                return index, _finalize_result(user_input, "url", None, SKIPPED_URL_MESSAGES[classification.category], None)
+            case _:
+                return index, _finalize_result(user_input, "url", None, UNKNOWN_URL_MESSAGE, None)
+
+    except Exception as e:
+        logger.error("Item batch %s gagal diproses: %s", index, e, exc_info=True)
+        return index, _finalize_result(user_input, "text", None, "Gagal memproses konten.", None)
+
+
+def _result_line(index: int, result: VerificationResult) -> str:
+    return json.dumps({"index": index, "part": "result", **result.model_dump()}) + "\n"
+
+
+def _job_line(index: int, job: Job) -> str:
+    return json.dumps({
+        "index": index, "part": "job", "job_id": job.job_id,
+        "status": job.status, "status_url": f"/verify/jobs/{job.job_id}",
+    }) + "\n"
+
+
+@router.post("/verify/batch")
+async def verify_batch(
+    items: list[ContentInput],
+    user_id: Optional[str] = Depends(get_current_user)
+):
+    """
+    Verifikasi banyak konten sekaligus. Hasil dikirim sebagai NDJSON sesuai urutan
+    selesainya, masing-masing dengan `index` item di request: `result` berisi
+    VerificationResult, `job` berarti video sedang ditranskripsi di background
+    (ambil hasilnya di `status_url`). Baris terakhir adalah `summary`. Jika user login,
+    hasil disimpan ke history per kelompok BATCH_SAVE_SIZE baris.
+    """
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Maksimal {settings.BATCH_MAX_ITEMS} item per batch.")
+
+    async def lines():
+        loop = asyncio.get_running_loop()
+        start_time = time.perf_counter()
+        save_wait = settings.BATCH_SAVE_MAX_WAIT_MS / 1000
+        counts = {"results": 0, "jobs": 0, "saved": 0}
+
+        batcher = TextBatcher(settings.BATCH_TEXT_SIZE, settings.BATCH_TEXT_MAX_WAIT_MS, settings.BATCH_INVOKE_SIZES)
+        limiter = HostLimiter(settings.BATCH_FETCH_CONCURRENCY, settings.BATCH_FETCH_PER_HOST)
+        client = httpx.AsyncClient(
+            headers={"User-Agent": "Mozilla/5.0"}, timeout=20, follow_redirects=True,
+            limits=httpx.Limits(max_connections=settings.BATCH_FETCH_CONCURRENCY),
+        )
+        tasks = {
+            asyncio.create_task(_batch_item(index, item.content.strip(), user_id, batcher, limiter, client))
+            for index, item in enumerate(items)
+        }
+        unsaved: list[tuple[int, VerificationResult]] = []
+        oldest_unsaved = 0.0
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, timeout=save_wait, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, outcome = task.result()
+                    if isinstance(outcome, Job):
+                        counts["jobs"] += 1
+                        yield _job_line(index, outcome)
+                    elif user_id:
+                        if not unsaved:
+                            oldest_unsaved = loop.time()
+                        unsaved.append((index, outcome))
+                    else:
+                        counts["results"] += 1
+                        yield _result_line(index, outcome)
+
+                # Hasil user login ditahan sebentar agar bisa disimpan dengan satu insert
+                if unsaved and (len(unsaved) >= settings.BATCH_SAVE_SIZE or not tasks
+                                or loop.time() - oldest_unsaved >= save_wait):
+                    for offset in range(0, len(unsaved), settings.BATCH_SAVE_SIZE):
+                        chunk = unsaved[offset:offset + settings.BATCH_SAVE_SIZE]
+                        history_ids = await save_verification_results([result for _, result in chunk], user_id)
+                        for (index, result), history_id in zip(chunk, history_ids):
+                            result.history_id = history_id or "unsaved"
+                            counts["saved"] += history_id is not None
+                            counts["results"] += 1
+                            yield _result_line(index, result)
+                    unsaved = []
+
+            yield json.dumps({
+                "part": "summary", "items": len(items), **counts,
+                "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 1),
+            }) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+            await batcher.close()
+            await client.aclose()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 
-    return final_result
\ No newline at end of file
+@router.get("/verify/jobs/{job_id}")
+async def get_verify_job(job_id: str, user_id: Optional[str] = Depends(get_current_user)):
+    """Status dan hasil transkripsi video dari /verify/batch."""
+    job = video_jobs.get(job_id)
+    if job is None or (job.user_id is not None and job.user_id != user_id):
+        raise HTTPException(status_code=404, detail="Job tidak ditemukan.")
+    return job.to_dict()
\ No newline at end of file
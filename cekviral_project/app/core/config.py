@@ -17,4 +17,54 @@ class Settings(BaseSettings):
     YDL_TEMP_DIR: str = "temp_downloads/"
     GCP_CREDENTIALS_PATH: str | None = None
 
+    # True: startup langsung selesai dan model dimuat di background; cek /ready
+    LAZY_STARTUP: bool = False
+    # Jumlah thread interpreter TFLite per proses; None = default TFLite. Dengan
+    # beberapa worker gunicorn, set ke (jumlah core / worker) agar tidak saling berebut CPU
+    TFLITE_NUM_THREADS: int | None = None
+
+    # /verify/batch
+    BATCH_MAX_ITEMS: int = 1000
+    BATCH_TEXT_SIZE: int = 32          # teks per pemanggilan interpreter
+    # Ukuran batch tetap interpreter batch (satu interpreter per ukuran); batch di-pad
+    # ke ukuran berikutnya agar tidak ada resize tensor di antara pemanggilan
+    BATCH_INVOKE_SIZES: list[int] = [4, 8, 16, 32]
+    BATCH_TEXT_MAX_WAIT_MS: float = 10.0
+    BATCH_FETCH_CONCURRENCY: int = 32  # total fetch artikel bersamaan per request
+    BATCH_FETCH_PER_HOST: int = 4      # fetch bersamaan ke satu host
+    BATCH_SAVE_SIZE: int = 100         # baris history per insert ke Supabase
+    BATCH_SAVE_MAX_WAIT_MS: float = 200.0
+    VIDEO_JOB_CONCURRENCY: int = 2
+    VIDEO_JOB_TTL_S: float = 3600.0
+
+    # Admission control per jenis input (app/services/admission.py). Video dan artikel
+    # dibatasi agar banjir link video tidak membuat /verify teks ikut antre
+    ADMISSION_TEXT_CONCURRENCY: int = 64
+    ADMISSION_TEXT_QUEUE: int = 1000
+    ADMISSION_ARTICLE_CONCURRENCY: int = 16
+    ADMISSION_ARTICLE_QUEUE: int = 64
+    ADMISSION_VIDEO_CONCURRENCY: int = 2
+    ADMISSION_VIDEO_QUEUE: int = 4
+    ADMISSION_MAX_QUEUE_WAIT_S: float = 10.0
+    # Video yang ditolak di /verify: "reject" (429/503 + Retry-After) atau "job" (202 + job background)
+    ADMISSION_VIDEO_OVERFLOW: str = "reject"
+
+    # Logging (app/core/logging_setup.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"           # "json" atau "text" (format lama)
+    LOG_SAMPLE_RATE: float = 0.05      # fraksi log per-request bertanda SAMPLED yang ditulis
+    LOG_QUEUE_SIZE: int = 10000        # record menunggu ditulis; jika penuh record dibuang
+
+    # Profiling (app/core/profiling.py). Tanpa ADMIN_TOKEN, POST /admin/profile nonaktif
+    ADMIN_TOKEN: str | None = None
+    PROFILE_DIR: str = "profiles/"
+    PROFILE_INTERVAL_MS: float = 10.0
+    PROFILE_MAX_SECONDS: float = 120.0
+    PROFILE_ON_START_S: float = 0.0    # > 0: profil N detik pertama setelah startup ke PROFILE_DIR
+    TRACE_SAMPLE_RATE: float = 0.0     # fraksi request yang span per tahapnya dicatat
+
+    # Layanan content (RAG + rekomendasi) untuk /verify/explain
+    CONTENT_SERVICE_URL: str | None = None
+    CONTENT_SERVICE_TIMEOUT: float = 60.0
+
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,159 @@
+# cekviral_project/app/core/logging_setup.py
+# Logging terstruktur tanpa I/O di jalur request:
+#
+# - Root logger hanya punya satu QueueHandler. Di thread pemanggil, record cukup
+#   disaring dan pesannya digabung, lalu masuk antrean. Format JSON dan penulisan
+#   ke stdout dikerjakan satu thread QueueListener.
+# - Log per-request yang sering muncul ditandai `extra=SAMPLED`, dan hanya
+#   LOG_SAMPLE_RATE di antaranya yang diteruskan. WARNING ke atas selalu lolos.
+# - Pakai gaya %-args (logger.info("... %s", x)), bukan f-string, agar pesan dari
+#   level yang nonaktif atau record yang tidak terpilih sampel tidak pernah diformat.
+import os
+import sys
+import copy
+import json
+import queue
+import atexit
+import random
+import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.metrics import register_callback
+
+# Penanda log bervolume tinggi: logger.info("...", extra=SAMPLED)
+SAMPLED = {"sampled": True}
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Logger pihak ketiga yang dialihkan ke antrean; record dari SAMPLED_LOGGERS diperlakukan
+# seperti extra=SAMPLED (satu baris log akses per request)
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+SAMPLED_LOGGERS = {"uvicorn.access"}
+
+# Atribut bawaan LogRecord; sisanya (dari extra=...) ikut ditulis sebagai field JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sampled", "taskName"}
+
+_handler: "DeferredQueueHandler | None" = None
+_listener: QueueListener | None = None
+_hooks_registered = False
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu objek JSON per baris: ts, level, logger, msg, field dari extra, dan exc bila ada."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Loloskan hanya `rate` dari record bertanda SAMPLED di bawah WARNING."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING and (getattr(record, "sampled", False) or record.name in SAMPLED_LOGGERS):
+            return self.rate >= 1 or random.random() < self.rate
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler yang hanya menggabungkan pesan di thread pemanggil. Penggabungan
+    ini tetap dilakukan di sini, karena args bisa berubah setelah logger dipanggil.
+    Format lengkapnya dikerjakan listener. Jika antrean penuh, record dibuang dan
+    dihitung, supaya request tidak pernah menunggu logging.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _restart_after_fork():
+    # Thread listener tidak ikut ter-fork (mis. gunicorn dengan preload_app); buat
+    # antrean baru karena lock antrean lama bisa saja sedang dipegang saat fork
+    if _listener is None or _handler is None:
+        return
+    log_queue = queue.Queue(_handler.queue.maxsize)
+    _handler.queue = log_queue
+    _listener.queue = log_queue
+    _listener._thread = None
+    _listener.start()
+
+
+def stop_logging():
+    """Tulis sisa antrean dan hentikan listener; log sesudahnya ditulis langsung (sinkron)."""
+    global _listener
+    if _listener is None:
+        return
+    if _listener._thread is not None:
+        _listener.stop()
+    root = logging.getLogger()
+    if _handler in root.handlers:
+        root.removeHandler(_handler)
+        for handler in _listener.handlers:
+            root.addHandler(handler)
+    _listener = None
+
+
+def setup_logging(level: str = "INFO", fmt: str = "json", sample_rate: float = 1.0, queue_size: int = 10000, stream=None):
+    """
+    Pasang QueueHandler di root logger dan mulai listener yang menulis ke `stream`
+    (default stdout), dalam format "json" atau "text" (format lama). Aman dipanggil ulang.
+    """
+    global _handler, _listener, _hooks_registered
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    _handler = DeferredQueueHandler(queue.Queue(queue_size))
+    _handler.addFilter(SamplingFilter(sample_rate))
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(level.upper())
+    # uvicorn memasang handler sinkron sendiri; alihkan lognya ke root (antrean)
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        for handler in list(uvicorn_logger.handlers):
+            uvicorn_logger.removeHandler(handler)
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+    if not _hooks_registered:
+        atexit.register(stop_logging)
+        os.register_at_fork(after_in_child=_restart_after_fork)
+        register_callback(
+            "log_records_dropped", "Log records dropped because the logging queue was full.", [],
+            lambda: {(): _handler.dropped if _handler else 0}, kind="counter",
+        )
+        _hooks_registered = True
@@ -0,0 +1,183 @@
+# cekviral_project/app/core/profiling.py
+# Profiling ringan untuk produksi, tanpa dependensi tambahan:
+#
+# - SamplingProfiler: thread yang setiap PROFILE_INTERVAL_MS mengambil stack semua
+#   thread (sys._current_frames) dan menghitungnya dalam format "folded"
+#   (frame;frame;frame jumlah), yang bisa langsung dibuka di flamegraph.pl,
+#   speedscope atau inferno. Dijalankan lewat POST /admin/profile atau
+#   PROFILE_ON_START_S saat startup; hanya mencakup worker yang menjalankannya.
+# - span(): durasi tiap tahap satu request. Hanya dicatat untuk request yang terpilih
+#   (TRACE_SAMPLE_RATE); untuk request lain span() hampir tanpa biaya.
+import os
+import sys
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Daftar (nama span, durasi ms) milik request yang sedang ditrace; None = tidak ditrace.
+# asyncio.to_thread menyalin context, jadi span di thread inferensi ikut tercatat.
+_current_trace: ContextVar[Optional[list]] = ContextVar("current_trace", default=None)
+
+_active_profiler: Optional["SamplingProfiler"] = None
+_active_lock = threading.Lock()
+
+
+@contextmanager
+def span(name: str):
+    """Catat durasi blok ini ke trace request saat ini (jika request ini ditrace)."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.append((name, (time.perf_counter() - start) * 1000))
+
+
+def _summarize(trace: list) -> dict[str, float]:
+    # Span dengan nama sama (mis. beberapa batch) dijumlahkan
+    totals: dict[str, float] = {}
+    for name, duration_ms in trace:
+        totals[name] = totals.get(name, 0.0) + duration_ms
+    return totals
+
+
+class TraceMiddleware:
+    """
+    ASGI middleware yang memilih sebagian request (sample_rate) untuk ditrace. Span
+    request terpilih ditulis ke log dan, jika handler sudah selesai sebelum respons
+    dikirim (semua endpoint non-streaming), ke header Server-Timing.
+    """
+
+    def __init__(self, app, sample_rate: float):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        trace: list = []
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and trace:
+                timing = ", ".join(f"{name};dur={duration_ms:.1f}" for name, duration_ms in _summarize(trace).items())
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            spans = "".join(f" {name}={duration_ms:.1f}ms" for name, duration_ms in _summarize(trace).items())
+            logger.info("trace %s %s total=%.1fms%s", scope["method"], scope["path"], (time.perf_counter() - start) * 1000, spans)
+
+
+class SamplingProfiler:
+    """
+    Profiler statistik: setiap `interval_ms` stack semua thread lain diambil dan
+    dihitung per stack. Biayanya sebanding dengan jumlah thread dan kedalaman stack,
+    bukan dengan jumlah pemanggilan fungsi, sehingga aman dinyalakan di produksi.
+    """
+
+    def __init__(self, interval_ms: float = 10.0):
+        self.interval = interval_ms / 1000
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration_s = 0.0
+        self._labels: dict = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _fold(self, frame, thread_name: str) -> str:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.append(thread_name)
+        # Akar di kiri; ';' adalah pemisah frame di format folded
+        return ";".join(reversed(labels)).replace("\n", " ")
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    self.stacks[self._fold(frame, names.get(ident, f"thread-{ident}"))] += 1
+            self.samples += 1
+
+    def start(self):
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration_s = time.time() - self.started_at
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, directory: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(self.started_at))
+        path = os.path.join(directory, f"profile-{stamp}-{os.getpid()}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.folded())
+        return path
+
+
+async def profile_for(seconds: float, interval_ms: float) -> SamplingProfiler:
+    """
+    Jalankan SamplingProfiler selama `seconds` detik. Hanya satu profil per proses
+    pada satu waktu; RuntimeError jika masih ada yang berjalan.
+    """
+    global _active_profiler
+    with _active_lock:
+        if _active_profiler is not None:
+            raise RuntimeError("Profiler sedang berjalan.")
+        profiler = _active_profiler = SamplingProfiler(interval_ms)
+
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+        _active_profiler = None
+    logger.info("Profil selesai: %s sampel dalam %.1f detik.", profiler.samples, profiler.duration_s)
+    return profiler
+
+
+async def profile_to_file(seconds: float, interval_ms: float, directory: str) -> Optional[str]:
+    """Dipakai PROFILE_ON_START_S: profil di background, hasilnya hanya ditulis ke file."""
+    try:
+        profiler = await profile_for(seconds, interval_ms)
+        path = await asyncio.to_thread(profiler.write, directory)
+        logger.info("Profil ditulis ke %s", path)
+        return path
+    except Exception as e:
+        logger.error("Profiling gagal: %s", e, exc_info=True)
+        return None
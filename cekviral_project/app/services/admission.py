@@ -0,0 +1,146 @@
+# cekviral_project/app/services/admission.py
+import math
+import time
+import asyncio
+import logging
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from prometheus_client import Counter, Histogram
+
+from app.core.config import settings
+from app.core.metrics import register_callback
+
+logger = logging.getLogger(__name__)
+
+# Jalur admission per jenis input; URL yang tidak diproses (sosial, akademik, tidak dikenal) tanpa jalur
+LANE_BY_URL_TYPE = {"direct_video": "video", "web_article": "article"}
+
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds", "Time a request waited for a slot in its admission lane.",
+    ["lane"], buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected", "Requests shed by admission control.", ["lane", "reason"],
+)
+
+
+class Overloaded(Exception):
+    """Jalur penuh: queue_full -> 429 (langsung ditolak), wait_timeout -> 503 (terlalu lama antre)."""
+
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"Jalur {lane} penuh ({reason}).")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+        self.status_code = 429 if reason == "queue_full" else 503
+
+
+class Lane:
+    """
+    Batas konkurensi satu jenis pekerjaan: paling banyak `limit` berjalan, `max_queue`
+    menunggu paling lama `max_wait_s`; selebihnya ditolak cepat dengan Overloaded.
+    Pekerjaan background (job video) ikut dihitung tetapi boleh menunggu tanpa batas.
+    Blocking I/O milik jalur ini dijalankan di executor sendiri (run_blocking), supaya
+    tidak menghabiskan thread pool default yang dipakai prediksi teks.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait_s: float, executor_workers: int = 0):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait_s = max_wait_s
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+        # Rata-rata bergerak lama slot dipegang (detik), dasar perkiraan Retry-After
+        self._hold_time = 1.0
+        self.executor = (
+            ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix=f"lane-{name}")
+            if executor_workers else None
+        )
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self._hold_time * (self.waiting + 1) / self.limit))
+
+    def _reject(self, reason: str):
+        ADMISSION_REJECTED.labels(self.name, reason).inc()
+        raise Overloaded(self.name, reason, self.retry_after())
+
+    @asynccontextmanager
+    async def slot(self, background: bool = False):
+        if not background and self._semaphore.locked() and self.waiting >= self.max_queue:
+            self._reject("queue_full")
+
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            # Slot kosong diambil langsung; wait_for membungkus acquire dalam task baru,
+            # sehingga slot belum terpegang saat request berikutnya memeriksa locked()
+            if background or not self._semaphore.locked():
+                await self._semaphore.acquire()
+            else:
+                await asyncio.wait_for(self._semaphore.acquire(), self.max_wait_s)
+        except asyncio.TimeoutError:
+            self._reject("wait_timeout")
+        finally:
+            self.waiting -= 1
+        ADMISSION_QUEUE_WAIT.labels(self.name).observe(time.perf_counter() - start)
+
+        self.active += 1
+        held_since = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            self._hold_time = 0.8 * self._hold_time + 0.2 * (time.perf_counter() - held_since)
+
+
+lanes = {
+    "text": Lane("text", settings.ADMISSION_TEXT_CONCURRENCY, settings.ADMISSION_TEXT_QUEUE,
+                 settings.ADMISSION_MAX_QUEUE_WAIT_S),
+    "article": Lane("article", settings.ADMISSION_ARTICLE_CONCURRENCY, settings.ADMISSION_ARTICLE_QUEUE,
+                    settings.ADMISSION_MAX_QUEUE_WAIT_S, executor_workers=settings.ADMISSION_ARTICLE_CONCURRENCY),
+    # Satu video memakai satu thread dalam satu waktu (unduh, unggah, transkripsi berurutan)
+    "video": Lane("video", settings.ADMISSION_VIDEO_CONCURRENCY, settings.ADMISSION_VIDEO_QUEUE,
+                  settings.ADMISSION_MAX_QUEUE_WAIT_S, executor_workers=settings.ADMISSION_VIDEO_CONCURRENCY),
+}
+
+
+def lane_for(url_type: str | None) -> str | None:
+    """Jalur untuk hasil classify_url (None = teks biasa)."""
+    if url_type is None:
+        return "text"
+    return LANE_BY_URL_TYPE.get(url_type)
+
+
+@asynccontextmanager
+async def admit(lane: str | None, background: bool = False):
+    """Pegang satu slot di jalur `lane` selama blok berjalan; lane None = tanpa batas."""
+    if lane is None:
+        yield
+        return
+    async with lanes[lane].slot(background):
+        yield
+
+
+async def run_blocking(lane: str, fn, *args, **kwargs):
+    """Seperti asyncio.to_thread, tetapi di executor milik jalur (jika ada)."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, fn, *args, **kwargs)
+    return await loop.run_in_executor(lanes[lane].executor, call)
+
+
+def _lane_stats():
+    values = {}
+    for name, lane in lanes.items():
+        values[(name, "active")] = lane.active
+        values[(name, "waiting")] = lane.waiting
+        values[(name, "limit")] = lane.limit
+    return values
+
+
+register_callback("admission_lane", "Admission lane slots by state (active, waiting, limit).", ["lane", "state"], _lane_stats)
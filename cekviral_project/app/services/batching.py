@@ -0,0 +1,85 @@
+# cekviral_project/app/services/batching.py
+import asyncio
+import logging
+from urllib.parse import urlparse
+
+from app.services.ml_model import predict_batch
+
+logger = logging.getLogger(__name__)
+
+
+class TextBatcher:
+    """
+    Mengumpulkan teks dari banyak coroutine menjadi satu pemanggilan predict_batch:
+    batch dikirim saat berisi `max_batch` teks atau `max_wait_ms` setelah teks
+    pertama masuk. Inferensi berjalan di thread agar event loop tidak terblokir.
+    Dipakai per request /verify/batch; panggil close() setelah selesai.
+    `invoke_sizes` adalah ukuran batch tetap interpreter (lihat ml_model._invoke_batch).
+    """
+
+    def __init__(self, max_batch: int, max_wait_ms: float, invoke_sizes=None):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.invoke_sizes = invoke_sizes
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def predict(self, text: str) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await asyncio.to_thread(predict_batch, [text for text, _ in batch], self.invoke_sizes)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self):
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+
+class HostLimiter:
+    """Batas fetch bersamaan: total `total` dan paling banyak `per_host` ke satu hostname."""
+
+    def __init__(self, total: int, per_host: int):
+        self.per_host = per_host
+        self._total = asyncio.Semaphore(total)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            semaphore = self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return semaphore
+
+    async def run(self, url: str, coro_fn):
+        # Semaphore host diambil lebih dulu, agar fetch yang menunggu host sibuk
+        # tidak memegang slot total dan menghalangi host lain
+        async with self._host_semaphore(url):
+            async with self._total:
+                return await coro_fn()
@@ -1,14 +1,12 @@
 # cekviral_project/app/services/content_analyzer.py
-from bs4 import BeautifulSoup
 import re
 import os
 import subprocess
 import logging
-import asyncio
-from google.cloud import speech
-from google.cloud import storage
 
 from app.core.config import settings 
+from app.core.metrics import observe_external
+from app.services.admission import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +22,7 @@ def extract_text_from_html(html_content: str) -> str | None:
         logger.warning("Input html_content untuk extract_text_from_html kosong atau bukan string.")
         return None
     try:
+        from bs4 import BeautifulSoup  # diimpor saat dipakai agar startup tetap ringan
         soup = BeautifulSoup(html_content, 'html.parser')
 
         # Hapus tag yang tidak diinginkan seperti script, style, nav, footer, dll.
@@ -44,7 +43,7 @@ def extract_text_from_html(html_content: str) -> str | None:
         for selector in main_content_selectors:
             main_article_element = soup.select_one(selector)
             if main_article_element:
-                logger.debug(f"Main content found with selector: {selector}")
+                logger.debug("Main content found with selector: %s", selector)
                 break
         
         article_text_parts = []
@@ -65,14 +64,14 @@ def extract_text_from_html(html_content: str) -> str | None:
         final_text = re.sub(r'\s+', ' ', final_text).strip()
 
         if final_text:
-            logger.debug(f"Extracted text length: {len(final_text)}")
+            logger.debug("Extracted text length: %s", len(final_text))
             return final_text
         else:
             logger.warning("No significant text could be extracted from HTML.")
             return None
 
     except Exception as e:
-        logger.error(f"Gagal mengekstrak teks dari HTML: {e}", exc_info=True)
+        logger.error("Gagal mengekstrak teks dari HTML: %s", e, exc_info=True)
         return None
 
 
@@ -88,33 +87,38 @@ async def convert_video_to_text(video_url: str) -> str | None:
     local_audio_path = os.path.join(temp_dir, audio_filename)
     
     try:
-        logger.info(f"Memeriksa keberadaan yt-dlp dan ffmpeg...")
-        await asyncio.to_thread(subprocess.run, ['yt-dlp', '--version'], check=True, capture_output=True, text=True, timeout=10)
-        await asyncio.to_thread(subprocess.run, ['ffmpeg', '-version'], check=True, capture_output=True, text=True, timeout=10)
+        logger.info("Memeriksa keberadaan yt-dlp dan ffmpeg...")
+        await run_blocking("video", subprocess.run, ['yt-dlp', '--version'], check=True, capture_output=True, text=True, timeout=10)
+        await run_blocking("video", subprocess.run, ['ffmpeg', '-version'], check=True, capture_output=True, text=True, timeout=10)
     except Exception as e:
-        logger.error(f"Error saat memeriksa yt-dlp/FFmpeg: {e}")
+        logger.error("Error saat memeriksa yt-dlp/FFmpeg: %s", e)
         return "Maaf, fitur transkripsi suara tidak tersedia karena aplikasi tidak dapat menemukan alat bantu (yt-dlp/ffmpeg)."
 
+    # Klien Google Cloud cukup berat diimpor, jadi baru dimuat saat ada video
+    from google.cloud import speech
+    from google.cloud import storage
+
     transcribed_text = None
     gcs_uri = None
     try:
         # 1. Unduh dan konversi audio ke WAV mono
-        logger.info(f"Mulai mengunduh dan mengonversi audio dari {video_url} ke {local_audio_path}")
-        process = await asyncio.to_thread(
-            subprocess.run,
-            [
-                'yt-dlp', '-x', '--audio-format', 'wav', 
-                '--ppa', 'ffmpeg:-ac 1', # Paksa output menjadi mono (1 channel audio)
-                '-o', local_audio_path, video_url
-            ],
-            capture_output=True, text=True, check=False, timeout=900
-        )
+        logger.info("Mulai mengunduh dan mengonversi audio dari %s ke %s", video_url, local_audio_path)
+        with observe_external("video_download"):
+            process = await run_blocking(
+                "video", subprocess.run,
+                [
+                    'yt-dlp', '-x', '--audio-format', 'wav', 
+                    '--ppa', 'ffmpeg:-ac 1', # Paksa output menjadi mono (1 channel audio)
+                    '-o', local_audio_path, video_url
+                ],
+                capture_output=True, text=True, check=False, timeout=900
+            )
         if process.returncode != 0:
-            logger.error(f"yt-dlp gagal mengunduh audio. Error: {process.stderr.strip()}")
+            logger.error("yt-dlp gagal mengunduh audio. Error: %s", process.stderr.strip())
             return "Maaf, gagal mengunduh audio dari video tersebut."
 
         if not os.path.exists(local_audio_path) or os.path.getsize(local_audio_path) == 0:
-            logger.error(f"File audio tidak ditemukan atau kosong: {local_audio_path}.")
+            logger.error("File audio tidak ditemukan atau kosong: %s.", local_audio_path)
             return "Maaf, audio dari video tidak dapat diunduh."
         
         # 2. Upload ke GCS
@@ -122,8 +126,9 @@ async def convert_video_to_text(video_url: str) -> str | None:
         bucket = storage_client.bucket(GCS_BUCKET_NAME)
         blob = bucket.blob(audio_filename)
 
-        logger.info(f"Mengunggah {local_audio_path} ke GCS bucket '{GCS_BUCKET_NAME}'...")
-        await asyncio.to_thread(blob.upload_from_filename, local_audio_path)
+        logger.info("Mengunggah %s ke GCS bucket '%s'...", local_audio_path, GCS_BUCKET_NAME)
+        with observe_external("gcs"):
+            await run_blocking("video", blob.upload_from_filename, local_audio_path)
         gcs_uri = f"gs://{GCS_BUCKET_NAME}/{audio_filename}"
         
         # 3. Kirim request ke Google Speech-to-Text API
@@ -135,17 +140,18 @@ async def convert_video_to_text(video_url: str) -> str | None:
         )
 
         logger.info("Mengirim request long_running_recognize ke Google API...")
-        operation = await asyncio.to_thread(speech_client.long_running_recognize, config=config, audio=audio)
-        response = await asyncio.to_thread(operation.result, timeout=900)
+        with observe_external("speech"):
+            operation = await run_blocking("video", speech_client.long_running_recognize, config=config, audio=audio)
+            response = await run_blocking("video", operation.result, timeout=900)
         
         if response.results:
             transcribed_text = " ".join([result.alternatives[0].transcript for result in response.results])
         else:
-            logger.warning(f"Google API tidak mengembalikan hasil untuk {video_url}")
+            logger.warning("Google API tidak mengembalikan hasil untuk %s", video_url)
             return "Maaf, tidak ada obrolan yang dapat dikenali dari audio ini."
 
     except Exception as e:
-        logger.error(f"Error selama proses transkripsi: {e}", exc_info=True)
+        logger.error("Error selama proses transkripsi: %s", e, exc_info=True)
         return "Maaf, terjadi kesalahan pada layanan transkripsi suara."
     finally:
         # 4. Bersihkan file temporer di lokal dan GCS
@@ -157,8 +163,9 @@ async def convert_video_to_text(video_url: str) -> str | None:
                 storage_client = storage.Client()
                 bucket = storage_client.bucket(GCS_BUCKET_NAME)
                 blob = bucket.blob(audio_filename)
-                blob.delete()
+                with observe_external("gcs"):
+                    await run_blocking("video", blob.delete)
             except Exception as e:
-                logger.error(f"Gagal membersihkan file dari GCS {gcs_uri}: {e}")
+                logger.error("Gagal membersihkan file dari GCS %s: %s", gcs_uri, e)
     
     return transcribed_text
\ No newline at end of file
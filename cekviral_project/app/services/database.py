@@ -1,57 +1,109 @@
 # cekviral_project/app/services/database.py
+import asyncio
 import logging
-from supabase import create_client, Client
+import threading
 from app.core.config import settings
+from app.core.metrics import observe_external
+from app.core.logging_setup import SAMPLED
 
 # --- Impor dari file schemas.py ---
 from app.schemas import VerificationResult
 
 logger = logging.getLogger(__name__)
 
-# Inisialisasi klien Supabase
-supabase: Client | None = None
-if settings.SUPABASE_URL and settings.SUPABASE_KEY:
-    try:
-        supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-        logger.info("Koneksi ke Supabase berhasil diinisialisasi.")
-    except Exception as e:
-        logger.error(f"Gagal menginisialisasi koneksi Supabase: {e}", exc_info=True)
-else:
-    logger.warning("SUPABASE_URL atau SUPABASE_KEY tidak ditemukan. Fitur database tidak akan aktif.")
+# Klien Supabase dibuat saat pertama dipakai (impor supabase cukup berat untuk startup)
+_supabase = None
+_supabase_initialized = False
+_supabase_lock = threading.Lock()
+
+
+def get_supabase():
+    global _supabase, _supabase_initialized
+    if _supabase_initialized:
+        return _supabase
+    with _supabase_lock:
+        if _supabase_initialized:
+            return _supabase
+        if settings.SUPABASE_URL and settings.SUPABASE_KEY:
+            try:
+                from supabase import create_client
+                _supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+                logger.info("Koneksi ke Supabase berhasil diinisialisasi.")
+            except Exception as e:
+                logger.error("Gagal menginisialisasi koneksi Supabase: %s", e, exc_info=True)
+        else:
+            logger.warning("SUPABASE_URL atau SUPABASE_KEY tidak ditemukan. Fitur database tidak akan aktif.")
+        _supabase_initialized = True
+    return _supabase
+
+def _history_row(result: VerificationResult, user_id: str | None) -> dict:
+    row = {
+        "original_input":        result.original_input,
+        "processed_text":        result.processed_text,
+        "prob_hoax":             result.prediction.probabilities.HOAKS,
+        "prob_fakta":            result.prediction.probabilities.FAKTA,
+        "final_label_threshold": result.prediction.final_label_thresholded,
+        "inference_time_ms":     result.prediction.inference_time_ms,
+        "predicted_label":       result.prediction.predicted_label_model,
+    }
+    if user_id:
+        row["user_id"] = user_id  # hanya ditambahkan jika user login
+    return row
 
 async def save_verification_result(result: VerificationResult, user_id: str | None = None) -> str | None:
     """
     Menyimpan hasil verifikasi ke dalam tabel 'history' di Supabase. Jika user login, simpan juga user_id.
     """
+    supabase = get_supabase()
     if not supabase:
         logger.warning("Klien Supabase tidak tersedia. Melewatkan penyimpanan ke database.")
         return None
 
     try:
-        data_to_insert = {
-            "original_input":        result.original_input,
-            "processed_text":        result.processed_text,
-            "prob_hoax":             result.prediction.probabilities.HOAKS,
-            "prob_fakta":            result.prediction.probabilities.FAKTA,
-            "final_label_threshold": result.prediction.final_label_thresholded,
-            "inference_time_ms":     result.prediction.inference_time_ms,
-            "predicted_label":       result.prediction.predicted_label_model,
-        }
-
-        if user_id:
-            data_to_insert["user_id"] = user_id  # hanya ditambahkan jika user login
-
-        logger.info(f"Menyimpan hasil verifikasi ke Supabase: {data_to_insert}")
-        response = supabase.table("history").insert(data_to_insert, returning="representation").execute()
+        data_to_insert = _history_row(result, user_id)
+
+        logger.debug("Menyimpan hasil verifikasi ke Supabase: %s", data_to_insert)
+        with observe_external("supabase"):
+            response = supabase.table("history").insert(data_to_insert, returning="representation").execute()
 
         if response.data and len(response.data) > 0:
             history_id = response.data[0].get("history_id")
-            logger.info(f"Data berhasil disimpan ke Supabase dengan ID: {history_id}")
+            logger.info("Data berhasil disimpan ke Supabase dengan ID: %s", history_id, extra=SAMPLED)
             return history_id
         else:
             logger.warning("Data berhasil disimpan tetapi tidak ada ID yang dikembalikan.")
             return None
 
     except Exception as e:
-        logger.error(f"Gagal menyimpan data ke Supabase: {e}", exc_info=True)
-        return None
\ No newline at end of file
+        logger.error("Gagal menyimpan data ke Supabase: %s", e, exc_info=True)
+        return None
+
+async def save_verification_results(results: list[VerificationResult], user_id: str | None = None) -> list[str | None]:
+    """
+    Versi bulk dari save_verification_result untuk /verify/batch: semua hasil disimpan
+    dengan satu insert. Mengembalikan history_id sesuai urutan input (None jika gagal).
+    """
+    if not results:
+        return []
+    supabase = get_supabase()
+    if not supabase:
+        logger.warning("Klien Supabase tidak tersedia. Melewatkan penyimpanan ke database.")
+        return [None] * len(results)
+
+    rows = [_history_row(result, user_id) for result in results]
+    try:
+        # Insert besar dijalankan di thread agar event loop tetap melayani request lain
+        with observe_external("supabase"):
+            response = await asyncio.to_thread(
+                lambda: supabase.table("history").insert(rows, returning="representation").execute()
+            )
+        data = response.data or []
+        if len(data) != len(rows):
+            logger.warning("Supabase mengembalikan %d baris untuk %d hasil yang disimpan.", len(data), len(rows))
+            return [None] * len(results)
+        logger.info("%d hasil verifikasi disimpan ke Supabase dalam satu insert.", len(rows))
+        # PostgREST mengembalikan baris hasil insert sesuai urutan input
+        return [str(row.get("history_id")) if row.get("history_id") is not None else None for row in data]
+    except Exception as e:
+        logger.error("Gagal menyimpan %d hasil verifikasi ke Supabase: %s", len(rows), e, exc_info=True)
+        return [None] * len(results)
\ No newline at end of file
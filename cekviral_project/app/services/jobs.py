@@ -0,0 +1,104 @@
+# cekviral_project/app/services/jobs.py
+import time
+import uuid
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+from app.core.metrics import register_callback
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    job_id: str
+    key: str | None
+    user_id: str | None
+    status: str = "queued"  # queued -> running -> done | error
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    result: Any = None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobRegistry:
+    """
+    Registry job background di memori proses (per worker). Job dengan key yang sama
+    (mis. canonical_id video milik user yang sama) yang masih berjalan atau belum
+    kedaluwarsa dipakai ulang, bukan dijalankan dua kali. Paling banyak `concurrency`
+    job berjalan bersamaan; sisanya menunggu dengan status "queued".
+    """
+
+    def __init__(self, concurrency: int, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._jobs: dict[str, Job] = {}
+        self._by_key: dict[str, str] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, key: str | None, user_id: str | None, work: Callable[[], Awaitable[Any]]) -> Job:
+        self._purge_expired()
+        if key is not None:
+            existing = self._jobs.get(self._by_key.get(key))
+            if existing and existing.status != "error":
+                return existing
+
+        job = Job(job_id=uuid.uuid4().hex, key=key, user_id=user_id)
+        self._jobs[job.job_id] = job
+        if key is not None:
+            self._by_key[key] = job.job_id
+        task = asyncio.create_task(self._run(job, work))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: Job, work: Callable[[], Awaitable[Any]]):
+        async with self._semaphore:
+            job.status = "running"
+            try:
+                job.result = await work()
+                job.status = "done"
+            except Exception as e:
+                logger.error("Job %s gagal: %s", job.job_id, e, exc_info=True)
+                job.error = str(e)
+                job.status = "error"
+            finally:
+                job.finished_at = time.time()
+
+    def _purge_expired(self):
+        cutoff = time.time() - self.ttl_seconds
+        expired = [job for job in self._jobs.values() if job.finished_at is not None and job.finished_at < cutoff]
+        for job in expired:
+            del self._jobs[job.job_id]
+            if job.key is not None and self._by_key.get(job.key) == job.job_id:
+                del self._by_key[job.key]
+
+    def stats(self) -> dict:
+        counts = {"queued": 0, "running": 0, "done": 0, "error": 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return counts
+
+
+# Transkripsi video dari /verify/batch; hasilnya diambil lewat GET /verify/jobs/{job_id}
+video_jobs = JobRegistry(settings.VIDEO_JOB_CONCURRENCY, settings.VIDEO_JOB_TTL_S)
+register_callback(
+    "verify_jobs", "Background verification jobs held by this process, by status.",
+    ["status"], lambda: {(status,): count for status, count in video_jobs.stats().items()},
+)
@@ -4,20 +4,31 @@ import re
 import string
 import logging
 import time
-
-# Import library NLTK, TensorFlow, dan Transformers
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-import tensorflow as tf
+import threading
 import numpy as np
-from transformers import BertTokenizer
+from app.core.metrics import MODEL_INVOKE_LATENCY
+from app.core.profiling import span
+from app.core.logging_setup import SAMPLED
+
+# NLTK, TensorFlow dan Transformers diimpor saat pertama dipakai (lihat load_ml_model
+# dan tokenizingText/_stopwords), supaya import modul ini tidak memperlambat startup.
 
 logger = logging.getLogger(__name__)
 
 # Placeholder untuk model dan tokenizer
-global_model = None
+global_interpreter = None
 global_tokenizer = None
+_load_lock = threading.Lock()
+# Interpreter TFLite tidak thread-safe; prediksi dari beberapa thread dijalankan bergiliran
+_interpreter_lock = threading.Lock()
+# Interpreter batch terpisah per ukuran batch tetap: {ukuran: (interpreter, lock)}.
+# global_interpreter tetap berukuran batch 1 dan tidak pernah di-resize
+_batch_interpreters: dict = {}
+_batch_interpreters_lock = threading.Lock()
+_num_threads = None
+_load_attempted = False
+_model_warm = False
+_stopwords_cache = None
 
 # --- KAMUS SLANGWORDS ---
 slangwords = {"@": "di", "abis": "habis", "wtb": "beli", "masi": "masih", "wts": "jual", "wtt": "tukar", "bgt": "banget", "maks": "maksimal",
@@ -102,14 +113,23 @@ def casefoldingText(text):
     return text
 
 def tokenizingText(text):
+    from nltk.tokenize import word_tokenize
     text = word_tokenize(text)
     return text
 
+def _stopwords():
+    # Dibangun sekali per proses, bukan setiap kali filteringText dipanggil
+    global _stopwords_cache
+    if _stopwords_cache is None:
+        from nltk.corpus import stopwords
+        listStopwords = set(stopwords.words('indonesian'))
+        listStopwords.update(stopwords.words('english'))
+        listStopwords.update(['iya','yaa','gak','nya','na','sih','ku',"di","ga","ya","gaa","loh","kah","woi","woii","woy", "yg"])
+        _stopwords_cache = frozenset(listStopwords)
+    return _stopwords_cache
+
 def filteringText(text):
-    listStopwords = set(stopwords.words('indonesian'))
-    listStopwords1 = set(stopwords.words('english'))
-    listStopwords.update(listStopwords1)
-    listStopwords.update(['iya','yaa','gak','nya','na','sih','ku',"di","ga","ya","gaa","loh","kah","woi","woii","woy", "yg"])
+    listStopwords = _stopwords()
     filtered = []
     for txt in text:
         if txt not in listStopwords:
@@ -138,7 +158,7 @@ def preprocess_text_for_ml(text: str) -> str:
     termasuk penanganan karakter baris baru dan spasi berlebihan secara otomatis.
     """
     if not isinstance(text, str):
-        logger.warning(f"Input to preprocess_text_for_ml is not a string: {type(text)}. Attempting conversion.")
+        logger.warning("Input to preprocess_text_for_ml is not a string: %s. Attempting conversion.", type(text))
         text = str(text)
 
     # Ini adalah langkah pertama yang kuat untuk menangani newline dan spasi berlebihan.
@@ -146,11 +166,16 @@ def preprocess_text_for_ml(text: str) -> str:
     text = text.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
     text = re.sub(r'\s+', ' ', text).strip()
 
-    text = cleaningText(text)
-    text = casefoldingText(text)
-    text = fix_slangwords(text)
-    tokens = tokenizingText(text)
-    tokens = filteringText(tokens)
+    # Span per langkah hanya tercatat untuk request yang ditrace (TRACE_SAMPLE_RATE)
+    with span("preprocess.clean"):
+        text = cleaningText(text)
+        text = casefoldingText(text)
+    with span("preprocess.slang"):
+        text = fix_slangwords(text)
+    with span("preprocess.words"):
+        tokens = tokenizingText(text)
+    with span("preprocess.stopwords"):
+        tokens = filteringText(tokens)
     text = toSentence(tokens)
     return text
 # --- AKHIR FUNGSI PREPROCESSING TEKS ---
@@ -158,7 +183,13 @@ def preprocess_text_for_ml(text: str) -> str:
 
 # Konfigurasi model dan tokenizer
 INDOBERT_TOKENIZER_NAME = "indobenchmark/indobert-lite-base-p2"
+# Salinan lokal tokenizer (dibuat scripts/vendor_assets.py saat build image);
+# jika ada, tokenizer dimuat dari sini tanpa menghubungi Hugging Face Hub
+TOKENIZER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'models', 'tokenizer')
 MAX_SEQUENCE_LENGTH = 128
+# Ukuran batch tetap interpreter batch bila pemanggil tidak memberikannya
+# (web service: settings.BATCH_INVOKE_SIZES lewat TextBatcher)
+DEFAULT_BATCH_INVOKE_SIZES = (4, 8, 16, 32)
 FINE_TUNED_MODEL_FILE = "indobert_model.tflite"
 
 # Mapping label untuk klasifikasi biner
@@ -168,45 +199,228 @@ CLASS_LABELS = {0: "HOAKS", 1: "FAKTA"}
 UNCERTAIN_THRESHOLD_LOW = 0.15
 UNCERTAIN_THRESHOLD_HIGH = 0.85
 
-def load_ml_model():
-    """Memuat model TFLite dan tokenizer-nya."""
-    global global_interpreter, global_tokenizer
+# Pesan hasil error untuk teks yang kosong setelah pra-pemrosesan (bukan kegagalan model)
+EMPTY_TEXT_MESSAGE = "Teks setelah pra-pemrosesan kosong."
 
-    model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'models', FINE_TUNED_MODEL_FILE)
-    
+MODEL_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'models', FINE_TUNED_MODEL_FILE)
+
+
+def load_tokenizer():
+    """Memuat tokenizer IndoBERT (aman dipanggil sebelum fork, lihat gunicorn.conf.py)."""
+    global global_tokenizer
+    if global_tokenizer is not None:
+        return
     try:
-        logger.info(f"Memuat model TFLite dari: {model_path}")
-        global_interpreter = tf.lite.Interpreter(model_path=model_path)
-        global_interpreter.allocate_tensors()
-        logger.info("Model TFLite berhasil dimuat.")
-        
-        logger.info(f"Memuat tokenizer: {INDOBERT_TOKENIZER_NAME}")
-        global_tokenizer = BertTokenizer.from_pretrained(INDOBERT_TOKENIZER_NAME)
+        from transformers import BertTokenizer
+
+        tokenizer_source = TOKENIZER_DIR if os.path.isdir(TOKENIZER_DIR) else INDOBERT_TOKENIZER_NAME
+        logger.info("Memuat tokenizer: %s", tokenizer_source)
+        global_tokenizer = BertTokenizer.from_pretrained(tokenizer_source)
         logger.info("Tokenizer Hugging Face berhasil dimuat.")
+    except Exception as e:
+        logger.error("Terjadi kesalahan saat memuat tokenizer: %s", e, exc_info=True)
+        global_tokenizer = None
+
+
+def load_interpreter(num_threads: int | None = None):
+    """
+    Membuat interpreter TFLite. Harus dipanggil di proses yang akan memakainya
+    (setelah fork): interpreter punya thread dan arena tensor sendiri. Dengan
+    model_path, file model di-mmap read-only sehingga bobotnya berbagi page cache
+    yang sama di semua worker. num_threads None = TFLITE_NUM_THREADS dari settings.
+    """
+    global global_interpreter, _num_threads
+    if global_interpreter is not None:
+        return
+    try:
+        if num_threads is None:
+            from app.core.config import settings
+            num_threads = settings.TFLITE_NUM_THREADS
 
+        logger.info("Memuat model TFLite dari: %s", MODEL_FILE_PATH)
+        _num_threads = num_threads
+        global_interpreter = _new_interpreter(1)
+        logger.info("Model TFLite berhasil dimuat.")
     except Exception as e:
-        logger.error(f"Terjadi kesalahan saat memuat model TFLite atau tokenizer: {e}", exc_info=True)
+        logger.error("Terjadi kesalahan saat memuat model TFLite: %s", e, exc_info=True)
         global_interpreter = None
-        global_tokenizer = None
+
+
+def _new_interpreter(batch_size: int):
+    import tensorflow as tf
+    interpreter = tf.lite.Interpreter(model_path=MODEL_FILE_PATH, num_threads=_num_threads)
+    input_details = interpreter.get_input_details()
+    if input_details[0]['shape'][0] != batch_size:
+        for detail in input_details:
+            interpreter.resize_tensor_input(detail['index'], [batch_size, MAX_SEQUENCE_LENGTH])
+    interpreter.allocate_tensors()
+    return interpreter
+
+
+def _batch_interpreter(batch_size: int):
+    """Interpreter (dan lock-nya) untuk satu ukuran batch tetap, dibuat saat pertama dipakai."""
+    entry = _batch_interpreters.get(batch_size)
+    if entry is None:
+        with _batch_interpreters_lock:
+            entry = _batch_interpreters.get(batch_size)
+            if entry is None:
+                logger.info("Membuat interpreter TFLite untuk batch %d", batch_size)
+                entry = (_new_interpreter(batch_size), threading.Lock())
+                _batch_interpreters[batch_size] = entry
+    return entry
+
+
+def load_ml_model():
+    """Memuat model TFLite dan tokenizer-nya."""
+    load_tokenizer()
+    load_interpreter()
+
+
+def preload_shared_resources():
+    """
+    Dipanggil di master gunicorn sebelum fork (preload_app). Semua yang dibangun di
+    sini (tokenizer, stopwords, model punkt NLTK, modul tensorflow) dibagi ke worker
+    secara copy-on-write; interpreter TFLite sengaja tidak dibuat di sini.
+    """
+    start_time = time.perf_counter()
+    load_tokenizer()
+    _stopwords()
+    tokenizingText("memuat model punkt")
+    import tensorflow  # noqa: F401  (hanya impor modul; tidak membuat interpreter/thread)
+    logger.info("Resource bersama dimuat sebelum fork dalam %.0fms", (time.perf_counter() - start_time) * 1000)
+
+
+def is_model_ready() -> bool:
+    return global_interpreter is not None and global_tokenizer is not None
+
+
+def ensure_ml_model() -> bool:
+    """
+    Muat model jika belum (mis. request datang sebelum warmup LAZY_STARTUP selesai).
+    Pemuatan hanya dicoba sekali per proses; jika gagal, prediksi mengembalikan error.
+    """
+    global _load_attempted
+    if not _load_attempted:
+        with _load_lock:
+            if not _load_attempted:
+                load_ml_model()
+                _load_attempted = True
+    return is_model_ready()
+
+
+def is_model_warm() -> bool:
+    return _model_warm
+
+
+def warmup_ml_model():
+    """Muat model, tokenizer dan data NLTK, lalu jalankan satu prediksi agar request pertama tidak lambat."""
+    global _model_warm
+    start_time = time.perf_counter()
+    if ensure_ml_model():
+        predict_content_hoax_status("pemanasan model deteksi hoaks")
+        _model_warm = True
+    logger.info("Warmup model selesai dalam %.0fms", (time.perf_counter() - start_time) * 1000)
+
+
+def _error_result(message: str) -> dict:
+    return {
+        "status": "error", "message": message,
+        "probabilities": {"HOAKS": 0.0, "FAKTA": 0.0},
+        "predicted_label_model": "N/A", "highest_confidence": 0.0,
+        "final_label_thresholded": "BELUM DIVERIFIKASI", "inference_time_ms": 0.0
+    }
+
+
+def _run_interpreter(interpreter, encoded_input) -> np.ndarray:
+    # Dipanggil dengan lock milik interpreter; ukuran batch input harus sama dengan tensor-nya
+    input_details = interpreter.get_input_details()
+    output_details = interpreter.get_output_details()
+
+    # Urutan input model: input_ids, attention_mask, (opsional) token_type_ids
+    for detail, name in zip(input_details, ('input_ids', 'attention_mask', 'token_type_ids')):
+        interpreter.set_tensor(detail['index'], encoded_input[name].astype(detail['dtype']))
+
+    with MODEL_INVOKE_LATENCY.labels("tflite").time():
+        interpreter.invoke()
+    return interpreter.get_tensor(output_details[0]['index']).copy()
+
+
+def _invoke(encoded_input) -> np.ndarray:
+    """
+    Menjalankan interpreter batch 1 untuk satu keluaran tokenizer (return_tensors='np')
+    dan mengembalikan logits [1, 2].
+    """
+    with _interpreter_lock:
+        return _run_interpreter(global_interpreter, encoded_input)
+
+
+def _invoke_batch(encoded_input, batch_sizes=None) -> np.ndarray:
+    """
+    Seperti _invoke untuk banyak teks sekaligus, mengembalikan logits [batch, 2].
+    Batch dipotong per ukuran terbesar di `batch_sizes` (None = DEFAULT_BATCH_INVOKE_SIZES),
+    dan tiap potongan di-pad
+    (mengulang baris terakhir) ke ukuran berikutnya di daftar itu, lalu dijalankan di
+    interpreter khusus ukuran tersebut. Tidak ada interpreter yang di-resize, dan
+    interpreter batch 1 milik /verify tidak ikut terkunci. Satu teks memakai _invoke.
+    """
+    batch_size = encoded_input['input_ids'].shape[0]
+    if batch_size == 1:
+        return _invoke(encoded_input)
+
+    sizes = sorted(batch_sizes or DEFAULT_BATCH_INVOKE_SIZES)
+    logits = []
+    for start in range(0, batch_size, sizes[-1]):
+        chunk = {name: values[start:start + sizes[-1]] for name, values in encoded_input.items()}
+        rows = chunk['input_ids'].shape[0]
+        padded_size = next(size for size in sizes if size >= rows)
+        if padded_size > rows:
+            chunk = {
+                name: np.concatenate([values, np.repeat(values[-1:], padded_size - rows, axis=0)])
+                for name, values in chunk.items()
+            }
+        interpreter, lock = _batch_interpreter(padded_size)
+        with lock:
+            logits.append(_run_interpreter(interpreter, chunk)[:rows])
+    return np.concatenate(logits)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    # Softmax dengan NumPy, tidak perlu TensorFlow di jalur prediksi
+    exp_logits = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return exp_logits / exp_logits.sum(axis=1, keepdims=True)
+
+
+def _prediction_result(probabilities_array: np.ndarray, inference_time_ms: float) -> dict:
+    # Perhatikan CLASS_LABELS: jika key 0 adalah HOAKS, maka prob_hoax adalah probabilities_array[0]
+    prob_hoax = float(probabilities_array[0])
+    prob_fakta = float(probabilities_array[1])
+    predicted_class_index = int(np.argmax(probabilities_array))
+    predicted_label = CLASS_LABELS.get(predicted_class_index, "tidak diketahui")
+
+    final_label_thresholded = "BELUM DIVERIFIKASI"
+    if prob_fakta >= UNCERTAIN_THRESHOLD_HIGH:
+        final_label_thresholded = "FAKTA"
+    elif prob_fakta <= UNCERTAIN_THRESHOLD_LOW:
+        final_label_thresholded = "HOAKS"
+
+    return {
+        "status": "success",
+        "message": "Prediksi berhasil.",
+        "probabilities": {"HOAKS": prob_hoax, "FAKTA": prob_fakta},
+        "predicted_label_model": predicted_label,
+        "highest_confidence": float(np.max(probabilities_array)),
+        "final_label_thresholded": final_label_thresholded,
+        "inference_time_ms": inference_time_ms
+    }
 
 
 def predict_content_hoax_status(raw_text: str) -> dict:
     """
     Melakukan prediksi menggunakan model TFLite yang sudah dioptimalkan.
     """
-    global global_interpreter, global_tokenizer
-
-    if global_interpreter is None or global_tokenizer is None:
+    if not ensure_ml_model():
         logger.error("Interpreter TFLite atau Tokenizer belum dimuat. Tidak dapat melakukan prediksi.")
-        return {
-            "status": "error",
-            "message": "Model/Tokenizer tidak dimuat.",
-            "probabilities": {"HOAKS": 0.0, "FAKTA": 0.0},
-            "predicted_label_model": "N/A",
-            "highest_confidence": 0.0,
-            "final_label_thresholded": "BELUM DIVERIFIKASI",
-            "inference_time_ms": 0.0
-        }
+        return _error_result("Model/Tokenizer tidak dimuat.")
 
     start_time = time.perf_counter()
     
@@ -215,74 +429,71 @@ def predict_content_hoax_status(raw_text: str) -> dict:
         
         if not processed_text.strip():
             logger.warning("Teks setelah pra-pemrosesan kosong atau hanya spasi.")
-            return {
-                "status": "error", "message": "Teks setelah pra-pemrosesan kosong.",
-                "probabilities": {"HOAKS": 0.0, "FAKTA": 0.0},
-                "predicted_label_model": "N/A", "highest_confidence": 0.0,
-                "final_label_thresholded": "BELUM DIVERIFIKASI", "inference_time_ms": 0.0
-            }
-
-        logger.info(f"Teks setelah pra-pemrosesan: {processed_text[:100]}...")
-
-        encoded_input = global_tokenizer(
-            processed_text,
-            truncation=True,
-            padding='max_length',
-            max_length=MAX_SEQUENCE_LENGTH,
-            return_tensors='tf'
+            return _error_result(EMPTY_TEXT_MESSAGE)
+
+        logger.debug("Teks setelah pra-pemrosesan: %.100s...", processed_text)
+
+        with span("predict.tokenizer"):
+            encoded_input = global_tokenizer(
+                processed_text,
+                truncation=True,
+                padding='max_length',
+                max_length=MAX_SEQUENCE_LENGTH,
+                return_tensors='np'
+            )
+        with span("predict.invoke"):
+            probabilities_array = _softmax(_invoke(encoded_input))[0]
+        result = _prediction_result(probabilities_array, (time.perf_counter() - start_time) * 1000)
+
+        logger.info(
+            "Prediksi: HOAKS=%.4f, FAKTA=%.4f, label model %s, final (thresholded) %s, %.1fms",
+            result['probabilities']['HOAKS'], result['probabilities']['FAKTA'],
+            result['predicted_label_model'], result['final_label_thresholded'], result['inference_time_ms'],
+            extra=SAMPLED,
         )
-        
-        input_details = global_interpreter.get_input_details()
-        output_details = global_interpreter.get_output_details()
+        return result
 
-        input_ids = tf.cast(encoded_input['input_ids'], dtype=input_details[0]['dtype'])
-        attention_mask = tf.cast(encoded_input['attention_mask'], dtype=input_details[1]['dtype'])
-        
-        global_interpreter.set_tensor(input_details[0]['index'], input_ids)
-        global_interpreter.set_tensor(input_details[1]['index'], attention_mask)
-        if len(input_details) > 2:
-            token_type_ids = tf.cast(encoded_input['token_type_ids'], dtype=input_details[2]['dtype'])
-            global_interpreter.set_tensor(input_details[2]['index'], token_type_ids)
-
-        global_interpreter.invoke()
-        logits = global_interpreter.get_tensor(output_details[0]['index'])
-        
-        probabilities_array = tf.nn.softmax(logits, axis=1).numpy()[0]
-        
-        # Perhatikan CLASS_LABELS: jika key 0 adalah HOAKS, maka prob_hoax adalah probabilities_array[0]
-        prob_hoax = float(probabilities_array[0])
-        prob_fakta = float(probabilities_array[1])
-        predicted_class_index = np.argmax(probabilities_array)
-        predicted_label = CLASS_LABELS.get(predicted_class_index, "tidak diketahui")
-        
-        highest_confidence = float(np.max(probabilities_array))
+    except Exception as e:
+        logger.error("Error saat melakukan prediksi: %s", e, exc_info=True)
+        return _error_result(f"Kesalahan internal saat prediksi: {str(e)}")
 
-        final_label_thresholded = "BELUM DIVERIFIKASI"
-        if prob_fakta >= UNCERTAIN_THRESHOLD_HIGH:
-            final_label_thresholded = "FAKTA"
-        elif prob_fakta <= UNCERTAIN_THRESHOLD_LOW:
-            final_label_thresholded = "HOAKS"
-        
-        inference_time_ms = (time.perf_counter() - start_time) * 1000
 
-        logger.info(f"Probabilities: HOAKS={prob_hoax:.4f}, FAKTA={prob_fakta:.4f}")
-        logger.info(f"Predicted label by model: {predicted_label}, Final (thresholded): {final_label_thresholded}")
-        
-        return {
-            "status": "success",
-            "message": "Prediksi berhasil.",
-            "probabilities": {"HOAKS": prob_hoax, "FAKTA": prob_fakta},
-            "predicted_label_model": predicted_label,
-            "highest_confidence": highest_confidence,
-            "final_label_thresholded": final_label_thresholded,
-            "inference_time_ms": inference_time_ms
-        }
+def predict_batch(raw_texts: list[str], batch_sizes=None) -> list[dict]:
+    """
+    Versi batch dari predict_content_hoax_status: semua teks dipra-proses, di-tokenize
+    dan diinferensi dalam satu pemanggilan interpreter. Hasil berurutan sesuai input,
+    dengan format yang sama; inference_time_ms adalah waktu batch dibagi jumlah teks.
+    batch_sizes diteruskan ke _invoke_batch.
+    """
+    if not raw_texts:
+        return []
+    if not ensure_ml_model():
+        logger.error("Interpreter TFLite atau Tokenizer belum dimuat. Tidak dapat melakukan prediksi.")
+        return [_error_result("Model/Tokenizer tidak dimuat.") for _ in raw_texts]
+
+    start_time = time.perf_counter()
+    try:
+        processed = [preprocess_text_for_ml(text) for text in raw_texts]
+        valid = [i for i, text in enumerate(processed) if text.strip()]
+        results = [_error_result(EMPTY_TEXT_MESSAGE) for _ in raw_texts]
+        if not valid:
+            return results
+
+        with span("predict.tokenizer"):
+            encoded_input = global_tokenizer(
+                [processed[i] for i in valid],
+                truncation=True,
+                padding='max_length',
+                max_length=MAX_SEQUENCE_LENGTH,
+                return_tensors='np'
+            )
+        with span("predict.invoke"):
+            probabilities = _softmax(_invoke_batch(encoded_input, batch_sizes))
+        per_item_ms = (time.perf_counter() - start_time) * 1000 / len(raw_texts)
+        for row, i in enumerate(valid):
+            results[i] = _prediction_result(probabilities[row], per_item_ms)
+        return results
 
     except Exception as e:
-        logger.error(f"Error saat melakukan prediksi: {e}", exc_info=True)
-        return {
-            "status": "error", "message": f"Kesalahan internal saat prediksi: {str(e)}",
-            "probabilities": {"HOAKS": 0.0, "FAKTA": 0.0},
-            "predicted_label_model": "N/A", "highest_confidence": 0.0,
-            "final_label_thresholded": "BELUM DIVERIFIKASI", "inference_time_ms": 0.0
-        }
\ No newline at end of file
+        logger.error("Error saat melakukan prediksi batch: %s", e, exc_info=True)
+        return [_error_result(f"Kesalahan internal saat prediksi: {str(e)}") for _ in raw_texts]
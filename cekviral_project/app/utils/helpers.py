@@ -1,5 +1,8 @@
 # cekviral_project/app/utils/helpers.py
 import re
+import json
+from pathlib import Path
+from typing import NamedTuple
 from urllib.parse import urlparse
 import logging
 
@@ -7,45 +10,91 @@ logger = logging.getLogger(__name__)
 
 # --- Pola-pola URL ---
 
-# Platform video yang didukung oleh yt-dlp
-DIRECT_VIDEO_PATTERNS = [
-    re.compile(r"https://(www\.|m\.)?youtube\.com/(watch\?v=|embed/|shorts/|live/)"),
-    re.compile(r"https://youtu\.be/"),
-    re.compile(r"https://(www\.|m\.)?tiktok\.com/(@[^/]+)?/video/"),
-    re.compile(r"https://(www\.)?instagram\.com/(reel|reels|tv)/[^/]+/?"),
-    re.compile(r"https://(www\.)?(twitter|x)\.com/[^/]+/status/\d+"),
-    re.compile(r"https://(www\.)?dailymotion\.com/video/"),
-    re.compile(r"https://(www\.)?vimeo\.com/\d+"),
-    re.compile(r"https://(www\.|m\.)?facebook\.com/([^/]+/videos/|watch/?\?v=|video\.php\?v=)"),
-    re.compile(r"https://fb\.watch/")
-]
-
-# Platform sosial media yang kontennya sulit/tidak didukung untuk diekstrak (dinamis/membutuhkan login)
-UNSUPPORTED_SOCIAL_PATTERNS = [
-    re.compile(r"https://(www\.|m\.)?instagram\.com/p/"), # Postingan Instagram (foto/carousel)
-    re.compile(r"https://(www\.|m\.)?youtube\.com/post/"), # Postingan YouTube
-    re.compile(r"https://(www\.|m\.)?facebook\.com/(story\.php|photo)"), # Postingan Facebook
-]
-
-# Kata kunci untuk mendeteksi situs jurnal/akademik yang tidak akan kita proses
-ACADEMIC_KEYWORDS = [
-    'journal', 'jurnal', 'doi.org', 'arxiv.org', 'researchgate.net', 
-    'academia.edu', 'ieee.org', 'acm.org', 'springer.com', 'sciencedirect.com'
-]
+# Aturan klasifikasi dimuat dari url_patterns.json dan dikelompokkan per hostname,
+# sehingga satu URL hanya dicocokkan dengan pola milik host-nya sendiri.
+URL_PATTERNS_FILE = Path(__file__).with_name("url_patterns.json")
+
+
+class URLClassification(NamedTuple):
+    category: str  # 'direct_video', 'unsupported_social', 'academic', 'web_article', 'unknown'
+    platform: str | None = None
+    video_id: str | None = None
+
+    @property
+    def canonical_id(self) -> str | None:
+        # Kunci stabil untuk video yang sama walau bentuk URL-nya berbeda
+        if self.platform and self.video_id:
+            return f"{self.platform}:{self.video_id}"
+        return None
+
+
+def _load_url_rules(path: Path = URL_PATTERNS_FILE):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    host_rules = {}
+    for rule in data["rules"]:
+        pattern = re.compile(rule["pattern"])
+        compiled = (rule["category"], rule["platform"], pattern.match, "id" in pattern.groupindex)
+        for host in rule["hosts"]:
+            host_rules.setdefault(host, []).append(compiled)
+    academic = re.compile("|".join(re.escape(k) for k in data["academic_keywords"]))
+    return host_rules, academic
+
+
+HOST_RULES, ACADEMIC_PATTERN = _load_url_rules()
+
+URL_PATTERN = re.compile(
+    r'^(?:http|ftp)s?://'
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'
+    r'localhost|'
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
+    r'(?::\d+)?'
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+_HTTPS_HOST = re.compile(r"https://([^/?#]*)")
 
 # --- Fungsi-fungsi Helper ---
 
 def is_url(input_string: str) -> bool:
     if not isinstance(input_string, str):
         return False
-    url_pattern = re.compile(
-        r'^(?:http|ftp)s?://'
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'
-        r'localhost|'
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
-        r'(?::\d+)?'
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    return bool(url_pattern.match(input_string))
+    return bool(URL_PATTERN.match(input_string))
+
+
+def _classify(url: str):
+    host_match = _HTTPS_HOST.match(url)
+    if host_match:
+        rest = url[host_match.end():]
+        for category, platform, match_rest, has_id in HOST_RULES.get(host_match.group(1), ()):
+            match = match_rest(rest)
+            if match:
+                video_id = match.group("id") if has_id else None
+                logger.debug("URL classified as %r (%s, id=%s): %s", category, platform, video_id, url)
+                return category, platform, video_id
+
+    # Cek jika ini adalah link dari situs akademik/jurnal
+    parsed_url = urlparse(url)
+    if ACADEMIC_PATTERN.search(parsed_url.hostname or "") or ACADEMIC_PATTERN.search(parsed_url.path or ""):
+        logger.debug("URL classified as 'academic': %s", url)
+        return "academic", None, None
+
+    # Jika lolos semua pengecekan di atas, anggap sebagai artikel web umum
+    logger.debug("URL classified as 'web_article': %s", url)
+    return "web_article", None, None
+
+
+def classify_url_detailed(url: str) -> URLClassification:
+    """
+    Mengklasifikasikan URL dan, untuk video, sekaligus mengambil platform dan ID videonya.
+    Hanya URL https:// yang dicek terhadap pola platform (sama seperti pola lama).
+    """
+    if not url or not isinstance(url, str):
+        return URLClassification("unknown")
+    try:
+        return URLClassification(*_classify(url))
+    except Exception as e:
+        logger.error("Error classifying URL %s: %s", url, e, exc_info=True)
+        return URLClassification("unknown")
 
 
 def classify_url(url: str) -> str:
@@ -54,34 +103,9 @@ def classify_url(url: str) -> str:
     Returns: 'direct_video', 'unsupported_social', 'academic', 'web_article', 'unknown'
     """
     if not url or not isinstance(url, str):
-        return 'unknown'
-        
+        return "unknown"
     try:
-        # Cek jika ini adalah link video langsung
-        for pattern in DIRECT_VIDEO_PATTERNS:
-            if pattern.match(url):
-                logger.info(f"URL classified as 'direct_video': {url}")
-                return "direct_video"
-
-        # Cek jika ini adalah link dari platform sosial yang tidak didukung
-        for pattern in UNSUPPORTED_SOCIAL_PATTERNS:
-            if pattern.match(url):
-                logger.warning(f"URL classified as 'unsupported_social': {url}")
-                return "unsupported_social"
-        
-        # Cek jika ini adalah link dari situs akademik/jurnal
-        parsed_url = urlparse(url)
-        hostname = parsed_url.hostname or ""
-        path = parsed_url.path or ""
-        for keyword in ACADEMIC_KEYWORDS:
-            if keyword in hostname or keyword in path:
-                logger.warning(f"URL classified as 'academic': {url}")
-                return "academic"
-
-        # Jika lolos semua pengecekan di atas, anggap sebagai artikel web umum
-        logger.info(f"URL classified as 'web_article': {url}")
-        return "web_article"
-
+        return _classify(url)[0]
     except Exception as e:
-        logger.error(f"Error classifying URL {url}: {e}", exc_info=True)
-        return "unknown"
\ No newline at end of file
+        logger.error("Error classifying URL %s: %s", url, e, exc_info=True)
+        return "unknown"
@@ -0,0 +1,39 @@
+# cekviral_project/gunicorn.conf.py
+# Mode prefork: beberapa worker uvicorn di bawah satu master gunicorn.
+#
+#   WEB_CONCURRENCY=4 TFLITE_NUM_THREADS=1 gunicorn -c gunicorn.conf.py main:app
+#
+# Dengan preload_app, main.py diimpor sekali di master; tokenizer, stopwords, data
+# NLTK, kamus slangwords dan modul tensorflow dibangun sebelum fork sehingga dibagi
+# copy-on-write. Interpreter TFLite dibuat di tiap worker saat startup (main.warmup)
+# dari file model yang di-mmap, jadi bobot model hanya ada sekali di page cache.
+# GUNICORN_PRELOAD=false mengembalikan perilaku lama (setiap worker memuat semuanya sendiri).
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() in ("1", "true", "yes")
+# Startup worker menjalankan satu prediksi pemanasan; beri waktu lebih dari default 30 detik
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from app.services.ml_model import preload_shared_resources
+    preload_shared_resources()
+
+    # Pindahkan semua objek yang ada ke generasi permanen: GC di worker tidak lagi
+    # menyentuh header objek bersama, sehingga halaman memorinya tidak ikut tersalin
+    gc.collect()
+    gc.freeze()
+    server.log.info("Resource bersama dimuat di master, objek dibekukan sebelum fork.")
+
+
+def child_exit(server, worker):
+    # Mode multiproses prometheus_client: buang metrik gauge "live" milik worker yang mati
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,8 +1,10 @@
 # cekviral_project/main.py
 import os
 import sys
+import asyncio
 import logging
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 import uvicorn
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
@@ -22,8 +24,10 @@ load_dotenv()
 # 3. Import settings SETELAH .env di-load
 from app.core.config import settings
 
-# 4. Konfigurasi logging dasar untuk seluruh aplikasi
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# 4. Konfigurasi logging untuk seluruh aplikasi: JSON per baris, ditulis oleh thread
+# terpisah lewat antrean (app/core/logging_setup.py)
+from app.core.logging_setup import setup_logging
+setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.LOG_SAMPLE_RATE, settings.LOG_QUEUE_SIZE)
 logger = logging.getLogger(__name__)
 
 # 5. Atur environment variable untuk Google Cloud Credentials
@@ -37,7 +41,7 @@ if settings.GCP_CREDENTIALS_PATH:
         logger.info("Kredensial Google Cloud (GOOGLE_APPLICATION_CREDENTIALS) berhasil diatur.")
     else:
         # Beri peringatan jika fitur ASR mungkin tidak berfungsi
-        logger.warning(f"File kredensial GCP tidak ditemukan di path: '{credentials_path}'. Fitur ASR via GCP API mungkin tidak akan berfungsi.")
+        logger.warning("File kredensial GCP tidak ditemukan di path: '%s'. Fitur ASR via GCP API mungkin tidak akan berfungsi.", credentials_path)
 else:
     logger.info("GCP_CREDENTIALS_PATH tidak diatur di file .env. Melanjutkan tanpa setup kredensial GCP otomatis.")
 
@@ -46,6 +50,7 @@ else:
 
 # Impor router setelah semua setup path selesai
 from app.api.endpoints import router as api_router
+from app.api.admin import router as admin_router
 
 # Buat instance aplikasi FastAPI
 app = FastAPI(
@@ -62,35 +67,67 @@ app.add_middleware(
     allow_headers=["*"], # Izinkan semua header
 )
 
+# Metrik Prometheus di GET /metrics
+from app.core.metrics import install_metrics
+install_metrics(app)
+
+# Span per tahap untuk sebagian request (TRACE_SAMPLE_RATE), lihat app/core/profiling.py
+if settings.TRACE_SAMPLE_RATE > 0:
+    from app.core.profiling import TraceMiddleware
+    app.add_middleware(TraceMiddleware, sample_rate=settings.TRACE_SAMPLE_RATE)
+
 # ----------------- EVENT HANDLERS (Fungsi saat Startup & Shutdown) -----------------
 
-@app.on_event("startup")
-async def startup_event():
-    """
-    Fungsi ini akan berjalan sekali saat aplikasi FastAPI pertama kali dinyalakan.
-    Sangat cocok untuk memuat model dan dependensi.
-    """
-    logger.info("Aplikasi CekViral startup...")
-    
-    # 1. Download data NLTK yang diperlukan
-    logger.info("Memeriksa/Mengunduh data NLTK...")
+def warmup():
+    """Muat data NLTK, model ML dan klien Supabase agar request pertama tidak menanggung biayanya."""
+    # Data NLTK semestinya sudah ada di image (scripts/vendor_assets.py); unduh hanya untuk
+    # pengembangan lokal yang belum menjalankan skrip tersebut
     import nltk
     try:
-        # Cek apakah resource yang dibutuhkan sudah ada
         nltk.data.find('tokenizers/punkt_tab')
         nltk.data.find('corpora/stopwords')
         logger.info("Data NLTK sudah tersedia.")
-    except nltk.downloader.DownloadError:
+    except LookupError:
         logger.warning("Data NLTK tidak ditemukan. Mengunduh...")
         nltk.download('punkt_tab')
         nltk.download('stopwords')
         logger.info("Data NLTK berhasil diunduh.")
 
-    # 2. Muat model ML untuk deteksi hoaks
     logger.info("Memuat model ML deteksi hoaks...")
-    from app.services.ml_model import load_ml_model
-    load_ml_model() # Fungsi ini akan mengisi variabel global_model dan global_tokenizer
-    logger.info("Model ML deteksi hoaks berhasil dimuat.")
+    from app.services.ml_model import warmup_ml_model
+    warmup_ml_model()
+
+    from app.services.database import get_supabase
+    get_supabase()
+
+
+async def _background_warmup():
+    try:
+        await asyncio.to_thread(warmup)
+    except Exception as e:
+        logger.error("Warmup di background gagal: %s", e, exc_info=True)
+
+
+@app.on_event("startup")
+async def startup_event():
+    """
+    Fungsi ini akan berjalan sekali saat aplikasi FastAPI pertama kali dinyalakan.
+    Dengan LAZY_STARTUP, model dimuat di background dan aplikasi langsung menerima
+    request; /ready melaporkan kapan model siap.
+    """
+    logger.info("Aplikasi CekViral startup...")
+    if settings.PROFILE_ON_START_S > 0:
+        from app.core.profiling import profile_to_file
+        app.state.startup_profile_task = asyncio.create_task(
+            profile_to_file(settings.PROFILE_ON_START_S, settings.PROFILE_INTERVAL_MS, settings.PROFILE_DIR)
+        )
+        logger.info("Profiling %g detik pertama ke %s.", settings.PROFILE_ON_START_S, settings.PROFILE_DIR)
+    if settings.LAZY_STARTUP:
+        app.state.warmup_task = asyncio.create_task(_background_warmup())
+        logger.info("LAZY_STARTUP aktif, model dimuat di background.")
+    else:
+        warmup()
+        logger.info("Model ML deteksi hoaks berhasil dimuat.")
 
 
 @app.on_event("shutdown")
@@ -102,12 +139,21 @@ async def shutdown_event():
 
 # Sertakan router API
 app.include_router(api_router)
+app.include_router(admin_router)
 
 @app.get("/", summary="Endpoint Root", tags=["Root"])
 async def root():
     """Endpoint root untuk mengecek status API."""
     return {"message": f"Selamat datang di {settings.PROJECT_NAME} v{settings.PROJECT_VERSION}. Kunjungi /docs untuk dokumentasi API."}
 
+@app.get("/ready", summary="Readiness", tags=["Root"])
+async def ready():
+    """200 jika model ML sudah dimuat dan dipanaskan, 503 selama masih warmup."""
+    from app.services.ml_model import is_model_warm
+    if is_model_warm():
+        return {"status": "ready"}
+    return JSONResponse(status_code=503, content={"status": "warming_up"})
+
 # ----------------- EKSEKUSI LANGSUNG -----------------
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,240 @@
+"""
+Re-score the rows of the `history` table with the current
+models/indobert_model.tflite and write the new prob_hoax, prob_fakta,
+predicted_label and final_label_threshold back.
+
+    PG_DB=... PG_USER=... PG_PASSWORD=... PG_HOST=... PG_PORT=... \
+        python scripts/rescore_history.py --workers 8
+    python scripts/rescore_history.py --dry-run rescored.jsonl --limit 1000
+
+Rows are streamed in history_id order from a server-side cursor, scored in
+batches by a process pool (one TFLite interpreter per process) and written
+back with one UPDATE ... FROM (VALUES ...) per batch. After every committed
+batch the last history_id is stored in the checkpoint file, so an
+interrupted run continues where it stopped; delete the file (or pass
+--restart) to start over. inference_time_ms is left untouched: it records
+the latency of the original request.
+
+Rows whose text is empty after preprocessing are skipped. Any other
+scoring error (model not loaded, inference failure) stops the run before
+that batch is written or checkpointed, and the script exits with status 1,
+so a resumed run retries those rows.
+
+--dry-run writes one JSON line per row (old and new scores) to the given
+file instead of updating the database and does not touch the checkpoint.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, PROJECT_DIR)
+
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+from dotenv import load_dotenv
+from app.services.ml_model import EMPTY_TEXT_MESSAGE
+
+load_dotenv()
+
+logger = logging.getLogger("rescore_history")
+
+# Bandingkan dengan tipe asli (uuid) agar tiap batch memakai index primary key
+UPDATE_SQL = """
+    UPDATE history AS h
+    SET prob_hoax = v.prob_hoax,
+        prob_fakta = v.prob_fakta,
+        predicted_label = v.predicted_label,
+        final_label_threshold = v.final_label_threshold
+    FROM (VALUES %s) AS v(history_id, prob_hoax, prob_fakta, predicted_label, final_label_threshold)
+    WHERE h.history_id = v.history_id::uuid
+"""
+
+
+class ScoringError(Exception):
+    """Batch gagal diskor karena alasan selain teks kosong; checkpoint tidak dimajukan."""
+
+
+def connect_db():
+    return psycopg2.connect(
+        dbname=os.getenv("PG_DB"),
+        user=os.getenv("PG_USER"),
+        password=os.getenv("PG_PASSWORD"),
+        host=os.getenv("PG_HOST"),
+        port=os.getenv("PG_PORT"),
+        cursor_factory=RealDictCursor
+    )
+
+
+def _init_worker(tflite_threads: int):
+    # Satu interpreter per proses; thread TFLite dibatasi agar N proses tidak saling berebut core
+    logging.getLogger("app.services.ml_model").setLevel(logging.WARNING)
+    from app.services import ml_model
+    ml_model.load_tokenizer()
+    ml_model.load_interpreter(num_threads=tflite_threads)
+
+
+def _score(texts: list[str]) -> list[dict]:
+    from app.services.ml_model import predict_batch
+    return predict_batch(texts)
+
+
+def read_checkpoint(path: str) -> str | None:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["last_history_id"]
+
+
+def write_checkpoint(path: str, last_history_id: str, rows_done: int):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"last_history_id": last_history_id, "rows_done": rows_done}, f)
+    os.replace(tmp_path, path)
+
+
+def stream_batches(conn, source: str, after: str | None, batch_size: int, limit: int | None):
+    """Baris history berurutan history_id, dikelompokkan per batch_size, lewat named cursor."""
+    # Urutkan dan bandingkan kolom tabel (uuid), bukan alias teks di SELECT, agar cursor
+    # berjalan mengikuti index primary key dan resume keyset tidak mengurutkan ulang tabel
+    query = f"""
+        SELECT h.history_id::text AS history_id, h.{source} AS text,
+               h.prob_hoax, h.prob_fakta, h.predicted_label, h.final_label_threshold
+        FROM history AS h
+        WHERE h.{source} IS NOT NULL AND h.{source} <> ''
+          AND (%s::uuid IS NULL OR h.history_id > %s::uuid)
+        ORDER BY h.history_id
+    """
+    params = [after, after]
+    if limit:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    with conn.cursor(name="rescore_history") as cursor:
+        cursor.itersize = batch_size * 8
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=["processed_text", "original_input"], default="processed_text",
+                        help="kolom teks yang diskor ulang (processed_text = teks yang dulu masuk model)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--tflite-threads", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--checkpoint", default="rescore_history.checkpoint.json")
+    parser.add_argument("--restart", action="store_true", help="abaikan checkpoint yang ada")
+    parser.add_argument("--dry-run", metavar="OUTPUT_JSONL", default=None)
+    parser.add_argument("--report-every", type=float, default=10.0, help="detik di antara laporan throughput")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    after = None if (args.restart or args.dry_run) else read_checkpoint(args.checkpoint)
+    if after:
+        logger.info("Melanjutkan dari checkpoint: history_id > %s", after)
+
+    read_conn = connect_db()
+    write_conn = None if args.dry_run else connect_db()
+    output = open(args.dry_run, "w") if args.dry_run else None
+
+    rows_done = rows_updated = rows_skipped = 0
+    started = last_report = time.perf_counter()
+
+    def flush(rows, results):
+        nonlocal rows_done, rows_updated, rows_skipped
+        failed = [
+            (row["history_id"], result["message"]) for row, result in zip(rows, results)
+            if result["status"] != "success" and result["message"] != EMPTY_TEXT_MESSAGE
+        ]
+        if failed:
+            raise ScoringError(
+                f"{len(failed)} dari {len(rows)} baris gagal diskor, mis. history_id {failed[0][0]}: {failed[0][1]}"
+            )
+
+        values = []
+        for row, result in zip(rows, results):
+            if result["status"] != "success":
+                rows_skipped += 1
+                continue
+            values.append((
+                row["history_id"], result["probabilities"]["HOAKS"], result["probabilities"]["FAKTA"],
+                result["predicted_label_model"], result["final_label_thresholded"],
+            ))
+            if output:
+                output.write(json.dumps({
+                    "history_id": row["history_id"],
+                    "old": {key: row[key] for key in ("prob_hoax", "prob_fakta", "predicted_label", "final_label_threshold")},
+                    "new": dict(zip(("prob_hoax", "prob_fakta", "predicted_label", "final_label_threshold"), values[-1][1:])),
+                }, default=str) + "\n")
+
+        if write_conn and values:
+            with write_conn.cursor() as cursor:
+                execute_values(cursor, UPDATE_SQL, values, page_size=len(values))
+            write_conn.commit()
+        rows_done += len(rows)
+        rows_updated += len(values)
+        if write_conn:
+            write_checkpoint(args.checkpoint, rows[-1]["history_id"], rows_done)
+
+    error = None
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(args.tflite_threads,)) as pool:
+            # Batch diproses paralel tetapi ditulis berurutan, sehingga checkpoint selalu
+            # berarti "semua baris sampai history_id ini sudah diperbarui"
+            pending = deque()
+            try:
+                for rows in stream_batches(read_conn, args.source, after, args.batch_size, args.limit):
+                    pending.append((rows, pool.submit(_score, [row["text"] for row in rows])))
+                    while len(pending) > args.workers * 2 or (pending and pending[0][1].done()):
+                        batch_rows, future = pending.popleft()
+                        flush(batch_rows, future.result())
+
+                    now = time.perf_counter()
+                    if now - last_report >= args.report_every:
+                        logger.info("%s baris diproses, %.1f baris/detik", rows_done, rows_done / (now - started))
+                        last_report = now
+
+                while pending:
+                    rows, future = pending.popleft()
+                    flush(rows, future.result())
+            except ScoringError as e:
+                error = e
+                # Batch berikutnya tidak akan ditulis; jangan tunggu skornya
+                for _, future in pending:
+                    future.cancel()
+    finally:
+        read_conn.close()
+        if write_conn:
+            write_conn.close()
+        if output:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "rows": rows_done,
+        "updated": 0 if args.dry_run else rows_updated,
+        "skipped": rows_skipped,
+        "elapsed_s": round(elapsed, 1),
+        "rows_per_s": round(rows_done / elapsed, 1) if elapsed else None,
+        "dry_run": args.dry_run,
+        "error": str(error) if error else None,
+    }))
+    if error:
+        logger.error("Rescore dihentikan, checkpoint tetap di batch terakhir yang berhasil: %s", error)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Vendor the files the service would otherwise download at startup, so a
+container never touches the network while booting:
+
+  - the IndoBERT tokenizer into models/tokenizer (loaded by app/services/ml_model.py)
+  - the NLTK punkt_tab and stopwords corpora into nltk_data/ (set NLTK_DATA to it)
+
+    python scripts/vendor_assets.py
+
+Run at image build time (see Dockerfile); rerun it after changing
+INDOBERT_TOKENIZER_NAME.
+"""
+import os
+import sys
+import argparse
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, PROJECT_DIR)
+
+NLTK_PACKAGES = ["punkt_tab", "stopwords"]
+
+
+def vendor_tokenizer(output_dir: str):
+    from transformers import BertTokenizer
+    from app.services.ml_model import INDOBERT_TOKENIZER_NAME
+
+    tokenizer = BertTokenizer.from_pretrained(INDOBERT_TOKENIZER_NAME)
+    tokenizer.save_pretrained(output_dir)
+    print(f"Tokenizer {INDOBERT_TOKENIZER_NAME} disimpan ke {output_dir}")
+
+
+def vendor_nltk(output_dir: str):
+    import nltk
+
+    for package in NLTK_PACKAGES:
+        if not nltk.download(package, download_dir=output_dir, quiet=True, raise_on_error=True):
+            raise SystemExit(f"Gagal mengunduh data NLTK: {package}")
+    print(f"Data NLTK {', '.join(NLTK_PACKAGES)} disimpan ke {output_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokenizer-dir", default=os.path.join(PROJECT_DIR, "models", "tokenizer"))
+    parser.add_argument("--nltk-dir", default=os.path.join(PROJECT_DIR, "nltk_data"))
+    args = parser.parse_args()
+
+    vendor_tokenizer(args.tokenizer_dir)
+    vendor_nltk(args.nltk_dir)
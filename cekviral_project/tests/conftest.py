@@ -0,0 +1,13 @@
+# cekviral_project/tests/conftest.py
+# Test layanan utama. Jalankan dari folder cekviral_project:
+#
+#     python -m pytest tests
+#
+# Settings butuh SUPABASE_URL dan SUPABASE_KEY; nilai dummy dipakai jika belum diatur.
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test.test.test")
@@ -0,0 +1,105 @@
+# cekviral_project/tests/test_url_classifier.py
+import json
+from urllib.parse import urlparse
+
+import pytest
+
+from app.utils.helpers import URL_PATTERNS_FILE, classify_url, classify_url_detailed
+
+# (url, kategori, canonical_id): minimal satu URL untuk setiap host di setiap aturan url_patterns.json
+CASES = [
+    # YouTube
+    ("https://youtube.com/watch?v=dQw4w9WgXcQ", "direct_video", "youtube:dQw4w9WgXcQ"),
+    ("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42s", "direct_video", "youtube:dQw4w9WgXcQ"),
+    ("https://m.youtube.com/watch?v=dQw4w9WgXcQ", "direct_video", "youtube:dQw4w9WgXcQ"),
+    ("https://www.youtube.com/embed/dQw4w9WgXcQ", "direct_video", "youtube:dQw4w9WgXcQ"),
+    ("https://www.youtube.com/shorts/aBc_12-xYz0", "direct_video", "youtube:aBc_12-xYz0"),
+    ("https://www.youtube.com/live/Live123", "direct_video", "youtube:Live123"),
+    ("https://www.youtube.com/watch?v=", "direct_video", None),
+    ("https://youtu.be/dQw4w9WgXcQ?si=abc", "direct_video", "youtube:dQw4w9WgXcQ"),
+    ("https://youtube.com/post/UgkxAbc", "unsupported_social", None),
+    ("https://www.youtube.com/post/UgkxAbc", "unsupported_social", None),
+    ("https://m.youtube.com/post/UgkxAbc", "unsupported_social", None),
+    # TikTok
+    ("https://tiktok.com/@user.name/video/7212345678901234567", "direct_video", "tiktok:7212345678901234567"),
+    ("https://www.tiktok.com/@user/video/7212345678901234567?lang=id", "direct_video", "tiktok:7212345678901234567"),
+    ("https://m.tiktok.com/@user/video/7212345678901234567", "direct_video", "tiktok:7212345678901234567"),
+    # Instagram
+    ("https://instagram.com/reel/Cx1_abc-2", "direct_video", "instagram:Cx1_abc-2"),
+    ("https://www.instagram.com/reels/Cx1abc2/", "direct_video", "instagram:Cx1abc2"),
+    ("https://www.instagram.com/tv/Cx1abc2", "direct_video", "instagram:Cx1abc2"),
+    ("https://instagram.com/p/Cx1abc2/", "unsupported_social", None),
+    ("https://www.instagram.com/p/Cx1abc2/", "unsupported_social", None),
+    ("https://m.instagram.com/p/Cx1abc2/", "unsupported_social", None),
+    # Twitter / X
+    ("https://twitter.com/user/status/1712345678901234567", "direct_video", "twitter:1712345678901234567"),
+    ("https://www.twitter.com/user/status/1712345678901234567", "direct_video", "twitter:1712345678901234567"),
+    ("https://x.com/user/status/1712345678901234567?s=20", "direct_video", "twitter:1712345678901234567"),
+    ("https://www.x.com/user/status/1712345678901234567", "direct_video", "twitter:1712345678901234567"),
+    # Dailymotion
+    ("https://dailymotion.com/video/x8abc12", "direct_video", "dailymotion:x8abc12"),
+    ("https://www.dailymotion.com/video/x8abc12", "direct_video", "dailymotion:x8abc12"),
+    # Vimeo
+    ("https://vimeo.com/123456789", "direct_video", "vimeo:123456789"),
+    ("https://www.vimeo.com/123456789", "direct_video", "vimeo:123456789"),
+    # Facebook
+    ("https://facebook.com/page.name/videos/1234567890", "direct_video", "facebook:1234567890"),
+    ("https://www.facebook.com/watch/?v=1234567890", "direct_video", "facebook:1234567890"),
+    ("https://m.facebook.com/video.php?v=1234567890", "direct_video", "facebook:1234567890"),
+    ("https://fb.watch/aBc-12_x/", "direct_video", "facebook:aBc-12_x"),
+    ("https://facebook.com/story.php?story_fbid=1", "unsupported_social", None),
+    ("https://www.facebook.com/photo/?fbid=1", "unsupported_social", None),
+    ("https://m.facebook.com/story.php?story_fbid=1", "unsupported_social", None),
+    # Akademik
+    ("https://doi.org/10.1000/xyz123", "academic", None),
+    ("https://arxiv.org/abs/2101.00001", "academic", None),
+    ("https://www.sciencedirect.com/science/article/pii/S0000", "academic", None),
+    ("https://ejournal.example.ac.id/index.php/jurnal/article/view/1", "academic", None),
+    # Artikel web
+    ("https://www.kompas.com/tren/read/2024/01/01/berita", "web_article", None),
+    ("https://www.youtube.com/about", "web_article", None),
+    ("https://www.facebook.com/groups/123", "web_article", None),
+    # Hanya https:// yang dicek terhadap pola platform
+    ("http://www.youtube.com/watch?v=dQw4w9WgXcQ", "web_article", None),
+    # Host mirip platform tidak ikut cocok
+    ("https://notyoutube.com/watch?v=dQw4w9WgXcQ", "web_article", None),
+]
+
+
+@pytest.mark.parametrize("url,category,canonical_id", CASES)
+def test_classify_url(url, category, canonical_id):
+    result = classify_url_detailed(url)
+    assert result.category == category
+    assert result.canonical_id == canonical_id
+    assert classify_url(url) == category
+
+
+@pytest.mark.parametrize("url", ["", None, 42])
+def test_invalid_input_is_unknown(url):
+    assert classify_url(url) == "unknown"
+    assert classify_url_detailed(url).category == "unknown"
+
+
+def test_same_video_has_same_canonical_id():
+    urls = [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://m.youtube.com/shorts/dQw4w9WgXcQ",
+    ]
+    assert {classify_url_detailed(url).canonical_id for url in urls} == {"youtube:dQw4w9WgXcQ"}
+
+
+def test_every_rule_and_host_is_covered():
+    with open(URL_PATTERNS_FILE, encoding="utf-8") as f:
+        rules = json.load(f)["rules"]
+    covered = set()
+    for url, _, _ in CASES:
+        result = classify_url_detailed(url)
+        covered.add((result.category, result.platform, urlparse(url).hostname))
+
+    missing = [
+        (rule["category"], rule["platform"], host)
+        for rule in rules for host in rule["hosts"]
+        if (rule["category"], rule["platform"], host) not in covered
+    ]
+    assert not missing
@@ -1,34 +1,162 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from models.schemas import RagRequest, User
 from core.auth import get_current_user
-from core.database import get_db
+from core.database import connect_db, get_db
 from core.embedding import embed_query
+from core.read_cache import recommendations_cache, cached_json_response
 from core.rag_utils import (    
+    build_rag_context,
+    search_docs,
     search_docs_for_rag,
     search_docs_for_rekomendasi,
     generate_answer,
     get_latest_recommendations_for_user,
+    save_history_embedding,
+    save_recommendations,
+    stream_answer_events,
 )
 
 router = APIRouter()
 
 
+def _retrieve_rag_context(conn, input: RagRequest, current_user: User):
+    query_vec = embed_query(input.processed_text)
+    if input.history_id:
+        save_history_embedding(conn, input.history_id, current_user.id, query_vec)
+    docs = search_docs_for_rag(conn, query_vec, top_k=5)
+    return build_rag_context(docs, input.processed_text, input.final_label_threshold)
+
+
 @router.post("/inference/rag")
-def generate_teks(
+async def generate_teks(
     input: RagRequest,
     conn=Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     try:
-        query_vec = embed_query(input.processed_text)
-        docs = search_docs_for_rag(conn, query_vec, top_k=5)
-        context = "\n\n".join([f"[{status}] {title}\n{desc}" for status, title, desc in docs])
-        answer = generate_answer(context, input.processed_text, input.final_label_threshold)
+        context, doc_ids, _ = await asyncio.to_thread(_retrieve_rag_context, conn, input, current_user)
+        answer = await generate_answer(context, input.processed_text, input.final_label_threshold, doc_ids)
         return {"jawaban": answer}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/inference/rag/stream")
+async def generate_teks_stream(
+    input: RagRequest,
+    conn=Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Same as /inference/rag, but the explanation is streamed as server-sent
+    events (`token`, then `done` or `error`) while the LLM generates it.
+    """
+    try:
+        # Retrieval selesai sebelum streaming dimulai, koneksi DB tidak dipakai di dalam stream
+        context, doc_ids, prompt_stats = await asyncio.to_thread(_retrieve_rag_context, conn, input, current_user)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        stream_answer_events(context, input.processed_text, input.final_label_threshold, doc_ids, prompt_stats),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _recommendation_items(recom_ids: list, docs: list) -> list:
+    return [
+        {
+            "recom_id": recom_id,
+            "title": doc["title"],
+            "link": doc["link"],
+            "imageurl": doc["imageurl"],
+        }
+        for recom_id, doc in zip(recom_ids, docs)
+    ]
+
+
+def _load_history_and_docs(conn, history_id: str, user_id: str):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT processed_text, final_label_threshold, embedding
+        FROM history
+        WHERE history_id = %s AND user_id = %s
+        """,
+        (history_id, user_id),
+    )
+    row = cursor.fetchone()
+    cursor.close()
+    if not row:
+        return None, []
+
+    query_vec = row["embedding"]
+    if query_vec is None:
+        query_vec = embed_query(row["processed_text"])
+        save_history_embedding(conn, history_id, user_id, query_vec)
+    # Satu pencarian vektor dipakai bersama: 5 teratas untuk konteks RAG, 8 untuk rekomendasi
+    return row, search_docs(conn, query_vec, top_k=8)
+
+
+def _save_recommendations_on_new_conn(history_id: str, user_id: str, docs: list) -> list:
+    # Dijalankan di dalam stream, koneksi dari Depends(get_db) tidak dipakai di sini
+    conn = connect_db()
+    try:
+        recom_ids = save_recommendations(conn, history_id, [doc["news_id"] for doc in docs])
+        conn.commit()
+    finally:
+        conn.close()
+    recommendations_cache.invalidate(user_id)
+    return _recommendation_items(recom_ids, docs)
+
+
+async def _explain_parts(history_id: str, user_id: str, question: str, label_threshold: str, docs: list):
+    async def recommendations():
+        items = await asyncio.to_thread(_save_recommendations_on_new_conn, history_id, user_id, docs)
+        return {"part": "recommendations", "rekomendasi": items}
+
+    async def explanation():
+        context, doc_ids, prompt_stats = build_rag_context(docs[:5], question, label_threshold)
+        answer = await generate_answer(context, question, label_threshold, doc_ids)
+        return {"part": "explanation", "jawaban": answer, **prompt_stats}
+
+    for next_part in asyncio.as_completed([recommendations(), explanation()]):
+        try:
+            part = await next_part
+        except Exception as e:
+            part = {"part": "error", "detail": str(e)}
+        yield json.dumps(part, default=str) + "\n"
+
+
+@router.post("/inference/{history_id}/explain")
+async def explain_history(
+    history_id: str,
+    conn=Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Fused RAG explanation + recommendations for a saved verification: one
+    embedding (reused from the history row when stored) and one vector search
+    feed both. Parts are streamed as NDJSON (`recommendations`, `explanation`)
+    in the order they finish.
+    """
+    try:
+        row, docs = await asyncio.to_thread(_load_history_and_docs, conn, history_id, current_user.id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="History not found")
+
+    return StreamingResponse(
+        _explain_parts(history_id, current_user.id, row["processed_text"], row["final_label_threshold"], docs),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.post("/inference/{history_id}/recommendations")
 def create_recommendations(
     history_id: str,
@@ -38,7 +166,7 @@ def create_recommendations(
     try:
         cursor = conn.cursor()
         cursor.execute(
-            "SELECT processed_text FROM history WHERE history_id = %s AND user_id = %s",
+            "SELECT processed_text, embedding FROM history WHERE history_id = %s AND user_id = %s",
             (history_id, current_user.id),
         )
         row = cursor.fetchone()
@@ -46,29 +174,19 @@ def create_recommendations(
             cursor.close()
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="History not found")
 
-        processed_teks = row["processed_text"]
-        query_vec = embed_query(processed_teks)
+        # Pakai embedding yang sudah disimpan saat /inference/rag; baris lama tanpa
+        # embedding di-embed sekali lalu disimpan, seperti _load_history_and_docs
+        query_vec = row["embedding"]
+        if query_vec is None:
+            query_vec = embed_query(row["processed_text"])
+            save_history_embedding(conn, history_id, current_user.id, query_vec)
         docs = search_docs_for_rekomendasi(conn, query_vec, top_k=8)
 
-        recommendations = []
-        for news_id, title, link, imageurl in docs:
-            cursor.execute(
-                """
-                INSERT INTO recommendations (history_id, news_id, created_at)
-                VALUES (%s, %s, now())
-                RETURNING recom_id
-                """,
-                (history_id, news_id),
-            )
-            recom_id = cursor.fetchone()[0]
-            recommendations.append({
-                "recom_id": recom_id,
-                "title": title,
-                "link": link,
-                "imageurl": imageurl,
-            })
+        recom_ids = save_recommendations(conn, history_id, [doc["news_id"] for doc in docs])
+        recommendations = _recommendation_items(recom_ids, docs)
         conn.commit()
         cursor.close()
+        recommendations_cache.invalidate(current_user.id)
         return {"rekomendasi": recommendations}
     except HTTPException:
         raise
@@ -78,20 +196,16 @@ def create_recommendations(
 
 @router.get("/users/me/recommendations")
 def ambil_rekomendasi(
+    request: Request,
     conn=Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    def load():
+        # Baris sudah berupa dict (recom_id, title, link, imageurl), langsung diserialisasi
+        rekomendasi = get_latest_recommendations_for_user(conn, current_user.id)
+        return {"rekomendasi": rekomendasi}, {}
+
     try:
-        rekom_data = get_latest_recommendations_for_user(conn, current_user.id)
-        rekomendasi = [
-            {
-                "recom_id": recom_id,
-                "title": title,
-                "link": link,
-                "imageurl": imageurl
-            }
-            for recom_id, title, link, imageurl in rekom_data
-        ]
-        return {"rekomendasi": rekomendasi}
+        return cached_json_response(request, recommendations_cache, current_user.id, "latest", load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -5,5 +5,10 @@ import os
 load_dotenv()
 
 API_KEY = os.getenv("api_key")
-genai.configure(api_key=API_KEY)
-model = genai.GenerativeModel(model_name="models/gemini-1.5-flash-latest")
\ No newline at end of file
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "models/gemini-1.5-flash-latest")
+
+
+def get_gemini_model():
+    # Dikonfigurasi saat provider Gemini pertama kali dipakai, bukan saat import
+    genai.configure(api_key=API_KEY)
+    return genai.GenerativeModel(model_name=GEMINI_MODEL_NAME)
\ No newline at end of file
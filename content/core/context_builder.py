@@ -0,0 +1,88 @@
+import os
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+RAG_DOC_TOKEN_BUDGET = int(os.getenv("RAG_DOC_TOKEN_BUDGET", "250"))
+RAG_CONTEXT_TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKEN_BUDGET", "1000"))
+RAG_DEDUP_THRESHOLD = float(os.getenv("RAG_DEDUP_THRESHOLD", "0.7"))
+
+# Tokenizer lokal: kata dan tanda baca terpisah, cukup dekat dengan jumlah token LLM
+# untuk keperluan anggaran tanpa memanggil API.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SHINGLE_SIZE = 3
+
+
+def count_tokens(text: str) -> int:
+    return sum(1 for _ in _TOKEN_RE.finditer(text))
+
+
+def trim_to_tokens(text: str, budget: int) -> str:
+    """Cut `text` after its first `budget` tokens."""
+    if budget <= 0:
+        return ""
+    for i, match in enumerate(_TOKEN_RE.finditer(text), start=1):
+        if i == budget:
+            rest = text[match.end():]
+            return text[:match.end()] + (" ..." if rest.strip() else "")
+    return text
+
+
+def _shingles(text: str) -> set:
+    words = [w.lower() for w in re.findall(r"\w+", text)]
+    if len(words) < _SHINGLE_SIZE:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + _SHINGLE_SIZE]) for i in range(len(words) - _SHINGLE_SIZE + 1)}
+
+
+def _similarity(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _format_doc(doc: dict, description: str) -> str:
+    return f"[{doc['status']}] {doc['title']}\n{description}"
+
+
+def build_context(
+    docs: list,
+    doc_budget: int = RAG_DOC_TOKEN_BUDGET,
+    total_budget: int = RAG_CONTEXT_TOKEN_BUDGET,
+    dedup_threshold: float = RAG_DEDUP_THRESHOLD,
+):
+    """
+    Build the RAG context from retrieved news rows, most relevant first.
+
+    Rows whose title+description are near-duplicates (word-shingle Jaccard at
+    or above `dedup_threshold`) of a more relevant row are dropped, each
+    description is trimmed to `doc_budget` tokens, and rows stop being added
+    once `total_budget` is spent. Returns `(context, used_docs, stats)`.
+    """
+    kept, kept_shingles = [], []
+    for doc in docs:
+        shingles = _shingles(f"{doc['title']} {doc['description']}")
+        if any(_similarity(shingles, other) >= dedup_threshold for other in kept_shingles):
+            continue
+        kept.append(doc)
+        kept_shingles.append(shingles)
+
+    parts, used, spent = [], [], 0
+    for doc in kept:
+        part = _format_doc(doc, trim_to_tokens(doc["description"] or "", doc_budget))
+        tokens = count_tokens(part)
+        if used and spent + tokens > total_budget:
+            break
+        parts.append(part)
+        used.append(doc)
+        spent += tokens
+
+    full_tokens = sum(count_tokens(_format_doc(doc, doc["description"] or "")) for doc in docs)
+    stats = {
+        "docs_retrieved": len(docs),
+        "docs_used": len(used),
+        "context_tokens": spent,
+        "context_tokens_full": full_tokens,
+    }
+    return "\n\n".join(parts), used, stats
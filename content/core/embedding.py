@@ -1,8 +1,210 @@
-from sentence_transformers import SentenceTransformer
+import os
+import json
+import time
+import queue
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+import numpy as np
+from core.metrics import MODEL_INVOKE_LATENCY, register_caches
 
-embed_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+EMBED_MODEL_NAME = os.getenv("EMBED_MODEL_NAME", "paraphrase-multilingual-MiniLM-L12-v2")
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")
+EMBED_ONNX_DIR = os.getenv("EMBED_ONNX_DIR", "models/embedding-onnx-int8")
+EMBED_MAX_SEQ_LENGTH = 128
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "2048"))
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS", "5"))
+
+
+class TorchEmbeddingBackend:
+    """The reference SentenceTransformer model on PyTorch."""
+
+    def __init__(self, model_name: str = EMBED_MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: list[str], batch_size: int):
+        return self.model.encode(texts, batch_size=batch_size)
+
+
+def load_onnx_tokenizer(model_dir: str):
+    """
+    Tokenizer dari export ONNX dengan truncation dan padding seperti SentenceTransformer.
+    Token padding diambil dari tokenizer itu sendiri (padding di tokenizer.json, atau
+    pad_token dari special_tokens_map.json / tokenizer_config.json hasil save_pretrained),
+    bukan pad_id=0 bawaan `tokenizers`: pada model ini id 0 adalah <s>, bukan <pad>.
+    """
+    from tokenizers import Tokenizer
+
+    tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+    tokenizer.enable_truncation(max_length=EMBED_MAX_SEQ_LENGTH)
+    pad_token = tokenizer.padding["pad_token"] if tokenizer.padding else None
+    for name in ("special_tokens_map.json", "tokenizer_config.json"):
+        path = os.path.join(model_dir, name)
+        if pad_token is None and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                token = json.load(f).get("pad_token")
+            pad_token = token.get("content") if isinstance(token, dict) else token
+    if pad_token is None or tokenizer.token_to_id(pad_token) is None:
+        raise ValueError(f"Token padding tidak ditemukan di tokenizer {model_dir}")
+    tokenizer.enable_padding(pad_id=tokenizer.token_to_id(pad_token), pad_token=pad_token)
+    return tokenizer
+
+
+class OnnxEmbeddingBackend:
+    """
+    int8-quantized ONNX export of the same model (see scripts/export_onnx_embedding.py),
+    run on onnxruntime's CPU provider with the same mean pooling as SentenceTransformer.
+    """
+
+    def __init__(self, model_dir: str = EMBED_ONNX_DIR):
+        import onnxruntime as ort
+
+        self.tokenizer = load_onnx_tokenizer(model_dir)
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, "model.onnx"), providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, texts: list[str], batch_size: int):
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+            token_embeddings = self.session.run(None, feeds)[0]
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            outputs.append(pooled.astype(np.float32))
+        return np.vstack(outputs)
+
+
+EMBEDDING_BACKENDS = {
+    "torch": TorchEmbeddingBackend,
+    "onnx-int8": OnnxEmbeddingBackend,
+}
+
+
+def load_backend(name: str = EMBED_BACKEND):
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(f"EMBED_BACKEND tidak dikenal: {name!r} (pilihan: {', '.join(EMBEDDING_BACKENDS)})")
+    return EMBEDDING_BACKENDS[name]()
+
+
+class EmbeddingService:
+    """
+    Wraps the embedding backend with an LRU cache keyed by text hash and a
+    micro-batcher: concurrent `embed` calls that arrive within `batch_wait_ms`
+    of each other are encoded together in one `encode(list)`. The backend is
+    only loaded on the first cache miss.
+    """
+
+    def __init__(self, backend_factory, cache_size: int, batch_size: int, batch_wait_ms: float):
+        self.backend_factory = backend_factory
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000
+        self._backend = None
+        self._backend_lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = self.backend_factory()
+        return self._backend
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return vector
+
+    def _cache_put(self, key, vector):
+        vector.flags.writeable = False  # dibagikan antar request, jangan sampai diubah
+        with self._cache_lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def embed(self, text: str):
+        key = self._key(text)
+        vector = self._cache_get(key)
+        if vector is not None:
+            return vector
+
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((key, text, future))
+        return future.result()
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Teks yang sama dalam satu batch cukup di-encode sekali
+            unique = {}
+            for key, text, _ in batch:
+                unique.setdefault(key, text)
+            try:
+                with MODEL_INVOKE_LATENCY.labels("embedding").time():
+                    encoded = self.backend.encode(list(unique.values()), batch_size=self.batch_size)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            vectors = dict(zip(unique, encoded))
+            for key, vector in vectors.items():
+                self._cache_put(key, vector)
+            for key, _, future in batch:
+                future.set_result(vectors[key])
+
+
+embedding_service = EmbeddingService(load_backend, EMBED_CACHE_SIZE, EMBED_BATCH_SIZE, EMBED_BATCH_WAIT_MS)
+register_caches({"embedding": embedding_service})
 
 
 def embed_query(text: str):
-    vector = embed_model.encode(text)
-    return vector.tolist()
\ No newline at end of file
+    # float32 ndarray, dikirim apa adanya ke pgvector lewat adapter biner
+    return embedding_service.embed(text)
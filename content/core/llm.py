@@ -0,0 +1,221 @@
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import AsyncIterator
+from core.metrics import observe_external, register_caches
+
+logger = logging.getLogger(__name__)
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+FAKE_LLM_FIRST_TOKEN_MS = float(os.getenv("FAKE_LLM_FIRST_TOKEN_MS", "300"))
+FAKE_LLM_TOKEN_MS = float(os.getenv("FAKE_LLM_TOKEN_MS", "20"))
+LLM_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF_S = float(os.getenv("LLM_RETRY_BACKOFF_S", "0.5"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_CACHE_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", "3600"))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+
+
+class LLMClient:
+    """Async interface for the answer generator used by the RAG endpoints."""
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        raise NotImplementedError
+        yield
+
+    async def generate(self, prompt: str) -> str:
+        return "".join([chunk async for chunk in self.stream(prompt)])
+
+
+class GeminiClient(LLMClient):
+    def __init__(self, model):
+        self.model = model
+
+    async def generate(self, prompt: str) -> str:
+        with observe_external("gemini"):
+            response = await self.model.generate_content_async(prompt)
+            return response.text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        # Diukur sampai stream habis; stream yang dihentikan pemanggil tercatat sebagai error
+        with observe_external("gemini"):
+            response = await self.model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # chunk tanpa teks (mis. hanya metadata safety)
+                    continue
+                if text:
+                    yield text
+
+
+class FakeLLMClient(LLMClient):
+    """
+    Local stand-in that streams a canned explanation word by word with a
+    configurable first-token delay, for tests and offline load tests.
+    """
+
+    def __init__(self, first_token_ms: float = FAKE_LLM_FIRST_TOKEN_MS, token_ms: float = FAKE_LLM_TOKEN_MS):
+        self.first_token_delay = first_token_ms / 1000
+        self.token_delay = token_ms / 1000
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        answer = (
+            "Berdasarkan informasi relevan yang tersedia, konten ini memiliki kemiripan "
+            f"dengan {prompt.count('[')} berita yang sudah diverifikasi. "
+            "Penjelasan ini dihasilkan oleh backend LLM lokal untuk keperluan pengujian."
+        )
+        await asyncio.sleep(self.first_token_delay)
+        words = answer.split(" ")
+        for i, word in enumerate(words):
+            yield word if i == len(words) - 1 else word + " "
+            await asyncio.sleep(self.token_delay)
+
+
+class ResilientLLMClient(LLMClient):
+    """
+    Wraps another client with a per-call timeout, retries with exponential
+    backoff and a limit on concurrent generations. A stream is only retried
+    if it failed before producing its first chunk; for streams the timeout
+    applies to each chunk.
+    """
+
+    def __init__(self, inner: LLMClient, timeout: float, max_retries: int, backoff: float, max_concurrency: int):
+        self.inner = inner
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _wait_before_retry(self, attempt: int, error: Exception):
+        delay = self.backoff * (2 ** attempt)
+        logger.warning("Panggilan LLM gagal (percobaan %s): %r, coba lagi dalam %.1fs", attempt + 1, error, delay)
+        await asyncio.sleep(delay)
+
+    async def generate(self, prompt: str) -> str:
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return await asyncio.wait_for(self.inner.generate(prompt), self.timeout)
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        raise
+                    await self._wait_before_retry(attempt, e)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                started = False
+                chunks = self.inner.stream(prompt).__aiter__()
+                try:
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), self.timeout)
+                        except StopAsyncIteration:
+                            return
+                        started = True
+                        yield chunk
+                except Exception as e:
+                    if started or attempt == self.max_retries:
+                        raise
+                    await self._wait_before_retry(attempt, e)
+
+
+class ResponseCache:
+    """
+    TTL cache for generated answers, keyed on the question hash, the final
+    label and the IDs of the retrieved documents: the same question answered
+    from the same context gets the same explanation without another generation.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(question: str, label_threshold: str, doc_ids) -> str:
+        question_hash = hashlib.sha256(question.encode("utf-8")).hexdigest()
+        return f"{question_hash}:{label_threshold.upper()}:{','.join(map(str, doc_ids))}"
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: str):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def _gemini_client() -> GeminiClient:
+    from core.config import get_gemini_model
+    return GeminiClient(get_gemini_model())
+
+
+LLM_PROVIDERS = {
+    "gemini": _gemini_client,
+    "fake": FakeLLMClient,
+}
+
+_client: LLMClient | None = None
+response_cache = ResponseCache(LLM_CACHE_TTL_S, LLM_CACHE_SIZE)
+register_caches({"llm_response": response_cache})
+
+
+def get_llm_client() -> LLMClient:
+    global _client
+    if _client is None:
+        if LLM_BACKEND not in LLM_PROVIDERS:
+            raise ValueError(f"LLM_BACKEND tidak dikenal: {LLM_BACKEND!r} (pilihan: {', '.join(LLM_PROVIDERS)})")
+        _client = ResilientLLMClient(
+            LLM_PROVIDERS[LLM_BACKEND](),
+            timeout=LLM_TIMEOUT_S,
+            max_retries=LLM_MAX_RETRIES,
+            backoff=LLM_RETRY_BACKOFF_S,
+            max_concurrency=LLM_MAX_CONCURRENCY,
+        )
+    return _client
+
+
+class StreamTimer:
+    """Time-to-first-token and total latency of one streamed generation."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_token_at = None
+        self.end = None
+
+    def token(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    def finish(self):
+        self.end = time.perf_counter()
+        logger.info("LLM stream selesai: ttft=%.1fms total=%.1fms", self.ttft_ms, self.total_ms)
+
+    @property
+    def ttft_ms(self) -> float:
+        return ((self.first_token_at or self.end or time.perf_counter()) - self.start) * 1000
+
+    @property
+    def total_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
@@ -1,5 +1,11 @@
-from core.config import model
+import json
+import logging
+from core.context_builder import build_context, count_tokens
 from core.embedding import embed_query
+from core.llm import get_llm_client, response_cache, ResponseCache, StreamTimer
+from core.vector_index import news_index
+
+logger = logging.getLogger(__name__)
 
 
 def get_label_threshold(conn, history_id: str) -> str:
@@ -14,37 +20,90 @@ def get_label_threshold(conn, history_id: str) -> str:
     return row[0] if row else None
 
 
+def save_history_embedding(conn, history_id: str, user_id: str, query_vector):
+    cursor = conn.cursor()
+    cursor.execute(
+        "UPDATE history SET embedding = %b WHERE history_id = %s AND user_id = %s",
+        (query_vector, history_id, user_id),
+    )
+    conn.commit()
+    cursor.close()
+
+
 def search_docs_for_rag(conn, query_vector, top_k=5):
+    # Pakai index in-process jika aktif (RAG_VECTOR_INDEX_PATH), Postgres tetap jadi fallback
+    if news_index is not None and news_index.ready:
+        return news_index.search(query_vector, top_k)
+
     cursor = conn.cursor()
-    vector_str = "[" + ",".join(map(str, query_vector)) + "]"
     cursor.execute(
         """
-        SELECT status, title, description 
+        SELECT news_id, status, title, description
         FROM news
-        ORDER BY vector <#> %s::vector
+        ORDER BY vector <#> %b
         LIMIT %s;
         """,
-        (vector_str, top_k),
+        (query_vector, top_k),
     )
     results = cursor.fetchall()
     cursor.close()
     return results
 
 
+def search_docs(conn, query_vector, top_k=8):
+    """
+    Satu pencarian untuk RAG dan rekomendasi sekaligus: baris news lengkap
+    (news_id, status, title, description, link, imageurl), urut relevansi.
+    """
+    if news_index is not None and news_index.ready:
+        return news_index.search(query_vector, top_k)
+
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT news_id, status, title, description, link, imageurl
+        FROM news
+        ORDER BY vector <#> %b
+        LIMIT %s
+    """, (query_vector, top_k))
+    results = cursor.fetchall()
+    cursor.close()
+    return results
+
+
 def search_docs_for_rekomendasi(conn, query_vector, top_k=8):
     cursor = conn.cursor()
-    vector_str = "[" + ",".join(map(str, query_vector)) + "]"
     cursor.execute("""
         SELECT news_id, title, link, imageurl
         FROM news
-        ORDER BY vector <#> %s::vector
+        ORDER BY vector <#> %b
         LIMIT %s
-    """, (vector_str, top_k))
+    """, (query_vector, top_k))
     results = cursor.fetchall()  # list of tuples (news_id, title, link, imageurl)
     cursor.close()
     return results
     
 
+def save_recommendations(conn, history_id: str, news_ids: list) -> list:
+    """
+    Simpan semua rekomendasi untuk satu history dalam satu statement dan
+    kembalikan recom_id sesuai urutan `news_ids`. Upsert pada (history_id, news_id)
+    membuat pemanggilan ulang idempoten.
+    """
+    if not news_ids:
+        return []
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO recommendations (history_id, news_id, created_at)
+        SELECT %s, news_id, now()
+        FROM unnest(%s) AS t(news_id)
+        ON CONFLICT (history_id, news_id) DO UPDATE SET created_at = EXCLUDED.created_at
+        RETURNING recom_id, news_id
+    """, (history_id, list(news_ids)))
+    recom_ids = {row["news_id"]: row["recom_id"] for row in cursor.fetchall()}
+    cursor.close()
+    return [recom_ids[news_id] for news_id in news_ids]
+
+
 def get_latest_recommendations_for_user(conn, user_id: str, limit: int = 8):
     """
     Mengambil hingga `limit` rekomendasi terbaru (recom_id, title, link, imageurl)
@@ -70,8 +129,8 @@ def get_latest_recommendations_for_user(conn, user_id: str, limit: int = 8):
     return results
 
 
-def generate_answer(context: str, question: str, label_threshold: str) -> str:
-    prompt = f"""
+def build_prompt(context: str, question: str, label_threshold: str) -> str:
+    return f"""
 Berikut adalah informasi relevan:
 {context}
 
@@ -79,12 +138,88 @@ Dan berikut adalah label akhir hasil prediksi:
 {label_threshold.upper()}
 
 Jadi Anda adalah seorang ahli yang diminta untuk menjelaskan apakah input dari user di bawah ini 
-adalah konten asli atau hoax berdasarkan informasi yang tertera pada {context} dan {label_threshold.upper()}:
+adalah konten asli atau hoax berdasarkan informasi relevan dan label akhir di atas:
 {question}
 """
+
+
+def build_rag_context(docs: list, question: str, label_threshold: str):
+    """
+    Deduplicate, trim and budget the retrieved rows into the prompt context.
+    Returns `(context, doc_ids, stats)`; `prompt_tokens_saved` is measured
+    against the old prompt, which held the full untrimmed context twice.
+    """
+    context, used, stats = build_context(docs)
+    prompt_tokens = count_tokens(build_prompt(context, question, label_threshold))
+    legacy_tokens = count_tokens(build_prompt("", question, label_threshold)) + 2 * stats["context_tokens_full"]
+    stats["prompt_tokens"] = prompt_tokens
+    stats["prompt_tokens_saved"] = max(legacy_tokens - prompt_tokens, 0)
+    logger.info(
+        "Konteks RAG: %s/%s dokumen, %s token prompt (%s token dihemat)",
+        stats["docs_used"], stats["docs_retrieved"], prompt_tokens, stats["prompt_tokens_saved"],
+    )
+    return context, [doc["news_id"] for doc in used], stats
+
+
+LLM_ERROR_MESSAGE = "Terjadi error saat memproses jawaban dari Gemini API."
+
+
+async def generate_answer(context: str, question: str, label_threshold: str, doc_ids=()) -> str:
+    cache_key = ResponseCache.key(question, label_threshold, doc_ids)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    prompt = build_prompt(context, question, label_threshold)
+    try:
+        answer = await get_llm_client().generate(prompt)
+    except Exception:
+        return LLM_ERROR_MESSAGE
+    response_cache.set(cache_key, answer)
+    return answer
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_answer_events(context: str, question: str, label_threshold: str, doc_ids=(), extra=None):
+    """
+    Server-sent events for a streamed answer: one `token` event per chunk from
+    the LLM, then a `done` event with the full answer, latency metrics and
+    `extra` (e.g. prompt statistics). A cached answer is sent as a single
+    `token` event.
+    """
+    extra = extra or {}
+    timer = StreamTimer()
+    cache_key = ResponseCache.key(question, label_threshold, doc_ids)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        timer.token()
+        yield _sse("token", {"text": cached})
+        timer.finish()
+        yield _sse("done", {"jawaban": cached, "ttft_ms": round(timer.ttft_ms, 1), "total_ms": round(timer.total_ms, 1), "cached": True, **extra})
+        return
+
+    prompt = build_prompt(context, question, label_threshold)
+    parts = []
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        async for chunk in get_llm_client().stream(prompt):
+            timer.token()
+            parts.append(chunk)
+            yield _sse("token", {"text": chunk})
     except Exception:
-        return "Terjadi error saat memproses jawaban dari Gemini API."
+        timer.finish()
+        yield _sse("error", {"detail": LLM_ERROR_MESSAGE})
+        return
 
+    timer.finish()
+    answer = "".join(parts)
+    response_cache.set(cache_key, answer)
+    yield _sse("done", {
+        "jawaban": answer,
+        "ttft_ms": round(timer.ttft_ms, 1),
+        "total_ms": round(timer.total_ms, 1),
+        "cached": False,
+        **extra,
+    })
@@ -0,0 +1,58 @@
+import struct
+import threading
+import numpy as np
+import psycopg
+from psycopg.adapt import Dumper, Loader
+from psycopg.pq import Format
+from psycopg.types import TypeInfo
+
+# Format biner pgvector: uint16 dimensi, uint16 cadangan, lalu float32 big-endian
+_HEADER = struct.Struct(">HH")
+
+_lock = threading.Lock()
+_registered = False
+
+
+class VectorBinaryDumper(Dumper):
+    """Send NumPy arrays to Postgres as binary `vector` parameters (no decimal text round-trip)."""
+
+    format = Format.BINARY
+
+    def dump(self, obj):
+        vec = np.asarray(obj, dtype=">f4")
+        return _HEADER.pack(vec.shape[0], 0) + vec.tobytes()
+
+
+class VectorLoader(Loader):
+    def load(self, data):
+        return np.fromstring(bytes(data)[1:-1].decode(), dtype=np.float32, sep=",")
+
+
+class VectorBinaryLoader(Loader):
+    format = Format.BINARY
+
+    def load(self, data):
+        dim, _ = _HEADER.unpack_from(data)
+        return np.frombuffer(data, dtype=">f4", count=dim, offset=_HEADER.size).astype(np.float32)
+
+
+def register_vector(conn):
+    """
+    Register the `vector` adapters. The type OID is looked up once per process
+    and installed on the global adapter map, so later connections skip the lookup.
+    """
+    global _registered
+    if _registered:
+        return
+    with _lock:
+        if _registered:
+            return
+        info = TypeInfo.fetch(conn, "vector")
+        if info is None:
+            raise RuntimeError("Tipe 'vector' tidak ditemukan, pastikan ekstensi pgvector aktif.")
+        dumper = type("VectorBinaryDumper", (VectorBinaryDumper,), {"oid": info.oid})
+        for adapters in (psycopg.adapters, conn.adapters):
+            adapters.register_dumper(np.ndarray, dumper)
+            adapters.register_loader(info.oid, VectorLoader)
+            adapters.register_loader(info.oid, VectorBinaryLoader)
+        _registered = True
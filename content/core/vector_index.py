@@ -0,0 +1,212 @@
+import os
+import logging
+import threading
+import numpy as np
+from core.database import connect_db
+from core.metrics import register_callback
+
+logger = logging.getLogger(__name__)
+
+VECTOR_INDEX_PATH = os.getenv("RAG_VECTOR_INDEX_PATH")
+VECTOR_INDEX_POLL_SECONDS = float(os.getenv("RAG_VECTOR_INDEX_POLL_SECONDS", "30"))
+SYNC_BATCH_SIZE = 1000
+NEWS_FIELDS = ("news_id", "status", "title", "description", "link", "imageurl")
+
+
+class NewsVectorIndex:
+    """
+    In-process copy of the `news` embeddings used by RAG retrieval.
+
+    Vectors present when the snapshot was written are memory-mapped read-only
+    from `<path>/vectors.npy`; rows added afterwards are pulled from Postgres by
+    `news_id` and kept in a small in-memory delta. Postgres stays the source of
+    truth, the snapshot only spares the startup scan. Rows deleted from `news`
+    after startup are dropped on the next restart.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.ready = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._base_ids = np.empty(0, dtype=np.int64)
+        self._base_vectors = None
+        self._base_alive = np.empty(0, dtype=bool)
+        self._delta_ids = np.empty(0, dtype=np.int64)
+        self._delta_vectors = None
+        self._rows = {}  # news_id -> baris news (NEWS_FIELDS)
+        self._last_news_id = 0
+
+    @property
+    def _ids_file(self):
+        return os.path.join(self.path, "ids.npy")
+
+    @property
+    def _vectors_file(self):
+        return os.path.join(self.path, "vectors.npy")
+
+    def __len__(self):
+        return len(self._rows)
+
+    def load(self, conn):
+        """
+        Map the snapshot (building it first if missing), fetch row metadata and
+        catch up with rows inserted since the snapshot was written.
+        """
+        if not os.path.exists(self._vectors_file):
+            logger.info("Snapshot vector index belum ada, membangun dari Postgres...")
+            self.sync(conn)
+            self.save_snapshot()
+
+        base_ids = np.load(self._ids_file)
+        base_vectors = np.load(self._vectors_file, mmap_mode="r")
+
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT {', '.join(NEWS_FIELDS)} FROM news WHERE news_id <= %s",
+            (int(base_ids.max()) if len(base_ids) else 0,),
+        )
+        rows = {row["news_id"]: {field: row[field] for field in NEWS_FIELDS} for row in cursor.fetchall()}
+        cursor.close()
+
+        with self._lock:
+            self._base_ids = base_ids
+            self._base_vectors = base_vectors
+            self._base_alive = np.fromiter((i in rows for i in base_ids.tolist()), dtype=bool, count=len(base_ids))
+            self._delta_ids = np.empty(0, dtype=np.int64)
+            self._delta_vectors = None
+            self._rows = rows
+            self._last_news_id = int(base_ids.max()) if len(base_ids) else 0
+
+        self.sync(conn)
+        self.ready = True
+        logger.info("Vector index siap dengan %s dokumen.", len(self))
+
+    def sync(self, conn) -> int:
+        """Pull rows with a `news_id` above the last one seen. Returns the number of new rows."""
+        added = 0
+        cursor = conn.cursor()
+        while True:
+            cursor.execute(
+                f"""
+                SELECT {', '.join(NEWS_FIELDS)}, vector
+                FROM news
+                WHERE news_id > %s
+                ORDER BY news_id
+                LIMIT %s
+                """,
+                (self._last_news_id, SYNC_BATCH_SIZE),
+            )
+            batch = cursor.fetchall()
+            if not batch:
+                break
+
+            ids = np.array([row["news_id"] for row in batch], dtype=np.int64)
+            vectors = np.vstack([row["vector"] for row in batch])
+            with self._lock:
+                if self._delta_vectors is None:
+                    self._delta_ids, self._delta_vectors = ids, vectors
+                else:
+                    self._delta_ids = np.concatenate([self._delta_ids, ids])
+                    self._delta_vectors = np.vstack([self._delta_vectors, vectors])
+                for row in batch:
+                    self._rows[row["news_id"]] = {field: row[field] for field in NEWS_FIELDS}
+                self._last_news_id = int(ids[-1])
+
+            added += len(batch)
+            if len(batch) < SYNC_BATCH_SIZE:
+                break
+        cursor.close()
+        return added
+
+    def save_snapshot(self):
+        """Write base + delta to disk so the next startup can map it directly."""
+        with self._lock:
+            ids = np.concatenate([self._base_ids[self._base_alive], self._delta_ids])
+            parts = []
+            if self._base_vectors is not None and len(self._base_ids):
+                parts.append(np.asarray(self._base_vectors)[self._base_alive])
+            if self._delta_vectors is not None:
+                parts.append(self._delta_vectors)
+        vectors = np.vstack(parts) if parts else np.empty((0, 0), dtype=np.float32)
+
+        os.makedirs(self.path, exist_ok=True)
+        for target, array in ((self._ids_file, ids), (self._vectors_file, vectors.astype(np.float32))):
+            tmp = target + ".tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp, target)
+        logger.info("Snapshot vector index ditulis ke %s (%s dokumen).", self.path, len(ids))
+
+    def search(self, query_vector, top_k: int = 5):
+        """
+        Return the `top_k` rows with the largest inner product, the same order as
+        `ORDER BY vector <#> query` in Postgres.
+        """
+        query = np.asarray(query_vector, dtype=np.float32)
+        with self._lock:
+            base_ids, base_vectors, base_alive = self._base_ids, self._base_vectors, self._base_alive
+            delta_ids, delta_vectors = self._delta_ids, self._delta_vectors
+            rows = self._rows
+
+        scores, ids = [], []
+        if base_vectors is not None and len(base_ids):
+            base_scores = base_vectors @ query
+            base_scores[~base_alive] = -np.inf
+            scores.append(base_scores)
+            ids.append(base_ids)
+        if delta_vectors is not None:
+            scores.append(delta_vectors @ query)
+            ids.append(delta_ids)
+        if not scores:
+            return []
+
+        scores = np.concatenate(scores)
+        ids = np.concatenate(ids)
+        k = min(top_k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [rows[int(i)] for i in ids[top]]
+
+    def start_polling(self, interval: float = VECTOR_INDEX_POLL_SECONDS):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._poll, args=(interval,), name="news-index-sync", daemon=True)
+        self._thread.start()
+
+    def stop_polling(self):
+        self._stop.set()
+
+    def _poll(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                conn = connect_db()
+                try:
+                    added = self.sync(conn)
+                finally:
+                    conn.close()
+                if added:
+                    logger.info("Vector index menambahkan %s dokumen baru.", added)
+            except Exception as e:
+                logger.error("Gagal sinkronisasi vector index: %s", e, exc_info=True)
+
+
+news_index = NewsVectorIndex(VECTOR_INDEX_PATH) if VECTOR_INDEX_PATH else None
+if news_index is not None:
+    register_callback("vector_index_size", "Vectors held by the in-process RAG index.", [], lambda: {(): len(news_index)})
+
+
+if __name__ == "__main__":
+    # Bangun ulang snapshot: python -m core.vector_index
+    if news_index is None:
+        raise SystemExit("RAG_VECTOR_INDEX_PATH belum diatur.")
+    conn = connect_db()
+    try:
+        news_index.sync(conn)
+        news_index.save_snapshot()
+    finally:
+        conn.close()
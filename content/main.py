@@ -2,6 +2,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from api.endpoints import router as api_router
+from core.database import connect_db
+from core.vector_index import news_index
+from core.read_cache import recommendations_cache_listener
+from core.metrics import install_metrics
 
 
 app = FastAPI()
@@ -14,6 +18,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+install_metrics(app)
+
+
+@app.on_event("startup")
+def load_vector_index():
+    # Opsional: index vektor in-process untuk RAG, aktif jika RAG_VECTOR_INDEX_PATH diatur
+    if news_index is None:
+        return
+    conn = connect_db()
+    try:
+        news_index.load(conn)
+    finally:
+        conn.close()
+    news_index.start_polling()
+
+
+@app.on_event("shutdown")
+def stop_vector_index():
+    if news_index is not None:
+        news_index.stop_polling()
+
+
+@app.on_event("startup")
+def start_read_cache():
+    recommendations_cache_listener.start()
+
+
+@app.on_event("shutdown")
+def stop_read_cache():
+    recommendations_cache_listener.stop()
+
 
 # Tambahkan endpoint untuk root "/"
 @app.get("/", response_class=HTMLResponse)
@@ -0,0 +1,3 @@
+-- Simpan vektor embedding processed_text di samping baris history,
+-- supaya /inference/{history_id}/recommendations tidak perlu embed ulang.
+ALTER TABLE history ADD COLUMN IF NOT EXISTS embedding vector(384);
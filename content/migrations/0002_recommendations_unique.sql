@@ -0,0 +1,10 @@
+-- Satu rekomendasi per (history_id, news_id), supaya hitung ulang rekomendasi
+-- untuk history yang sama bisa di-upsert dan retry tidak menumpuk baris duplikat.
+DELETE FROM recommendations a
+USING recommendations b
+WHERE a.history_id = b.history_id
+  AND a.news_id = b.news_id
+  AND a.ctid < b.ctid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS recommendations_history_news_key
+    ON recommendations (history_id, news_id);
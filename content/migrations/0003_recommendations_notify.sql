@@ -0,0 +1,23 @@
+-- Kirim NOTIFY history_changed (payload = user_id pemilik history) saat
+-- rekomendasi berubah, supaya read cache /users/me/recommendations ikut invalid.
+-- Perubahan pada tabel history sendiri dikirim oleh trigger di
+-- history/migrations/0004_history_notify.sql.
+CREATE OR REPLACE FUNCTION recommendations_notify_trigger() RETURNS trigger AS $$
+DECLARE
+    owner text;
+BEGIN
+    SELECT user_id::text INTO owner
+    FROM history
+    WHERE history_id = COALESCE(NEW.history_id, OLD.history_id);
+    IF owner IS NOT NULL THEN
+        PERFORM pg_notify('history_changed', owner);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS recommendations_notify ON recommendations;
+CREATE TRIGGER recommendations_notify
+    AFTER INSERT OR DELETE OR UPDATE
+    ON recommendations
+    FOR EACH ROW EXECUTE FUNCTION recommendations_notify_trigger();
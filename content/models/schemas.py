@@ -10,5 +10,6 @@ class User(BaseModel):
 class RagRequest(BaseModel):
     processed_text: str = Field(..., description="Preprocessed text to query RAG")
     final_label_threshold: str = Field(..., description="Threshold label from inference result")
+    history_id: str | None = Field(None, description="Optional history row to store the query embedding on")
 
 
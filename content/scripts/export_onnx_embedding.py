@@ -0,0 +1,96 @@
+"""
+Export the embedding model to an int8-quantized ONNX model for EMBED_BACKEND=onnx-int8.
+
+    pip install onnx onnxruntime
+    python scripts/export_onnx_embedding.py --output models/embedding-onnx-int8
+
+After exporting, the script embeds a set of sample sentences with both the
+PyTorch model and the quantized ONNX model and fails if any pair falls below
+the cosine-similarity threshold, so a broken export never gets deployed.
+"""
+import os
+import sys
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from core.embedding import EMBED_MODEL_NAME, OnnxEmbeddingBackend, TorchEmbeddingBackend
+
+# Dipakai juga oleh tests/test_embedding_parity.py
+PARITY_THRESHOLD = 0.99
+
+PARITY_SENTENCES = [
+    "pemerintah membagikan bantuan sosial tunai kepada seluruh warga mulai bulan depan",
+    "vaksin covid mengandung microchip untuk melacak penduduk",
+    "banjir besar melanda jakarta setelah hujan deras semalaman",
+    "minum air garam hangat bisa menyembuhkan virus dalam tiga hari",
+    "bank indonesia menaikkan suku bunga acuan sebesar 25 basis poin",
+    "beredar pesan berantai tentang penculikan anak di sekolah dasar",
+    "the government announced a new policy on electric vehicle subsidies",
+    "hoaks foto presiden bertemu tokoh asing ternyata hasil editan",
+]
+
+
+def export(output_dir: str):
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    reference = TorchEmbeddingBackend(EMBED_MODEL_NAME).model
+    transformer = reference[0].auto_model.eval()
+    tokenizer = reference.tokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer.save_pretrained(output_dir)
+
+    sample = tokenizer(["contoh kalimat"], return_tensors="pt")
+    with tempfile.TemporaryDirectory() as tmp:
+        fp32_path = os.path.join(tmp, "model-fp32.onnx")
+        torch.onnx.export(
+            transformer,
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=14,
+        )
+        quantize_dynamic(fp32_path, os.path.join(output_dir, "model.onnx"), weight_type=QuantType.QInt8)
+
+
+def cosine_similarities(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def check_parity(output_dir: str, threshold: float) -> float:
+    reference = TorchEmbeddingBackend(EMBED_MODEL_NAME).encode(PARITY_SENTENCES, batch_size=len(PARITY_SENTENCES))
+    quantized = OnnxEmbeddingBackend(output_dir).encode(PARITY_SENTENCES, batch_size=len(PARITY_SENTENCES))
+
+    similarities = cosine_similarities(reference, quantized)
+    for sentence, similarity in zip(PARITY_SENTENCES, similarities):
+        print(f"{similarity:.4f}  {sentence}")
+
+    worst = float(similarities.min())
+    if worst < threshold:
+        raise SystemExit(f"Parity gagal: cosine similarity minimum {worst:.4f} < {threshold}")
+    return worst
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="models/embedding-onnx-int8")
+    parser.add_argument("--threshold", type=float, default=PARITY_THRESHOLD)
+    parser.add_argument("--skip-export", action="store_true", help="only run the parity check")
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        export(args.output)
+    worst = check_parity(args.output, args.threshold)
+    print(f"Parity OK (min cosine similarity {worst:.4f})")
@@ -0,0 +1,76 @@
+import os
+import json
+
+import numpy as np
+import pytest
+
+from core.embedding import EMBED_MODEL_NAME, EMBED_ONNX_DIR
+
+CONTENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ONNX_DIR = os.path.join(CONTENT_DIR, EMBED_ONNX_DIR)
+
+
+def _write_tokenizer(model_dir, special_tokens: dict | None):
+    from tokenizers import Tokenizer
+    from tokenizers.models import WordLevel
+    from tokenizers.pre_tokenizers import Whitespace
+
+    vocab = {"<s>": 0, "<pad>": 1, "</s>": 2, "<unk>": 3, "bantuan": 4, "sosial": 5}
+    tokenizer = Tokenizer(WordLevel(vocab, unk_token="<unk>"))
+    tokenizer.pre_tokenizer = Whitespace()
+    tokenizer.save(str(model_dir / "tokenizer.json"))
+    if special_tokens is not None:
+        (model_dir / "special_tokens_map.json").write_text(json.dumps(special_tokens))
+
+
+def test_onnx_tokenizer_pads_with_tokenizer_pad_token(tmp_path):
+    pytest.importorskip("tokenizers")
+    from core.embedding import load_onnx_tokenizer
+
+    _write_tokenizer(tmp_path, {"pad_token": {"content": "<pad>"}})
+    short, long = load_onnx_tokenizer(str(tmp_path)).encode_batch(["bantuan", "bantuan sosial sosial"])
+
+    assert short.ids == [4, 1, 1]
+    assert short.attention_mask == [1, 0, 0]
+    assert long.ids == [4, 5, 5]
+
+
+def test_onnx_tokenizer_without_pad_token_fails(tmp_path):
+    pytest.importorskip("tokenizers")
+    from core.embedding import load_onnx_tokenizer
+
+    _write_tokenizer(tmp_path, None)
+    with pytest.raises(ValueError):
+        load_onnx_tokenizer(str(tmp_path))
+
+
+@pytest.fixture(scope="module")
+def backends():
+    for module in ("torch", "sentence_transformers", "onnxruntime", "tokenizers"):
+        pytest.importorskip(module)
+    if not os.path.exists(os.path.join(ONNX_DIR, "model.onnx")):
+        pytest.skip(f"Model ONNX belum diekspor ke {ONNX_DIR} (scripts/export_onnx_embedding.py)")
+    from core.embedding import OnnxEmbeddingBackend, TorchEmbeddingBackend
+    return TorchEmbeddingBackend(EMBED_MODEL_NAME), OnnxEmbeddingBackend(ONNX_DIR)
+
+
+def test_onnx_int8_matches_torch_in_batches(backends):
+    from scripts.export_onnx_embedding import PARITY_SENTENCES, PARITY_THRESHOLD, cosine_similarities
+
+    torch_backend, onnx_backend = backends
+    # Satu batch berisi kalimat dengan panjang berbeda, jadi padding ikut teruji
+    reference = torch_backend.encode(PARITY_SENTENCES, batch_size=len(PARITY_SENTENCES))
+    quantized = onnx_backend.encode(PARITY_SENTENCES, batch_size=len(PARITY_SENTENCES))
+
+    assert quantized.shape == reference.shape
+    assert cosine_similarities(reference, quantized).min() >= PARITY_THRESHOLD
+
+
+def test_onnx_batched_matches_single(backends):
+    from scripts.export_onnx_embedding import PARITY_SENTENCES, cosine_similarities
+
+    _, onnx_backend = backends
+    batched = onnx_backend.encode(PARITY_SENTENCES, batch_size=len(PARITY_SENTENCES))
+    single = np.vstack([onnx_backend.encode([sentence], batch_size=1) for sentence in PARITY_SENTENCES])
+
+    assert cosine_similarities(batched, single).min() >= 0.9999
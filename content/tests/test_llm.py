@@ -0,0 +1,194 @@
+import asyncio
+
+import pytest
+
+from core import llm
+from core.llm import FakeLLMClient, LLMClient, ResilientLLMClient, ResponseCache
+
+
+class ScriptedLLMClient(LLMClient):
+    """
+    Klien uji: tiap panggilan mengambil satu langkah dari `script`. Langkah berupa
+    exception (dilempar sebelum chunk pertama), angka (tidur sekian detik sebelum
+    chunk pertama) atau None (langsung menjawab).
+    """
+
+    def __init__(self, script, chunks=("jawaban ", "uji"), fail_after_first_chunk=False):
+        self.script = list(script)
+        self.chunks = chunks
+        self.fail_after_first_chunk = fail_after_first_chunk
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def stream(self, prompt: str):
+        step = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if isinstance(step, Exception):
+                raise step
+            if step:
+                await asyncio.sleep(step)
+            for i, chunk in enumerate(self.chunks):
+                if i == 1 and self.fail_after_first_chunk:
+                    raise ConnectionError("stream putus")
+                yield chunk
+        finally:
+            self.active -= 1
+
+
+def resilient(inner, timeout=1.0, max_retries=2, max_concurrency=8):
+    return ResilientLLMClient(inner, timeout=timeout, max_retries=max_retries, backoff=0, max_concurrency=max_concurrency)
+
+
+async def collect(stream) -> list[str]:
+    return [chunk async for chunk in stream]
+
+
+def test_fake_client_streams_the_generated_answer():
+    client = FakeLLMClient(first_token_ms=0, token_ms=0)
+
+    chunks = asyncio.run(collect(client.stream("[1] a [2] b")))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == asyncio.run(client.generate("[1] a [2] b"))
+    assert "dengan 2 berita" in "".join(chunks)
+
+
+def test_generate_retries_until_success():
+    inner = ScriptedLLMClient([ConnectionError("a"), ConnectionError("b"), None])
+
+    assert asyncio.run(resilient(inner, max_retries=2).generate("p")) == "jawaban uji"
+    assert inner.calls == 3
+
+
+def test_generate_raises_after_last_retry():
+    inner = ScriptedLLMClient([ConnectionError("a")])
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(resilient(inner, max_retries=2).generate("p"))
+    assert inner.calls == 3
+
+
+def test_retry_backoff_is_exponential(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(llm.asyncio, "sleep", fake_sleep)
+    client = ResilientLLMClient(ScriptedLLMClient([ConnectionError("a")]), timeout=1, max_retries=3, backoff=0.5, max_concurrency=1)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(client.generate("p"))
+    assert delays == [0.5, 1.0, 2.0]
+
+
+def test_generate_timeout_counts_as_failed_attempt():
+    inner = ScriptedLLMClient([0.5, None])
+
+    assert asyncio.run(resilient(inner, timeout=0.05).generate("p")) == "jawaban uji"
+    assert inner.calls == 2
+
+
+def test_generate_times_out_after_retries():
+    inner = ScriptedLLMClient([0.5])
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(resilient(inner, timeout=0.05, max_retries=1).generate("p"))
+    assert inner.calls == 2
+
+
+def test_stream_retries_before_first_chunk():
+    inner = ScriptedLLMClient([ConnectionError("a"), 0.5, None])
+
+    assert asyncio.run(collect(resilient(inner, timeout=0.05).stream("p"))) == ["jawaban ", "uji"]
+    assert inner.calls == 3
+
+
+def test_stream_is_not_retried_after_first_chunk():
+    inner = ScriptedLLMClient([None], fail_after_first_chunk=True)
+    received = []
+
+    async def run():
+        async for chunk in resilient(inner).stream("p"):
+            received.append(chunk)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+    assert received == ["jawaban "]
+    assert inner.calls == 1
+
+
+def test_stream_timeout_applies_per_chunk():
+    # Total waktu stream (4 x 30ms) melebihi timeout, tetapi tiap chunk di bawahnya
+    client = resilient(FakeLLMClient(first_token_ms=30, token_ms=30), timeout=0.1, max_retries=0)
+
+    assert asyncio.run(collect(client.stream("p")))
+
+
+@pytest.mark.parametrize("method", ["generate", "stream"])
+def test_concurrency_limit(method):
+    inner = ScriptedLLMClient([0.02])
+    client = resilient(inner, max_concurrency=2)
+
+    async def one():
+        if method == "generate":
+            return await client.generate("p")
+        return "".join(await collect(client.stream("p")))
+
+    async def run():
+        return await asyncio.gather(*(one() for _ in range(6)))
+
+    assert asyncio.run(run()) == ["jawaban uji"] * 6
+    assert inner.peak == 2
+
+
+def test_cache_key_uses_question_hash_label_and_doc_ids():
+    key = ResponseCache.key("apakah ini hoaks?", "hoax", [3, 1])
+
+    assert "apakah" not in key
+    assert key == ResponseCache.key("apakah ini hoaks?", "HOAX", (3, 1))
+    assert key != ResponseCache.key("apakah ini hoaks??", "hoax", [3, 1])
+    assert key != ResponseCache.key("apakah ini hoaks?", "fakta", [3, 1])
+    assert key != ResponseCache.key("apakah ini hoaks?", "hoax", [1, 3])
+    assert key != ResponseCache.key("apakah ini hoaks?", "hoax", [3])
+
+
+def test_cache_miss_then_hit():
+    cache = ResponseCache(ttl=60, max_size=4)
+    key = ResponseCache.key("q", "hoax", [1, 2])
+
+    assert cache.get(key) is None
+    cache.set(key, "jawaban")
+    assert cache.get(key) == "jawaban"
+    assert cache.get(ResponseCache.key("q", "hoax", [1, 2, 3])) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=60, max_size=4)
+    cache.set("k", "jawaban")
+
+    now[0] += 59
+    assert cache.get("k") == "jawaban"
+    now[0] += 2
+    assert cache.get("k") is None
+    assert "k" not in cache._entries
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(ttl=60, max_size=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
@@ -0,0 +1,125 @@
+import json
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import endpoints
+from core import rag_utils
+from core.auth import get_current_user
+from core.database import get_db
+from core.llm import FakeLLMClient, LLMClient, ResponseCache
+from models.schemas import User
+
+CONTEXT = "[1] Judul: Vaksin aman\nIsi: Vaksin telah diuji klinis."
+QUESTION = "vaksin mengandung chip pelacak"
+LABEL = "hoax"
+DOC_IDS = (11, 12)
+
+
+class BrokenLLMClient(LLMClient):
+    async def stream(self, prompt: str):
+        raise RuntimeError("LLM mati")
+        yield
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Backend fake tanpa jeda dan cache jawaban kosong untuk tiap test."""
+    client = FakeLLMClient(first_token_ms=0, token_ms=0)
+    monkeypatch.setattr(rag_utils, "get_llm_client", lambda: client)
+    monkeypatch.setattr(rag_utils, "response_cache", ResponseCache(ttl=60, max_size=16))
+    return client
+
+
+def collect_events(**kwargs) -> list[tuple[str, dict]]:
+    async def run():
+        return [event async for event in rag_utils.stream_answer_events(CONTEXT, QUESTION, LABEL, DOC_IDS, **kwargs)]
+
+    events = []
+    for raw in asyncio.run(run()):
+        assert raw.endswith("\n\n")
+        event_line, data_line = raw.rstrip("\n").split("\n")
+        assert event_line.startswith("event: ") and data_line.startswith("data: ")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+def test_stream_sends_tokens_then_done(llm):
+    events = collect_events(extra={"prompt_tokens": 42})
+
+    names = [name for name, _ in events]
+    assert names[-1] == "done"
+    assert set(names[:-1]) == {"token"} and len(names) > 2
+    done = events[-1][1]
+    assert done["jawaban"] == "".join(data["text"] for _, data in events[:-1])
+    assert done["cached"] is False
+    assert done["prompt_tokens"] == 42
+    assert 0 <= done["ttft_ms"] <= done["total_ms"]
+
+
+def test_stream_answer_matches_generate(llm):
+    streamed = collect_events()[-1][1]["jawaban"]
+
+    assert streamed == asyncio.run(llm.generate(rag_utils.build_prompt(CONTEXT, QUESTION, LABEL)))
+
+
+def test_cached_answer_is_one_token_event(llm):
+    first = collect_events()[-1][1]
+    events = collect_events(extra={"prompt_tokens": 42})
+
+    assert [name for name, _ in events] == ["token", "done"]
+    assert events[0][1]["text"] == first["jawaban"]
+    assert events[1][1]["jawaban"] == first["jawaban"]
+    assert events[1][1]["cached"] is True
+    assert events[1][1]["prompt_tokens"] == 42
+
+
+def test_stream_error_event_is_not_cached(llm, monkeypatch):
+    monkeypatch.setattr(rag_utils, "get_llm_client", lambda: BrokenLLMClient())
+
+    assert collect_events() == [("error", {"detail": rag_utils.LLM_ERROR_MESSAGE})]
+    assert len(rag_utils.response_cache._entries) == 0
+
+
+@pytest.fixture
+def api_client(monkeypatch, llm):
+    app = FastAPI()
+    app.include_router(endpoints.router)
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: User(id="u-1", name="Uji", email="uji@example.com")
+    # Retrieval (embedding + database) diganti konteks tetap
+    monkeypatch.setattr(endpoints, "_retrieve_rag_context", lambda conn, input, user: (CONTEXT, list(DOC_IDS), {}))
+    return TestClient(app)
+
+
+def test_rag_response_shape_unchanged(api_client, llm):
+    body = {"processed_text": QUESTION, "final_label_threshold": LABEL}
+
+    response = api_client.post("/inference/rag", json=body)
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"jawaban"}
+    assert response.json()["jawaban"] == asyncio.run(llm.generate(rag_utils.build_prompt(CONTEXT, QUESTION, LABEL)))
+
+
+def test_rag_and_stream_share_the_answer(api_client):
+    body = {"processed_text": QUESTION, "final_label_threshold": LABEL}
+
+    answer = api_client.post("/inference/rag", json=body).json()["jawaban"]
+    response = api_client.post("/inference/rag/stream", json=body)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("event: token\n")
+    assert f'"jawaban": {json.dumps(answer)}' in response.text
+    assert '"cached": true' in response.text
+
+
+def test_rag_returns_error_message_when_llm_fails(api_client, monkeypatch):
+    monkeypatch.setattr(rag_utils, "get_llm_client", lambda: BrokenLLMClient())
+    body = {"processed_text": QUESTION, "final_label_threshold": LABEL}
+
+    response = api_client.post("/inference/rag", json=body)
+
+    assert response.json() == {"jawaban": rag_utils.LLM_ERROR_MESSAGE}
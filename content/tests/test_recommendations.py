@@ -0,0 +1,136 @@
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+from core.rag_utils import save_recommendations, search_docs_for_rekomendasi
+from models.schemas import User
+
+
+@pytest.fixture
+def statements(pg_conn):
+    """Daftar query yang dieksekusi lewat pg_conn.cursor() selama test."""
+    executed = []
+
+    class CountingCursor(psycopg.Cursor):
+        def execute(self, query, params=None, **kwargs):
+            executed.append(query if isinstance(query, str) else query.as_string(self))
+            return super().execute(query, params, **kwargs)
+
+    pg_conn.cursor_factory = CountingCursor
+    return executed
+
+
+def _news_ids(conn, n=8):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT news_id FROM news ORDER BY news_id LIMIT %s", (n,))
+        return [row["news_id"] for row in cursor.fetchall()]
+
+
+def _stored(conn, history_id):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT recom_id, news_id FROM recommendations WHERE history_id = %s", (history_id,))
+        return {row["recom_id"]: row["news_id"] for row in cursor.fetchall()}
+
+
+def _legacy_create_recommendations(conn, history_id, docs):
+    # Implementasi sebelum save_recommendations: satu INSERT ... RETURNING per berita
+    cursor = conn.cursor()
+    recommendations = []
+    for doc in docs:
+        cursor.execute(
+            """
+            INSERT INTO recommendations (history_id, news_id, created_at)
+            VALUES (%s, %s, now())
+            RETURNING recom_id
+            """,
+            (history_id, doc["news_id"]),
+        )
+        recommendations.append({
+            "recom_id": cursor.fetchone()["recom_id"],
+            "title": doc["title"],
+            "link": doc["link"],
+            "imageurl": doc["imageurl"],
+        })
+    conn.commit()
+    cursor.close()
+    return {"rekomendasi": recommendations}
+
+
+def test_save_recommendations_uses_one_upsert_statement(pg_conn, make_history, statements):
+    _, history_id = make_history()
+    news_ids = _news_ids(pg_conn)
+    statements.clear()
+
+    recom_ids = save_recommendations(pg_conn, history_id, news_ids)
+    pg_conn.commit()
+
+    assert len(statements) == 1
+    assert "INSERT INTO recommendations" in statements[0]
+    assert "unnest" in statements[0] and "ON CONFLICT" in statements[0]
+    assert len(set(recom_ids)) == len(news_ids)
+    stored = _stored(pg_conn, history_id)
+    assert [stored[recom_id] for recom_id in recom_ids] == news_ids
+
+
+def test_save_recommendations_is_idempotent(pg_conn, make_history, statements):
+    _, history_id = make_history()
+    news_ids = _news_ids(pg_conn)
+
+    first = save_recommendations(pg_conn, history_id, news_ids)
+    pg_conn.commit()
+    statements.clear()
+    second = save_recommendations(pg_conn, history_id, news_ids)
+    pg_conn.commit()
+
+    assert len(statements) == 1
+    assert second == first
+    assert len(_stored(pg_conn, history_id)) == len(news_ids)
+
+
+def test_create_recommendations_response_matches_legacy(pg_conn, make_history):
+    from api.endpoints import create_recommendations
+
+    with pg_conn.cursor() as cursor:
+        cursor.execute("SELECT vector FROM news ORDER BY news_id LIMIT 1")
+        embedding = cursor.fetchone()["vector"]
+    user_id, history_id = make_history(embedding=embedding)
+    _, legacy_history_id = make_history(embedding=embedding)
+
+    body = create_recommendations(history_id, conn=pg_conn, current_user=User(id=user_id, name="Test", email="t@example.com"))
+    docs = search_docs_for_rekomendasi(pg_conn, embedding, top_k=8)
+    legacy = _legacy_create_recommendations(pg_conn, legacy_history_id, docs)
+
+    def without_ids(response):
+        return [{key: value for key, value in item.items() if key != "recom_id"} for item in response["rekomendasi"]]
+
+    assert list(body) == list(legacy) == ["rekomendasi"]
+    assert [list(item) for item in body["rekomendasi"]] == [list(item) for item in legacy["rekomendasi"]]
+    assert without_ids(body) == without_ids(legacy)
+    stored = _stored(pg_conn, history_id)
+    assert [stored[item["recom_id"]] for item in body["rekomendasi"]] == [doc["news_id"] for doc in docs]
+
+
+def test_create_recommendations_backfills_missing_embedding(pg_conn, make_history, monkeypatch):
+    from api import endpoints
+
+    with pg_conn.cursor() as cursor:
+        cursor.execute("SELECT vector FROM news ORDER BY news_id LIMIT 1")
+        embedding = cursor.fetchone()["vector"]
+    user_id, history_id = make_history(embedding=None)
+    embedded = []
+
+    def fake_embed_query(text):
+        embedded.append(text)
+        return embedding
+
+    monkeypatch.setattr(endpoints, "embed_query", fake_embed_query)
+    user = User(id=user_id, name="Test", email="t@example.com")
+
+    first = endpoints.create_recommendations(history_id, conn=pg_conn, current_user=user)
+    second = endpoints.create_recommendations(history_id, conn=pg_conn, current_user=user)
+
+    assert len(embedded) == 1
+    assert second == first
+    with pg_conn.cursor() as cursor:
+        cursor.execute("SELECT embedding FROM history WHERE history_id = %s", (history_id,))
+        assert cursor.fetchone()["embedding"] is not None
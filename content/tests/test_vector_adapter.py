@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("psycopg")
+
+from core.vector_adapter import VectorBinaryDumper, VectorBinaryLoader, VectorLoader
+
+DIM = 384
+
+
+@pytest.fixture
+def vector():
+    return np.random.default_rng(27).standard_normal(DIM).astype(np.float32)
+
+
+def test_binary_dump_load_round_trip(vector):
+    data = VectorBinaryDumper(np.ndarray).dump(vector)
+
+    assert len(data) == 4 + 4 * DIM
+    loaded = VectorBinaryLoader(0).load(data)
+    assert loaded.dtype == np.float32
+    np.testing.assert_array_equal(loaded, vector)
+
+
+def test_binary_dump_accepts_lists_and_float64(vector):
+    dumper = VectorBinaryDumper(np.ndarray)
+    expected = dumper.dump(vector)
+
+    assert dumper.dump(vector.tolist()) == expected
+    assert dumper.dump(vector.astype(np.float64)) == expected
+
+
+def test_text_loader_parses_pgvector_text():
+    loaded = VectorLoader(0).load(b"[1,2.5,-3e-05]")
+    np.testing.assert_array_equal(loaded, np.array([1, 2.5, -3e-05], dtype=np.float32))
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_postgres_round_trip(pg_conn, vector, binary):
+    with pg_conn.cursor(binary=binary) as cursor:
+        cursor.execute("SELECT %b::vector AS v, %b <#> %b AS neg_inner", (vector, vector, vector))
+        row = cursor.fetchone()
+
+    np.testing.assert_array_equal(row["v"], vector)
+    assert row["neg_inner"] == pytest.approx(-float(vector @ vector), rel=1e-5)
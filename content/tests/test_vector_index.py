@@ -0,0 +1,97 @@
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("psycopg")
+
+from core import rag_utils
+from core.vector_index import NewsVectorIndex
+
+DIM = 384
+TOP_K = 5
+
+
+def _sql_top_k(conn, query, monkeypatch):
+    # Jalur SQL search_docs_for_rag, tanpa index in-process
+    monkeypatch.setattr(rag_utils, "news_index", None)
+    return [row["news_id"] for row in rag_utils.search_docs_for_rag(conn, query, top_k=TOP_K)]
+
+
+def _insert_news(conn, vectors):
+    ids = []
+    with conn.cursor() as cursor:
+        for n, vector in enumerate(vectors):
+            cursor.execute(
+                """
+                INSERT INTO news (status, title, description, link, imageurl, vector)
+                VALUES ('FAKTA', %s, 'berita baru untuk test index', 'https://example.com/baru', NULL, %s)
+                RETURNING news_id
+                """,
+                (f"Berita baru {n}", vector),
+            )
+            ids.append(cursor.fetchone()["news_id"])
+    conn.commit()
+    return ids
+
+
+@pytest.fixture
+def new_news(pg_conn):
+    inserted = []
+    yield inserted
+    with pg_conn.cursor() as cursor:
+        cursor.execute("DELETE FROM news WHERE news_id = ANY(%s)", (inserted,))
+    pg_conn.commit()
+
+
+@pytest.fixture
+def index(pg_conn, tmp_path):
+    news_index = NewsVectorIndex(str(tmp_path / "index"))
+    news_index.load(pg_conn)
+    yield news_index
+    news_index.stop_polling()
+
+
+def test_index_matches_sql_after_incremental_sync(pg_conn, index, new_news, monkeypatch):
+    rng = np.random.default_rng(26)
+    new_vectors = (rng.random((20, DIM), dtype=np.float32) - 0.5) * 2
+    new_news.extend(_insert_news(pg_conn, new_vectors))
+
+    assert index.sync(pg_conn) == len(new_news)
+
+    queries = list(rng.random((30, DIM), dtype=np.float32) - 0.5) + list(new_vectors[:5])
+    for query in queries:
+        assert [row["news_id"] for row in index.search(query, TOP_K)] == _sql_top_k(pg_conn, query, monkeypatch)
+    # Berita baru paling mirip dengan vektornya sendiri di kedua jalur
+    for news_id, vector in zip(new_news, new_vectors[:5]):
+        assert index.search(vector, 1)[0]["news_id"] == news_id
+
+
+def test_index_matches_sql_after_background_poll(pg_conn, index, new_news, monkeypatch):
+    size_before = len(index)
+    index.start_polling(interval=0.05)
+
+    rng = np.random.default_rng(27)
+    for round_vectors in np.split((rng.random((9, DIM), dtype=np.float32) - 0.5) * 2, 3):
+        new_news.extend(_insert_news(pg_conn, round_vectors))
+        deadline = time.monotonic() + 10
+        while len(index) < size_before + len(new_news) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(index) == size_before + len(new_news)
+
+        for query in list(round_vectors) + list(rng.random((5, DIM), dtype=np.float32) - 0.5):
+            assert [row["news_id"] for row in index.search(query, TOP_K)] == _sql_top_k(pg_conn, query, monkeypatch)
+
+
+def test_snapshot_reload_keeps_results(pg_conn, index, new_news, monkeypatch):
+    rng = np.random.default_rng(28)
+    new_news.extend(_insert_news(pg_conn, (rng.random((5, DIM), dtype=np.float32) - 0.5) * 2))
+    index.sync(pg_conn)
+    index.save_snapshot()
+
+    reloaded = NewsVectorIndex(index.path)
+    reloaded.load(pg_conn)
+    assert len(reloaded) == len(index)
+    for query in rng.random((10, DIM), dtype=np.float32) - 0.5:
+        expected = _sql_top_k(pg_conn, query, monkeypatch)
+        assert [row["news_id"] for row in reloaded.search(query, TOP_K)] == expected
@@ -1,23 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from models.schemas import User, HistoryItem, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from models.schemas import (
+    User,
+    HistoryItem,
+    Response,
+    BulkDeleteRequest,
+    BulkDeleteResponse,
+    HistoryStats,
+    DailyHistoryStats,
+)
 from core.auth import get_current_user
 from core.database import get_db
-from core.item import get_last_history_for_user, delete_history_item  # pastikan ini diimpor
+from core.item import (
+    get_last_history_for_user,
+    delete_history_item,
+    delete_history_items,
+    encode_cursor,
+    decode_cursor,
+)
+from core.stats import get_user_stats, get_user_trend
+from core.read_cache import history_cache, cached_json_response
 
 router = APIRouter(prefix="/history", tags=["History"])
 
 
 @router.get("/me", response_model=list[HistoryItem])
 def list_user_history(
+    request: Request,
+    limit: int = Query(5, ge=1, le=50),
+    cursor: str | None = Query(None, description="Nilai X-Next-Cursor dari halaman sebelumnya"),
     conn=Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    Retrieve the last 5 history records for the logged-in user.
+    Retrieve the logged-in user's history, newest first, `limit` records per page.
+    When more records exist, the `X-Next-Cursor` response header holds the
+    cursor for the next page. Pages are cached per user and carry an ETag.
     """
     try:
-        rows = get_last_history_for_user(conn, current_user.id, limit=5)
-        return rows
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    def load():
+        rows = get_last_history_for_user(conn, current_user.id, limit=limit + 1, before=before)
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["history_id"])
+        return rows, headers
+
+    try:
+        return cached_json_response(request, history_cache, current_user.id, (limit, cursor), load)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -25,6 +59,42 @@ def list_user_history(
         )
 
 
+@router.get("/me/stats", response_model=HistoryStats)
+def user_history_stats(
+    conn=Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Label counts, average prob_hoax and the inference_time_ms distribution
+    over all of the logged-in user's history.
+    """
+    try:
+        return get_user_stats(conn, current_user.id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Gagal mengambil statistik riwayat. Silakan coba lagi nanti."
+        )
+
+
+@router.get("/me/stats/trend", response_model=list[DailyHistoryStats])
+def user_history_trend(
+    days: int = Query(30, ge=1, le=366),
+    conn=Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    The same statistics per UTC day for the last `days` days, oldest first.
+    """
+    try:
+        return get_user_trend(conn, current_user.id, days)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Gagal mengambil tren riwayat. Silakan coba lagi nanti."
+        )
+
+
 @router.delete("/me/{history_id}", response_model=Response)
 def delete_user_history(
     history_id: str,
@@ -36,6 +106,7 @@ def delete_user_history(
     """
     try:
         deleted = delete_history_item(conn, current_user.id, history_id)
+        history_cache.invalidate(current_user.id)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -49,3 +120,30 @@ def delete_user_history(
             status_code=500,
             detail="Gagal menghapus riwayat. Silakan coba lagi nanti."
         )
+
+
+@router.post("/me/bulk-delete", response_model=BulkDeleteResponse)
+def bulk_delete_user_history(
+    body: BulkDeleteRequest,
+    conn=Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Delete many history records of the logged-in user in one statement,
+    either by `history_ids` or by a `created_from`/`created_to` time range.
+    """
+    try:
+        deleted = delete_history_items(
+            conn,
+            current_user.id,
+            history_ids=body.history_ids,
+            created_from=body.created_from,
+            created_to=body.created_to,
+        )
+        history_cache.invalidate(current_user.id)
+        return {"detail": f"{deleted} riwayat berhasil dihapus.", "deleted": deleted}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Gagal menghapus riwayat. Silakan coba lagi nanti."
+        )
@@ -1,17 +1,59 @@
-def get_last_history_for_user(conn, user_id: str, limit: int = 5):
+import json
+import base64
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, history_id) -> str:
+    raw = json.dumps([created_at.isoformat(), str(history_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+    Kembalikan (created_at, history_id) dari cursor halaman berikutnya.
+    Raise ValueError jika cursor tidak valid.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, history_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), history_id
+    except Exception as e:
+        raise ValueError("Cursor tidak valid.") from e
+
+
+def get_last_history_for_user(conn, user_id: str, limit: int = 5, before=None):
+    """
+    Ambil riwayat terbaru user, urut (created_at, history_id) menurun.
+    `before` adalah (created_at, history_id) baris terakhir halaman sebelumnya;
+    keyset ini memakai index history_user_created_at_idx sehingga biaya per
+    halaman tetap, sedalam apa pun halamannya.
+    """
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT history_id, original_input, processed_text, predicted_label,
-                   prob_hoax, prob_fakta, final_label_threshold, inference_time_ms, created_at
-            FROM history
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT %s;
-            """,
-            (user_id, limit),
-        )
+        if before is None:
+            cursor.execute(
+                """
+                SELECT history_id, original_input, processed_text, predicted_label,
+                       prob_hoax, prob_fakta, final_label_threshold, inference_time_ms, created_at
+                FROM history
+                WHERE user_id = %s
+                ORDER BY created_at DESC, history_id DESC
+                LIMIT %s;
+                """,
+                (user_id, limit),
+            )
+        else:
+            cursor.execute(
+                """
+                SELECT history_id, original_input, processed_text, predicted_label,
+                       prob_hoax, prob_fakta, final_label_threshold, inference_time_ms, created_at
+                FROM history
+                WHERE user_id = %s AND (created_at, history_id) < (%s, %s)
+                ORDER BY created_at DESC, history_id DESC
+                LIMIT %s;
+                """,
+                (user_id, before[0], before[1], limit),
+            )
         rows = cursor.fetchall()
         cursor.close()
         return rows  # bisa [] jika belum ada riwayat
@@ -33,4 +75,40 @@ def delete_history_item(conn, user_id: str, history_id: str) -> bool:
     result = cursor.fetchone()
     conn.commit()
     cursor.close()
-    return bool(result)
\ No newline at end of file
+    return bool(result)
+
+
+def delete_history_items(conn, user_id: str, history_ids=None, created_from=None, created_to=None) -> int:
+    """
+    Hapus banyak riwayat milik user dalam satu statement, berdasarkan daftar
+    `history_ids` atau rentang waktu [created_from, created_to). Rekomendasi
+    dari riwayat yang dihapus ikut dihapus. Mengembalikan jumlah riwayat terhapus.
+    """
+    if history_ids is not None:
+        # Bandingkan sebagai uuid agar primary key tetap bisa dipakai
+        condition = "history_id = ANY(%s::uuid[])"
+        params = [[str(history_id) for history_id in history_ids]]
+    else:
+        condition = (
+            "created_at >= COALESCE(%s::timestamptz, '-infinity')"
+            " AND created_at < COALESCE(%s::timestamptz, 'infinity')"
+        )
+        params = [created_from, created_to]
+
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        WITH doomed AS (
+            SELECT history_id FROM history WHERE user_id = %s AND {condition}
+        ), rec AS (
+            DELETE FROM recommendations r USING doomed d WHERE r.history_id = d.history_id
+        )
+        DELETE FROM history h USING doomed d
+        WHERE h.history_id = d.history_id;
+        """,
+        (user_id, *params),
+    )
+    deleted = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return deleted
\ No newline at end of file
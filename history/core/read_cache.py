@@ -0,0 +1,187 @@
+import os
+import time
+import select
+import hashlib
+import logging
+import threading
+from decimal import Decimal
+from collections import OrderedDict
+import orjson
+from fastapi import Request, Response
+from core.database import connect_db
+from core.metrics import register_callback, register_caches
+
+logger = logging.getLogger(__name__)
+
+READ_CACHE_TTL_S = float(os.getenv("READ_CACHE_TTL_S", "300"))
+READ_CACHE_MAX_USERS = int(os.getenv("READ_CACHE_MAX_USERS", "10000"))
+# Channel yang diisi trigger migrations/0004_history_notify.sql (payload = user_id)
+HISTORY_NOTIFY_CHANNEL = "history_changed"
+
+
+def _json_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+class CachedBody:
+    __slots__ = ("body", "etag", "headers", "expires_at")
+
+    def __init__(self, body: bytes, headers: dict, ttl: float):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.headers = headers
+        self.expires_at = time.monotonic() + ttl
+
+
+class UserReadCache:
+    """
+    Serialized JSON responses per user, keyed by a request variant (e.g. the
+    page cursor). `invalidate(user_id)` drops everything cached for that user.
+
+    Entries are only served while `enabled` is set, i.e. while the LISTEN
+    connection is up. A response loaded before an invalidation of its user is
+    never stored after it: `version()` is a snapshot taken before the load and
+    `set` compares it with the last invalidation of that user_id, so writes
+    by other users do not keep a busy user's pages out of the cache.
+    """
+
+    def __init__(self, ttl: float, max_users: int):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+        self._clock = 0
+        # Jam logis invalidasi terakhir per user_id, dibatasi max_users; user
+        # yang tergusur dianggap diinvalidasi pada _floor
+        self._invalidated_at = OrderedDict()
+        self._floor = 0
+
+    def version(self) -> int:
+        return self._clock
+
+    def get(self, user_id: str, variant):
+        if not self.enabled:
+            return None
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._users.get(user_id, {}).get(variant)
+            if entry is None or entry.expires_at < time.monotonic():
+                self.misses += 1
+                return None
+            self._users.move_to_end(user_id)
+            self.hits += 1
+            return entry
+
+    def set(self, user_id: str, variant, entry: CachedBody, version: int):
+        if not self.enabled:
+            return
+        user_id = str(user_id)
+        with self._lock:
+            if self._invalidated_at.get(user_id, self._floor) > version:
+                return
+            self._users.setdefault(user_id, {})[variant] = entry
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        user_id = str(user_id)
+        with self._lock:
+            self._clock += 1
+            self._invalidated_at[user_id] = self._clock
+            self._invalidated_at.move_to_end(user_id)
+            while len(self._invalidated_at) > self.max_users:
+                _, clock = self._invalidated_at.popitem(last=False)
+                self._floor = max(self._floor, clock)
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._clock += 1
+            self._floor = self._clock
+            self._invalidated_at.clear()
+            self._users.clear()
+
+
+def cached_json_response(request: Request, cache: UserReadCache, user_id: str, variant, load) -> Response:
+    """
+    Serve the JSON body for (user_id, variant) from the cache, or build it with
+    `load()` -> (payload, headers) and serialize it with orjson. Answers 304
+    when the client's If-None-Match matches the body's ETag.
+    """
+    entry = cache.get(user_id, variant)
+    if entry is None:
+        version = cache.version()
+        payload, headers = load()
+        entry = CachedBody(orjson.dumps(payload, default=_json_default), headers, cache.ttl)
+        cache.set(user_id, variant, entry, version)
+
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+class NotifyListener:
+    """
+    Background thread holding a LISTEN connection on HISTORY_NOTIFY_CHANNEL and
+    invalidating the cache for each notified user_id. History is also written by
+    other services (verifikasi lewat Supabase), so local invalidation alone is
+    not enough. While disconnected the cache is disabled and cleared.
+    """
+
+    def __init__(self, cache: UserReadCache, channel: str = HISTORY_NOTIFY_CHANNEL):
+        self.cache = cache
+        self.channel = channel
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="read-cache-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = connect_db()
+                conn.autocommit = True
+                cursor = conn.cursor()
+                cursor.execute(f"LISTEN {self.channel};")
+                self.cache.clear()
+                self.cache.enabled = True
+                logger.info("Read cache aktif, mendengarkan channel %s", self.channel)
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            self.cache.invalidate(conn.notifies.pop(0).payload)
+            except Exception as e:
+                logger.error("Koneksi LISTEN read cache terputus: %s", e, exc_info=True)
+            finally:
+                self.cache.enabled = False
+                self.cache.clear()
+                if conn is not None:
+                    conn.close()
+            self._stop.wait(5)
+
+
+history_cache = UserReadCache(READ_CACHE_TTL_S, READ_CACHE_MAX_USERS)
+history_cache_listener = NotifyListener(history_cache)
+
+
+register_caches({"history_read": history_cache})
+register_callback(
+    "read_cache_enabled", "1 while the LISTEN connection is up and the read cache is served.",
+    ["cache"], lambda: {("history_read",): int(history_cache.enabled)},
+)
@@ -0,0 +1,154 @@
+import os
+import time
+import logging
+import threading
+from core.database import connect_db
+from core.metrics import register_callback
+
+logger = logging.getLogger(__name__)
+
+# 0 = retensi nonaktif, riwayat disimpan selamanya
+HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "0"))
+HISTORY_RETENTION_BATCH_SIZE = int(os.getenv("HISTORY_RETENTION_BATCH_SIZE", "1000"))
+HISTORY_RETENTION_INTERVAL_S = float(os.getenv("HISTORY_RETENTION_INTERVAL_S", "3600"))
+HISTORY_RETENTION_BATCH_PAUSE_S = float(os.getenv("HISTORY_RETENTION_BATCH_PAUSE_S", "0.2"))
+
+
+def purge_expired_batch(conn, retention_days: int, batch_size: int):
+    """
+    Hapus paling banyak `batch_size` riwayat yang lebih tua dari `retention_days`
+    beserta rekomendasinya, lalu commit. Baris yang sedang dikunci transaksi lain
+    dilewati, jadi purge tidak pernah menunggu request user.
+    Mengembalikan (jumlah history, jumlah recommendations) yang terhapus.
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        WITH doomed AS (
+            SELECT history_id FROM history
+            WHERE created_at < now() - make_interval(days => %s)
+            ORDER BY created_at
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        ), rec AS (
+            DELETE FROM recommendations r USING doomed d
+            WHERE r.history_id = d.history_id
+            RETURNING 1
+        ), hist AS (
+            DELETE FROM history h USING doomed d
+            WHERE h.history_id = d.history_id
+            RETURNING 1
+        )
+        SELECT (SELECT count(*) FROM hist) AS history,
+               (SELECT count(*) FROM rec) AS recommendations;
+        """,
+        (retention_days, batch_size),
+    )
+    row = cursor.fetchone()
+    conn.commit()
+    cursor.close()
+    return row["history"], row["recommendations"]
+
+
+class RetentionJob:
+    """
+    Background thread that purges expired history every `interval` seconds,
+    in short batches with a pause between them so no transaction holds its
+    row locks for long.
+    """
+
+    def __init__(self, retention_days: int, batch_size: int, interval: float, batch_pause: float):
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self.batch_pause = batch_pause
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "runs": 0,
+            "batches": 0,
+            "history_purged": 0,
+            "recommendations_purged": 0,
+            "last_run_at": None,
+            "last_run_history_purged": 0,
+            "last_batch_ms": None,
+            "max_batch_ms": 0.0,
+            "errors": 0,
+        }
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def run_once(self, conn) -> int:
+        purged = 0
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            history, recommendations = purge_expired_batch(conn, self.retention_days, self.batch_size)
+            batch_ms = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                self._stats["batches"] += 1
+                self._stats["history_purged"] += history
+                self._stats["recommendations_purged"] += recommendations
+                self._stats["last_batch_ms"] = batch_ms
+                self._stats["max_batch_ms"] = max(self._stats["max_batch_ms"], batch_ms)
+            if history:
+                logger.info(
+                    "Retensi: %s riwayat dan %s rekomendasi dihapus dalam %.1fms", history, recommendations, batch_ms
+                )
+            purged += history
+            if history < self.batch_size:
+                break
+            self._stop.wait(self.batch_pause)
+
+        with self._stats_lock:
+            self._stats["runs"] += 1
+            self._stats["last_run_at"] = time.time()
+            self._stats["last_run_history_purged"] = purged
+        return purged
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="history-retention", daemon=True)
+        self._thread.start()
+        logger.info("Retensi riwayat aktif: %s hari, batch %s", self.retention_days, self.batch_size)
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        # Jalan sekali saat start, lalu setiap `interval` detik
+        while True:
+            try:
+                conn = connect_db()
+                try:
+                    self.run_once(conn)
+                finally:
+                    conn.close()
+            except Exception as e:
+                with self._stats_lock:
+                    self._stats["errors"] += 1
+                logger.error("Gagal menjalankan retensi riwayat: %s", e, exc_info=True)
+            if self._stop.wait(self.interval):
+                return
+
+
+retention_job = (
+    RetentionJob(
+        HISTORY_RETENTION_DAYS,
+        HISTORY_RETENTION_BATCH_SIZE,
+        HISTORY_RETENTION_INTERVAL_S,
+        HISTORY_RETENTION_BATCH_PAUSE_S,
+    )
+    if HISTORY_RETENTION_DAYS > 0
+    else None
+)
+
+if retention_job is not None:
+    register_callback(
+        "history_retention", "Counters of the background retention purge (RetentionJob.stats).",
+        ["stat"],
+        lambda: {(key,): value for key, value in retention_job.stats().items() if isinstance(value, (int, float))},
+    )
@@ -0,0 +1,84 @@
+# Batas atas bucket histogram inference_time_ms, harus sama dengan
+# width_bucket di migrations/0003_history_stats.sql. Bucket terakhir tanpa batas.
+INFERENCE_TIME_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, None)
+
+
+def _summarize(rows) -> dict:
+    """Gabungkan baris ringkasan per label menjadi satu statistik."""
+    labels = {}
+    total = 0
+    prob_hoax_sum = 0.0
+    inference_time_sum = 0.0
+    hist = [0] * len(INFERENCE_TIME_BUCKETS_MS)
+    for row in rows:
+        if row["total"] <= 0:
+            continue
+        labels[row["label"]] = row["total"]
+        total += row["total"]
+        prob_hoax_sum += row["prob_hoax_sum"]
+        inference_time_sum += row["inference_time_sum"]
+        hist = [a + b for a, b in zip(hist, row["inference_time_hist"])]
+
+    return {
+        "total": total,
+        "labels": labels,
+        "avg_prob_hoax": prob_hoax_sum / total if total else None,
+        "avg_inference_time_ms": inference_time_sum / total if total else None,
+        "inference_time_histogram": [
+            {"upper_ms": upper, "count": count} for upper, count in zip(INFERENCE_TIME_BUCKETS_MS, hist)
+        ],
+    }
+
+
+def get_user_stats(conn, user_id: str) -> dict:
+    """
+    Statistik seluruh riwayat user dari history_user_stats (satu baris per
+    label), jadi biayanya tidak bergantung pada jumlah riwayat.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT label, total, prob_hoax_sum, inference_time_sum, inference_time_hist
+            FROM history_user_stats
+            WHERE user_id = %s;
+            """,
+            (user_id,),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        return _summarize(rows)
+    except Exception as e:
+        raise RuntimeError("Gagal mengambil statistik riwayat dari database.") from e
+
+
+def get_user_trend(conn, user_id: str, days: int = 30) -> list:
+    """
+    Statistik harian (UTC) user untuk `days` hari terakhir, urut tanggal naik.
+    Hari tanpa riwayat tidak dikembalikan.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT day, label, total, prob_hoax_sum, inference_time_sum, inference_time_hist
+            FROM history_user_daily_stats
+            WHERE user_id = %s AND day > (now() AT TIME ZONE 'UTC')::date - %s
+            ORDER BY day;
+            """,
+            (user_id, days),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+    except Exception as e:
+        raise RuntimeError("Gagal mengambil tren riwayat dari database.") from e
+
+    by_day = {}
+    for row in rows:
+        by_day.setdefault(row["day"], []).append(row)
+    trend = []
+    for day, day_rows in by_day.items():
+        summary = _summarize(day_rows)
+        if summary["total"]:
+            trend.append({"day": day, **summary})
+    return trend
@@ -2,6 +2,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from api.endpoints import router as api_router
+from core.retention import retention_job
+from core.read_cache import history_cache_listener
+from core.metrics import install_metrics
 
 
 app = FastAPI()
@@ -14,6 +17,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+install_metrics(app)
+
+
+@app.on_event("startup")
+def start_read_cache():
+    history_cache_listener.start()
+
+
+@app.on_event("shutdown")
+def stop_read_cache():
+    history_cache_listener.stop()
+
+
+@app.on_event("startup")
+def start_retention():
+    # Opsional: hapus riwayat kadaluarsa di background, aktif jika HISTORY_RETENTION_DAYS > 0
+    if retention_job is not None:
+        retention_job.start()
+
+
+@app.on_event("shutdown")
+def stop_retention():
+    if retention_job is not None:
+        retention_job.stop()
+
 
 # Tambahkan endpoint untuk root "/"
 @app.get("/", response_class=HTMLResponse)
@@ -0,0 +1,6 @@
+-- Index untuk WHERE user_id = ? ORDER BY created_at DESC, history_id DESC:
+-- dipakai /history/me (keyset pagination) dan subquery history terakhir di
+-- get_latest_recommendations_for_user (layanan content).
+-- CONCURRENTLY tidak bisa dijalankan di dalam transaksi.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS history_user_created_at_idx
+    ON history (user_id, created_at DESC, history_id DESC);
@@ -0,0 +1,5 @@
+-- Index untuk job retensi (core/retention.py) yang mencari riwayat terlama
+-- lintas user: WHERE created_at < ... ORDER BY created_at LIMIT batch.
+-- CONCURRENTLY tidak bisa dijalankan di dalam transaksi.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS history_created_at_idx
+    ON history (created_at);
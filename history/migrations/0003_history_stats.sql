@@ -0,0 +1,124 @@
+-- Ringkasan riwayat per user (dan per user per hari) yang dijaga trigger pada
+-- tabel history, supaya /history/me/stats tidak perlu agregasi baris mentah.
+-- Histogram inference_time_ms memakai batas bucket yang sama dengan
+-- INFERENCE_TIME_BUCKETS_MS di core/stats.py: <10, <25, <50, <100, <250,
+-- <500, <1000, <2500, sisanya (9 bucket).
+-- Riwayat tanpa user_id (pengguna anonim) tidak dihitung.
+
+DO $$
+DECLARE
+    user_id_type text := (
+        SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+        WHERE attrelid = 'history'::regclass AND attname = 'user_id'
+    );
+BEGIN
+    EXECUTE format($f$
+        CREATE TABLE IF NOT EXISTS history_user_stats (
+            user_id %s NOT NULL,
+            label text NOT NULL,
+            total bigint NOT NULL DEFAULT 0,
+            prob_hoax_sum double precision NOT NULL DEFAULT 0,
+            inference_time_sum double precision NOT NULL DEFAULT 0,
+            inference_time_hist bigint[] NOT NULL,
+            PRIMARY KEY (user_id, label)
+        )$f$, user_id_type);
+    EXECUTE format($f$
+        CREATE TABLE IF NOT EXISTS history_user_daily_stats (
+            user_id %s NOT NULL,
+            day date NOT NULL,
+            label text NOT NULL,
+            total bigint NOT NULL DEFAULT 0,
+            prob_hoax_sum double precision NOT NULL DEFAULT 0,
+            inference_time_sum double precision NOT NULL DEFAULT 0,
+            inference_time_hist bigint[] NOT NULL,
+            PRIMARY KEY (user_id, day, label)
+        )$f$, user_id_type);
+END $$;
+
+
+CREATE OR REPLACE FUNCTION history_stats_apply(r history, delta int) RETURNS void AS $$
+DECLARE
+    b int;
+    hist bigint[];
+    v_label text := COALESCE(r.final_label_threshold, 'N/A');
+    v_prob double precision := delta * COALESCE(r.prob_hoax, 0);
+    v_latency double precision := delta * COALESCE(r.inference_time_ms, 0);
+BEGIN
+    IF r.user_id IS NULL THEN
+        RETURN;
+    END IF;
+    b := width_bucket(COALESCE(r.inference_time_ms, 0), ARRAY[10, 25, 50, 100, 250, 500, 1000, 2500]::float8[]) + 1;
+    hist := array_fill(0::bigint, ARRAY[9]);
+    hist[b] := delta;
+
+    INSERT INTO history_user_stats AS s
+        (user_id, label, total, prob_hoax_sum, inference_time_sum, inference_time_hist)
+    VALUES (r.user_id, v_label, delta, v_prob, v_latency, hist)
+    ON CONFLICT (user_id, label) DO UPDATE SET
+        total = s.total + delta,
+        prob_hoax_sum = s.prob_hoax_sum + v_prob,
+        inference_time_sum = s.inference_time_sum + v_latency,
+        inference_time_hist[b] = s.inference_time_hist[b] + delta;
+
+    INSERT INTO history_user_daily_stats AS s
+        (user_id, day, label, total, prob_hoax_sum, inference_time_sum, inference_time_hist)
+    VALUES (r.user_id, (r.created_at AT TIME ZONE 'UTC')::date, v_label, delta, v_prob, v_latency, hist)
+    ON CONFLICT (user_id, day, label) DO UPDATE SET
+        total = s.total + delta,
+        prob_hoax_sum = s.prob_hoax_sum + v_prob,
+        inference_time_sum = s.inference_time_sum + v_latency,
+        inference_time_hist[b] = s.inference_time_hist[b] + delta;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION history_stats_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        PERFORM history_stats_apply(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM history_stats_apply(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS history_stats_maintain ON history;
+CREATE TRIGGER history_stats_maintain
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, created_at, final_label_threshold, prob_hoax, inference_time_ms
+    ON history
+    FOR EACH ROW EXECUTE FUNCTION history_stats_trigger();
+
+
+-- Isi awal dari riwayat yang sudah ada. Jalankan seluruh file dalam satu
+-- transaksi (psql -1 -f ...) agar tidak ada baris yang terlewat atau terhitung dua kali.
+TRUNCATE history_user_stats, history_user_daily_stats;
+
+WITH bucketed AS (
+    SELECT user_id,
+           (created_at AT TIME ZONE 'UTC')::date AS day,
+           COALESCE(final_label_threshold, 'N/A') AS label,
+           COALESCE(prob_hoax, 0) AS prob_hoax,
+           COALESCE(inference_time_ms, 0) AS inference_time_ms,
+           width_bucket(COALESCE(inference_time_ms, 0), ARRAY[10, 25, 50, 100, 250, 500, 1000, 2500]::float8[]) + 1 AS b
+    FROM history
+    WHERE user_id IS NOT NULL
+)
+INSERT INTO history_user_daily_stats
+    (user_id, day, label, total, prob_hoax_sum, inference_time_sum, inference_time_hist)
+SELECT user_id, day, label, count(*), sum(prob_hoax), sum(inference_time_ms),
+       ARRAY[count(*) FILTER (WHERE b = 1), count(*) FILTER (WHERE b = 2), count(*) FILTER (WHERE b = 3),
+             count(*) FILTER (WHERE b = 4), count(*) FILTER (WHERE b = 5), count(*) FILTER (WHERE b = 6),
+             count(*) FILTER (WHERE b = 7), count(*) FILTER (WHERE b = 8), count(*) FILTER (WHERE b = 9)]
+FROM bucketed
+GROUP BY user_id, day, label;
+
+INSERT INTO history_user_stats
+    (user_id, label, total, prob_hoax_sum, inference_time_sum, inference_time_hist)
+SELECT user_id, label, sum(total), sum(prob_hoax_sum), sum(inference_time_sum),
+       ARRAY[sum(inference_time_hist[1]), sum(inference_time_hist[2]), sum(inference_time_hist[3]),
+             sum(inference_time_hist[4]), sum(inference_time_hist[5]), sum(inference_time_hist[6]),
+             sum(inference_time_hist[7]), sum(inference_time_hist[8]), sum(inference_time_hist[9])]::bigint[]
+FROM history_user_daily_stats
+GROUP BY user_id, label;
@@ -0,0 +1,22 @@
+-- Kirim NOTIFY history_changed (payload = user_id) setiap kali riwayat user
+-- berubah, supaya read cache /history/me dan /users/me/recommendations di
+-- semua instance ikut invalid walaupun riwayat ditulis layanan lain.
+-- Notifikasi yang sama dalam satu transaksi digabung oleh Postgres.
+CREATE OR REPLACE FUNCTION history_notify_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') AND OLD.user_id IS NOT NULL THEN
+        PERFORM pg_notify('history_changed', OLD.user_id::text);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.user_id IS NOT NULL THEN
+        PERFORM pg_notify('history_changed', NEW.user_id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS history_notify ON history;
+CREATE TRIGGER history_notify
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, created_at, original_input, processed_text, predicted_label,
+        prob_hoax, prob_fakta, final_label_threshold, inference_time_ms
+    ON history
+    FOR EACH ROW EXECUTE FUNCTION history_notify_trigger();
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, EmailStr
-from datetime import datetime
+from pydantic import BaseModel, Field, EmailStr, model_validator
+from datetime import date, datetime
+from uuid import UUID
 
 class User(BaseModel):
     id: str
@@ -20,4 +21,40 @@ class HistoryItem(BaseModel):
 
 
 class Response(BaseModel):
-    detail: str
\ No newline at end of file
+    detail: str
+
+
+class BulkDeleteRequest(BaseModel):
+    # ID yang bukan uuid ditolak dengan 422 sebelum menyentuh database
+    history_ids: list[UUID] | None = Field(None, min_length=1, max_length=500)
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        has_range = self.created_from is not None or self.created_to is not None
+        if (self.history_ids is None) == (not has_range):
+            raise ValueError("Isi history_ids atau rentang created_from/created_to, tidak keduanya.")
+        return self
+
+
+class BulkDeleteResponse(BaseModel):
+    detail: str
+    deleted: int
+
+
+class LatencyBucket(BaseModel):
+    upper_ms: float | None  # batas atas eksklusif, None = bucket terakhir tanpa batas
+    count: int
+
+
+class HistoryStats(BaseModel):
+    total: int
+    labels: dict[str, int]
+    avg_prob_hoax: float | None
+    avg_inference_time_ms: float | None
+    inference_time_histogram: list[LatencyBucket]
+
+
+class DailyHistoryStats(HistoryStats):
+    day: date
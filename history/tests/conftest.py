@@ -0,0 +1,81 @@
+"""
+Test layanan history. Jalankan dari folder history:
+
+    python -m pytest tests
+
+Test yang butuh database memakai Postgres stand-in benchmark (skema dari
+benchmarks/standins/schema.sql plus migrasi tiap layanan):
+
+    docker compose -f benchmarks/standins/docker-compose.yml up -d
+
+Koneksi dibaca dari PG_* (default: stand-in di localhost:55432). Jika database
+tidak bisa dihubungi, test tersebut di-skip.
+"""
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("PG_HOST", "localhost")
+os.environ.setdefault("PG_PORT", "55432")
+os.environ.setdefault("PG_DB", "cekviral")
+os.environ.setdefault("PG_USER", "bench")
+os.environ.setdefault("PG_PASSWORD", "bench")
+
+
+@pytest.fixture
+def pg_conn():
+    """Koneksi dari core.database.connect_db (RealDictCursor); di-rollback setelah test."""
+    import psycopg2
+    from core.database import connect_db
+
+    try:
+        conn = connect_db()
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"Postgres stand-in tidak tersedia: {e}")
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+@pytest.fixture
+def make_user_history(pg_conn):
+    """
+    Buat satu user dengan `count` baris history, dihapus lagi setelah test.
+    Mengembalikan (user_id, [history_id, ...]) sebagai str.
+    """
+    user_ids = []
+
+    def make(count: int):
+        cursor = pg_conn.cursor()
+        cursor.execute(
+            "INSERT INTO users (name, email, password) VALUES (%s, %s, %s) RETURNING id",
+            ("Test", f"history-{uuid.uuid4().hex[:12]}@example.com", "hash"),
+        )
+        user_id = str(cursor.fetchone()["id"])
+        user_ids.append(user_id)
+        cursor.execute(
+            """
+            INSERT INTO history (user_id, processed_text, final_label_threshold)
+            SELECT %s, 'riwayat uji ' || i, 'HOAKS' FROM generate_series(1, %s) AS i
+            RETURNING history_id
+            """,
+            (user_id, count),
+        )
+        history_ids = [str(row["history_id"]) for row in cursor.fetchall()]
+        pg_conn.commit()
+        cursor.close()
+        return user_id, history_ids
+
+    yield make
+
+    pg_conn.rollback()
+    cursor = pg_conn.cursor()
+    for user_id in user_ids:
+        # history ikut terhapus lewat ON DELETE CASCADE
+        cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
+    pg_conn.commit()
+    cursor.close()
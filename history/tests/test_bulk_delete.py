@@ -0,0 +1,60 @@
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import endpoints
+from core.auth import get_current_user
+from core.database import get_db
+from core.item import delete_history_items
+from models.schemas import User
+
+
+@pytest.fixture
+def api_client(monkeypatch):
+    calls = []
+    app = FastAPI()
+    app.include_router(endpoints.router)
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: User(id="u-1", name="Uji", email="uji@example.com")
+
+    def fake_delete(conn, user_id, history_ids=None, created_from=None, created_to=None):
+        calls.append(history_ids)
+        return len(history_ids or ())
+
+    monkeypatch.setattr(endpoints, "delete_history_items", fake_delete)
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+
+def test_bulk_delete_rejects_invalid_uuid(api_client):
+    response = api_client.post("/history/me/bulk-delete", json={"history_ids": [str(uuid.uuid4()), "bukan-uuid"]})
+
+    assert response.status_code == 422
+    assert api_client.calls == []
+
+
+def test_bulk_delete_passes_parsed_uuids(api_client):
+    history_id = uuid.uuid4()
+
+    response = api_client.post("/history/me/bulk-delete", json={"history_ids": [str(history_id)]})
+
+    assert response.status_code == 200
+    assert response.json()["deleted"] == 1
+    assert api_client.calls == [[history_id]]
+
+
+def test_delete_by_ids_only_touches_listed_rows_of_the_user(pg_conn, make_user_history):
+    user_id, history_ids = make_user_history(4)
+    other_user_id, other_ids = make_user_history(1)
+
+    deleted = delete_history_items(pg_conn, user_id, history_ids=[uuid.UUID(h) for h in history_ids[:2]] + other_ids)
+
+    assert deleted == 2
+    cursor = pg_conn.cursor()
+    cursor.execute("SELECT history_id::text AS id FROM history WHERE user_id IN (%s, %s)", (user_id, other_user_id))
+    assert {row["id"] for row in cursor.fetchall()} == set(history_ids[2:] + other_ids)
+    cursor.close()
+
@@ -0,0 +1,73 @@
+import uuid
+
+import pytest
+
+from core.read_cache import CachedBody, UserReadCache
+
+
+@pytest.fixture
+def cache():
+    cache = UserReadCache(ttl=60, max_users=3)
+    cache.enabled = True
+    return cache
+
+
+def body(text: str) -> CachedBody:
+    return CachedBody(text.encode(), {}, 60)
+
+
+def test_set_then_get(cache):
+    cache.set("a", 1, body("halaman a"), cache.version())
+
+    assert cache.get("a", 1).body == b"halaman a"
+    assert cache.get("a", 2) is None
+
+
+def test_load_started_before_invalidation_of_same_user_is_not_stored(cache):
+    version = cache.version()
+    cache.invalidate("a")
+    cache.set("a", 1, body("basi"), version)
+
+    assert cache.get("a", 1) is None
+
+
+def test_invalidation_of_other_user_does_not_block_store(cache):
+    version = cache.version()
+    cache.invalidate("b")
+    cache.set("a", 1, body("halaman a"), version)
+
+    assert cache.get("a", 1).body == b"halaman a"
+
+
+def test_load_started_after_invalidation_is_stored(cache):
+    cache.invalidate("a")
+    cache.set("a", 1, body("baru"), cache.version())
+
+    assert cache.get("a", 1).body == b"baru"
+
+
+def test_invalidate_matches_str_and_uuid_user_ids(cache):
+    user_id = uuid.uuid4()
+    cache.set(str(user_id), 1, body("halaman"), cache.version())
+    cache.invalidate(user_id)
+
+    assert cache.get(str(user_id), 1) is None
+
+
+def test_evicted_invalidation_still_blocks_stale_store(cache):
+    version = cache.version()
+    # Lebih banyak invalidasi daripada max_users: catatan user "a" tergusur
+    for user_id in ("a", "b", "c", "d"):
+        cache.invalidate(user_id)
+    cache.set("a", 1, body("basi"), version)
+
+    assert cache.get("a", 1) is None
+    assert len(cache._invalidated_at) == 3
+
+
+def test_clear_blocks_loads_started_before_it(cache):
+    version = cache.version()
+    cache.clear()
+    cache.set("a", 1, body("basi"), version)
+
+    assert cache.get("a", 1) is None